@@ -0,0 +1,111 @@
+"""
+敵ターンの行動決定をワーカースレッドで先行して実行するプランナー
+"""
+
+import concurrent.futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import enemy_ai
+from game_state import City, Enemy, GameState
+
+AI_FRAME_BUDGET_MS = 2.0  # 1フレームで結果を待つ最大時間（ミリ秒）
+
+EnemyTurnPlan = List[Tuple[Enemy, Optional[City]]]
+
+
+class AIPlanner:
+    """敵ターンの行動決定（enemy_ai.decide_enemy_turn）をワーカーで実行する
+
+    プレイヤーターンが終わった時点で start() し、カットインや点滅演出の間に
+    計算を進める。ワーカーは開始時点のスナップショット（GameState.snapshot）を
+    使うので、ゲーム状態を変更するのは結果を受け取ったときの乱数の状態だけになる。
+    巡回地点などは結果を受け取った後の移動の指示（GameState.order_move）で進める。
+    計算中にゲーム状態のイベントが記録された場合は結果を破棄し、その場で
+    計算し直す（結果は同期実行と同じ）。都市・道路・キャラクターは共有しているため、
+    結果を受け取るまではメインスレッドでも状態を変更しないこと
+    """
+
+    def __init__(
+        self,
+        game_state: GameState,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ):
+        self.game_state = game_state
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="EnemyAI"
+        )
+        self._future: Optional[Future] = None
+        self._snapshot: Optional[GameState] = None  # ワーカーが使うスナップショット
+        self._stale = False
+        self.background_plans = 0  # ワーカーの結果をそのまま使った回数
+        self.replanned = 0  # 状態の変更などでその場で計算し直した回数
+        game_state.event_listeners.append(self._on_event)
+
+    @property
+    def is_pending(self) -> bool:
+        """ワーカーで計算中の行動決定があるか"""
+        return self._future is not None
+
+    def start(self):
+        """現在の状態のスナップショットから敵ターンの行動決定を開始"""
+        self.cancel()
+        self._stale = False
+        self._snapshot = self.game_state.snapshot()
+        self._future = self._executor.submit(enemy_ai.decide_enemy_turn, self._snapshot)
+
+    def cancel(self):
+        """計算中の行動決定を破棄（スナップショットごと捨てるので状態は戻さない）"""
+        future, self._future = self._future, None
+        self._snapshot = None
+        if future is not None and not future.cancel():
+            # 共有中の経路表などをワーカーが読み終えるまで待つ
+            concurrent.futures.wait([future])
+
+    def result(self, budget_ms: float = AI_FRAME_BUDGET_MS) -> Optional[EnemyTurnPlan]:
+        """行動決定の結果を取得（計算中でbudget_ms以内に終わらなければNone）
+
+        開始されていない・計算中に状態が変わった・失敗した場合はその場で計算する
+        """
+        future = self._future
+        if future is not None and not self._stale:
+            try:
+                plan = future.result(timeout=budget_ms / 1000)
+            except concurrent.futures.TimeoutError:
+                return None
+            except Exception as e:
+                print(f"Enemy AI worker failed: {e}")
+            else:
+                if not self._stale:
+                    self._future = None
+                    self.background_plans += 1
+                    return self._commit(plan)
+
+        self.cancel()
+        self.replanned += 1
+        return enemy_ai.decide_enemy_turn(self.game_state)
+
+    def _commit(self, plan: EnemyTurnPlan) -> EnemyTurnPlan:
+        """ワーカーの結果をゲーム状態に反映（乱数の状態を進め、実体に置き換える）"""
+        game_state = self.game_state
+        snapshot, self._snapshot = self._snapshot, None
+        game_state.ai_rng.setstate(snapshot.ai_rng.getstate())
+        # スナップショットで複製されたキャラクター・都市があればIDで引き直す
+        return [
+            (
+                game_state.get_character(enemy.id),
+                game_state.cities.get(city.id) if city else None,
+            )
+            for enemy, city in plan
+        ]
+
+    def close(self):
+        """計算中の行動決定を破棄してワーカーを終了"""
+        self.cancel()
+        if self._on_event in self.game_state.event_listeners:
+            self.game_state.event_listeners.remove(self._on_event)
+        self._executor.shutdown(wait=True)
+
+    def _on_event(self, event: Dict[str, Any]):
+        if self._future is not None:
+            self._stale = True
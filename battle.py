@@ -1,5 +1,6 @@
 import pyxel
 
+from battle_rules import initiative_order, resolve_attack
 from battle_states import BattleIntroState
 from game import Scene
 from map_state_machine import StateContext
@@ -56,9 +57,8 @@ class BattleScene(Scene):
 
     def calculate_initiative_order(self):
         """イニシアチブ順を計算"""
-        all_characters = self.battle_players + self.battle_enemies
-        self.initiative_order = sorted(
-            all_characters, key=lambda c: c.initiative, reverse=True
+        self.initiative_order = initiative_order(
+            self.battle_players, self.battle_enemies
         )
         self.current_attacker_index = 0
 
@@ -76,29 +76,14 @@ class BattleScene(Scene):
         if not self.current_attacker or self.current_attacker.life <= 0:
             return 0
 
-        damage = 0
-        if self.current_attacker in self.battle_players:
-            # プレイヤーの攻撃
-            alive_enemies = [e for e in self.battle_enemies if e.life > 0]
-            if alive_enemies:
-                target = min(alive_enemies, key=lambda e: e.life)
-                damage = min(self.current_attacker.attack, target.life)
-                target.life = max(0, target.life - damage)
-
-                # ダメージ表示
-                if damage > 0:
-                    self.add_damage_number(damage, "player")
-        else:
-            # 敵の攻撃
-            alive_players = [p for p in self.battle_players if p.life > 0]
-            if alive_players:
-                target = min(alive_players, key=lambda p: p.life)
-                damage = min(self.current_attacker.attack, target.life)
-                target.life = max(0, target.life - damage)
+        team = self.game_state.get_team(self.current_attacker.id)
+        damage = resolve_attack(
+            self.current_attacker, team, self.battle_players, self.battle_enemies
+        )
 
-                # ダメージ表示
-                if damage > 0:
-                    self.add_damage_number(damage, "enemy")
+        # ダメージ表示
+        if damage > 0:
+            self.add_damage_number(damage, team)
 
         self.current_attack_damage = damage
         return damage
@@ -347,7 +332,7 @@ class BattleScene(Scene):
             ):
                 flash_intensity = max(0, 30 - current_state.get_elapsed_time())
                 if flash_intensity > 15:
-                    if self.current_attacker in self.battle_players:
+                    if self.game_state.get_team(self.current_attacker.id) == "player":
                         # プレイヤー攻撃: 青色閃光
                         pyxel.rect(0, 0, pyxel.width, pyxel.height, 12)
                     else:
@@ -0,0 +1,81 @@
+"""
+戦闘ルール（pyxelに依存しない戦闘解決）
+"""
+
+from typing import List, Sequence, Tuple
+
+from game_state import Character
+
+
+def initiative_order(
+    players: Sequence[Character], enemies: Sequence[Character]
+) -> List[Character]:
+    """イニシアチブの高い順に並べた行動順を取得"""
+    return sorted(
+        list(players) + list(enemies), key=lambda c: c.initiative, reverse=True
+    )
+
+
+def resolve_attack(
+    attacker: Character,
+    team: str,
+    players: Sequence[Character],
+    enemies: Sequence[Character],
+) -> int:
+    """攻撃者が残りlifeの最も少ない相手を攻撃し、与えたダメージを返す
+
+    teamは攻撃者の陣営（"player" / "enemy"、GameState.get_teamの値）
+    """
+    if attacker.life <= 0:
+        return 0
+
+    opponents = enemies if team == "player" else players
+    alive_opponents = [c for c in opponents if c.life > 0]
+    if not alive_opponents:
+        return 0
+
+    target = min(alive_opponents, key=lambda c: c.life)
+    damage = min(attacker.attack, target.life)
+    target.life = max(0, target.life - damage)
+    return damage
+
+
+def simulate_battle(
+    player_stats: Sequence[Tuple[int, int, int]],
+    enemy_stats: Sequence[Tuple[int, int, int]],
+) -> Tuple[List[int], List[int]]:
+    """キャラクターを変更せずに戦闘を解決し、(プレイヤーの残りlife, 敵の残りlife)を返す
+
+    各ステータスは(life, attack, initiative)。行動順と攻撃対象はresolve_battleと同じ
+    """
+    stats = (player_stats, enemy_stats)
+    lives = ([s[0] for s in player_stats], [s[0] for s in enemy_stats])
+    order = sorted(
+        [(0, i) for i in range(len(player_stats))]
+        + [(1, i) for i in range(len(enemy_stats))],
+        key=lambda unit: stats[unit[0]][unit[1]][2],
+        reverse=True,
+    )
+    for side, index in order:
+        if lives[side][index] <= 0:
+            continue
+        opponents = lives[1 - side]
+        target = -1
+        for opponent_index, life in enumerate(opponents):
+            if life > 0 and (target < 0 or life < opponents[target]):
+                target = opponent_index
+        if target >= 0:
+            opponents[target] -= min(stats[side][index][1], opponents[target])
+    return lives
+
+
+def resolve_battle(players: Sequence[Character], enemies: Sequence[Character]):
+    """イニシアチブ順に全員が1回ずつ攻撃する戦闘を解決"""
+    player_lives, enemy_lives = simulate_battle(
+        [(c.life, c.attack, c.initiative) for c in players],
+        [(c.life, c.attack, c.initiative) for c in enemies],
+    )
+    for character, life in zip(players, player_lives):
+        character.life = life
+    for character, life in zip(enemies, enemy_lives):
+        character.life = life
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""マップ描画の1フレームあたりのコストを描画方式ごとに比較するベンチマーク
+
+ウィンドウを開かずに計測するため、SDLのダミードライバでpyxelを初期化する
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pyxel  # noqa: E402
+
+from coordinate_utils import create_default_coordinate_transformer  # noqa: E402
+from game import screen_height, screen_width  # noqa: E402
+from map_layers import (  # noqa: E402
+    FLOOR_COLOR,
+    ROAD_COLOR,
+    WALL_COLOR,
+    BakedBackground,
+    RoadLayer,
+    Segment,
+)
+
+
+def generate_map_data(map_width: int, map_height: int) -> List[List[int]]:
+    """MapScene.generate_centered_map と同じ配置の壁を持つマップを生成"""
+    half_width = map_width // 2
+    half_height = map_height // 2
+    map_data = []
+    for row in range(map_height):
+        map_row = []
+        for col in range(map_width):
+            tile_x = col - half_width
+            tile_y = row - half_height
+            is_wall = (
+                abs(tile_x) == half_width
+                or abs(tile_y) == half_height
+                or (tile_y % 4 == 0 and tile_x % 4 == 0)
+                or (tile_y % 6 == 2 and tile_x % 6 == 2)
+                or (tile_y % 8 == 3 and tile_x % 3 == 1)
+            )
+            map_row.append(1 if is_wall else 0)
+        map_data.append(map_row)
+    return map_data
+
+
+def draw_background_per_tile(
+    map_data: List[List[int]], tile_size: int, camera_x: float, camera_y: float
+) -> int:
+    """焼き込み前の描画（画面内のタイルごとにrect）、描画呼び出し数を返す"""
+    map_height = len(map_data)
+    map_width = len(map_data[0])
+    start_col = int(camera_x // tile_size)
+    end_col = min(int((camera_x + screen_width) // tile_size) + 1, map_width)
+    start_row = int(camera_y // tile_size)
+    end_row = min(int((camera_y + screen_height) // tile_size) + 1, map_height)
+    calls = 0
+    for row in range(start_row, end_row):
+        for col in range(start_col, end_col):
+            x = col * tile_size - camera_x
+            y = row * tile_size - camera_y
+            color = WALL_COLOR if map_data[row][col] == 1 else FLOOR_COLOR
+            pyxel.rect(x, y, tile_size, tile_size, color)
+            calls += 1
+    return calls
+
+
+def generate_road_segments(map_width: int, tile_size: int) -> List[Segment]:
+    """2タイルおきに都市を格子状に並べ、隣同士を道路で結んだ線分を生成"""
+    spacing = tile_size * 2
+    count = max(1, map_width * tile_size // spacing)
+    segments = []
+    for row in range(count):
+        for col in range(count):
+            x = col * spacing + tile_size
+            y = row * spacing + tile_size
+            if col + 1 < count:
+                segments.append((x, y, x + spacing, y))
+            if row + 1 < count:
+                segments.append((x, y, x, y + spacing))
+    return segments
+
+
+def draw_roads_per_segment(
+    segments: List[Segment], camera_x: float, camera_y: float
+) -> int:
+    """道路レイヤー導入前の描画（画面と重なる道路ごとにline）、描画呼び出し数を返す"""
+    calls = 0
+    for x1, y1, x2, y2 in segments:
+        x1 -= camera_x
+        y1 -= camera_y
+        x2 -= camera_x
+        y2 -= camera_y
+        if (
+            max(x1, x2) < 0
+            or min(x1, x2) > screen_width
+            or max(y1, y2) < 0
+            or min(y1, y2) > screen_height
+        ):
+            continue
+        pyxel.line(x1, y1, x2, y2, ROAD_COLOR)
+        calls += 1
+    return calls
+
+
+def camera_path(
+    map_pixel_width: int, map_pixel_height: int, frames: int
+) -> List[Tuple[float, float]]:
+    """マップ全体を斜めに往復するカメラ位置の列"""
+    max_x = max(0, map_pixel_width - screen_width)
+    max_y = max(0, map_pixel_height - screen_height)
+    path = []
+    for frame in range(frames):
+        t = (frame % 240) / 120
+        t = t if t <= 1 else 2 - t
+        path.append((t * max_x, t * max_y))
+    return path
+
+
+def measure(
+    draw: Callable[[float, float], int], cameras: List[Tuple[float, float]]
+) -> Tuple[float, float]:
+    """1フレームあたりの描画時間（ミリ秒）と描画呼び出し数の平均"""
+    calls = 0
+    start = time.perf_counter()
+    for camera_x, camera_y in cameras:
+        pyxel.cls(3)
+        calls += draw(camera_x, camera_y)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / len(cameras), calls / len(cameras)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-frame cost of map drawing strategies"
+    )
+    parser.add_argument("--frames", type=int, default=600, help="Frames to draw")
+    parser.add_argument(
+        "--map-size",
+        type=int,
+        nargs="+",
+        default=[17, 65],
+        help="Map widths/heights in tiles",
+    )
+    args = parser.parse_args()
+
+    pyxel.init(screen_width, screen_height)
+    tile_size = create_default_coordinate_transformer().tile_size
+
+    print(f"{'map':>7} {'method':>10} {'ms/frame':>9} {'calls/frame':>12}")
+    for map_size in args.map_size:
+        map_data = generate_map_data(map_size, map_size)
+        cameras = camera_path(map_size * tile_size, map_size * tile_size, args.frames)
+        background = BakedBackground(map_data, tile_size)
+        segments = generate_road_segments(map_size, tile_size)
+        road_layer = RoadLayer(map_size * tile_size, map_size * tile_size)
+        road_layer.sync(segments)
+
+        def draw_baked(camera_x: float, camera_y: float) -> int:
+            background.draw(camera_x, camera_y)
+            return 1
+
+        def draw_per_tile(camera_x: float, camera_y: float) -> int:
+            return draw_background_per_tile(map_data, tile_size, camera_x, camera_y)
+
+        def draw_road_layer(camera_x: float, camera_y: float) -> int:
+            road_layer.sync(segments)
+            road_layer.draw(camera_x, camera_y)
+            return 1
+
+        def draw_per_road(camera_x: float, camera_y: float) -> int:
+            return draw_roads_per_segment(segments, camera_x, camera_y)
+
+        print(f"{map_size}x{map_size} map, {len(segments)} roads")
+        for method, draw in (
+            ("per-tile", draw_per_tile),
+            ("baked", draw_baked),
+            ("per-road", draw_per_road),
+            ("road layer", draw_road_layer),
+        ):
+            ms_per_frame, calls_per_frame = measure(draw, cameras)
+            print(
+                f"{map_size:>3}x{map_size:<3} {method:>10} "
+                f"{ms_per_frame:>9.3f} {calls_per_frame:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""セーブ形式（JSON / バイナリ）の保存・読み込み時間とファイルサイズのベンチマーク"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from game_state import City, Enemy, GameState, Player, Road
+
+
+def build_game_state(city_count: int) -> GameState:
+    """格子状に都市を並べた大きなマップを生成"""
+    game_state = GameState()
+    columns = max(1, int(city_count**0.5))
+    cities = {}
+    roads = []
+    for index in range(city_count):
+        city_id = index + 1
+        row, col = divmod(index, columns)
+        cities[city_id] = City(city_id, f"City {city_id}", col * 64.0, row * 64.0)
+        if col > 0:
+            roads.append(Road(city_id - 1, city_id))
+        if row > 0:
+            roads.append(Road(city_id - columns, city_id))
+    game_state.cities = cities
+    game_state.roads = roads
+
+    # キャラクターは都市数の1%（最低2体）
+    character_count = max(2, city_count // 100)
+    players = []
+    enemies = []
+    for index in range(character_count):
+        city = cities[index * city_count // character_count + 1]
+        if index % 2 == 0:
+            players.append(Player(city.x, city.y, city.id, name=f"Player {index}"))
+        else:
+            enemy = Enemy(city.x, city.y, city.id, "patrol", name=f"Enemy {index}")
+            enemy.patrol_city_ids = game_state.get_connected_city_ids(city.id)
+            enemies.append(enemy)
+    game_state.players = players
+    game_state.enemies = enemies
+    return game_state
+
+
+def measure(game_state: GameState, save_format: str, path: str):
+    """保存時間、読み込み時間、ファイルサイズを計測"""
+    game_state.save_format = save_format
+    game_state.save_file_path = path
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        game_state.save_to_file()
+        save_time = time.perf_counter() - start
+
+        loaded = GameState()
+        loaded.save_file_path = path
+        start = time.perf_counter()
+        loaded.load_from_file()
+        load_time = time.perf_counter() - start
+    return save_time, load_time, os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark save file formats")
+    parser.add_argument(
+        "--cities",
+        type=int,
+        nargs="+",
+        default=[10, 1000, 100000],
+        help="Map sizes (number of cities) to benchmark",
+    )
+    args = parser.parse_args()
+
+    print(f"{'cities':>8} {'format':>7} {'save ms':>9} {'load ms':>9} {'size KB':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for city_count in args.cities:
+            game_state = build_game_state(city_count)
+            for save_format in ("json", "binary"):
+                path = os.path.join(temp_dir, f"bench.{save_format}")
+                save_time, load_time, size = measure(game_state, save_format, path)
+                print(
+                    f"{city_count:>8} {save_format:>7} {save_time * 1000:>9.1f} "
+                    f"{load_time * 1000:>9.1f} {size / 1024:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
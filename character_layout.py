@@ -0,0 +1,167 @@
+"""
+都市内のキャラクターの配置キャッシュ
+
+同じ都市にいるキャラクターは重ならないように横に並べて描く。
+都市ごとに並び（Xオフセットとワールド座標の矩形）をキャッシュしておき、
+キャラクターの到着・離脱・撃破が通知された都市だけを計算し直す
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+
+from state_events import CHARACTER_DIED, CHARACTER_MOVED
+
+if TYPE_CHECKING:
+    from game_state import Character, GameState
+    from map_culling import MapCullingIndex
+    from state_events import InvalidationCounter
+
+Rect = Tuple[float, float, float, float]  # min_x, min_y, max_x, max_y
+
+
+def character_rect(character: "Character", layout_x: float) -> Rect:
+    """並び位置（ワールドX座標）に置いたキャラクターの矩形"""
+    half_width = character.width // 2
+    half_height = character.height // 2
+    return (
+        layout_x - half_width,
+        character.y - half_height,
+        layout_x + half_width,
+        character.y + half_height,
+    )
+
+
+class CharacterLayoutCache:
+    """都市ごとの停止中のキャラクターの配置キャッシュ
+
+    カリング用インデックスのキャラクターの登録（停止位置・移動中・撃破）も
+    ここで更新するので、キャラクターの選択はインデックスで候補を絞ってから
+    矩形で判定する
+    """
+
+    def __init__(self, culling: "MapCullingIndex"):
+        self.culling = culling
+        self.game_state: Optional["GameState"] = None
+        self.invalidation_counter: Optional["InvalidationCounter"] = None
+        # キャラクターID → (都市内の並びによるXオフセット, ワールド座標の矩形)
+        self._layouts: Dict[int, Tuple[float, Rect]] = {}
+        # キャラクターID → 配置を計算した都市ID、都市ID → 配置したキャラクターID
+        self._layout_cities: Dict[int, int] = {}
+        self._layout_members: Dict[int, List[int]] = {}
+        self._stale_cities: Set[int] = set()
+
+    def subscribe(self, game_state: "GameState", invalidation_counter=None):
+        """GameStateの状態変更イベントを購読して配置をキャッシュする"""
+        self.game_state = game_state
+        self.invalidation_counter = invalidation_counter
+        self._layouts = {}
+        self._layout_cities = {}
+        self._layout_members = {}
+        self._stale_cities = set(game_state.get_occupied_city_ids())
+        for character in game_state.players + game_state.enemies:
+            if character.current_city_id is None:
+                self.culling.set_moving(character)  # 都市にいない場合は毎フレーム判定
+        game_state.events.subscribe(CHARACTER_MOVED, self._on_character_moved)
+        game_state.events.subscribe(CHARACTER_DIED, self._on_character_died)
+
+    def _on_character_moved(self, event):
+        if event.character.is_moving or event.to_city_id is None:
+            # 移動中・都市にいないキャラクターは毎フレーム画面内か判定する
+            self.culling.set_moving(event.character)
+        if event.character.is_moving and event.from_city_id is not None:
+            return  # 出発（都市の占有は到着まで変わらない）
+        for city_id in (event.from_city_id, event.to_city_id):
+            self.invalidate_city(city_id)
+
+    def _on_character_died(self, event):
+        self.culling.remove_character(event.character.id)
+        self.invalidate_city(event.city_id)
+
+    def invalidate_city(self, city_id: Optional[int]):
+        """都市の配置を次の問い合わせで計算し直す"""
+        if city_id is not None and city_id not in self._stale_cities:
+            self._stale_cities.add(city_id)
+            if self.invalidation_counter is not None:
+                self.invalidation_counter.count()
+
+    def get_layouts(self) -> Dict[int, Tuple[float, Rect]]:
+        """キャラクターID → (都市内の並びによるXオフセット, ワールド座標の矩形) の辞書
+
+        無効化された都市だけを計算し直して返す（返す辞書は変更しないこと）
+        """
+        if self._stale_cities:
+            for city_id in self._stale_cities:
+                self._rebuild_city(city_id)
+            self._stale_cities.clear()
+        return self._layouts
+
+    def _rebuild_city(self, city_id: int):
+        """1つの都市にいるキャラクターの配置を計算し直す"""
+        for character_id in self._layout_members.pop(city_id, ()):
+            # 既に別の都市で配置を計算し直したキャラクターはそのまま
+            if self._layout_cities.get(character_id) == city_id:
+                del self._layouts[character_id]
+                del self._layout_cities[character_id]
+
+        players, enemies = self.game_state.get_city_occupants(city_id)
+        city_characters = players + enemies
+        if not city_characters:
+            return
+        city_character_count = len(city_characters)
+        for char_index, character in enumerate(city_characters):
+            # 同じCity内で重ならないように横に並べる
+            offset_x = 0
+            if city_character_count > 1:
+                total_width = city_character_count * character.width
+                start_x = -(total_width - character.width) // 2
+                offset_x = start_x + char_index * character.width
+            layout_x = character.x + offset_x
+            self._layouts[character.id] = (
+                offset_x,
+                character_rect(character, layout_x),
+            )
+            self._layout_cities[character.id] = city_id
+
+            # カリング用インデックスにも配置を反映（移動中のキャラクターは別扱い）
+            if character.is_moving:
+                self.culling.set_moving(character)
+            else:
+                self.culling.place_character(character, layout_x)
+        self._layout_members[city_id] = [c.id for c in city_characters]
+
+    def layout_x(self, character: "Character") -> float:
+        """同じCity内で重ならないように横に並べたキャラクターのワールドX座標"""
+        layout = self.get_layouts().get(character.id)
+        if layout is None or character.is_moving or not character.current_city_id:
+            # 移動中または現在のCityがない場合はオフセットなし
+            return character.x
+        return character.x + layout[0]
+
+    def rect(self, character: "Character") -> Rect:
+        """キャラクターの描画範囲（ワールド座標の矩形、停止中はキャッシュを使う）"""
+        layout = self.get_layouts().get(character.id)
+        if layout is None or character.is_moving or not character.current_city_id:
+            return character_rect(character, character.x)
+        return layout[1]
+
+    def character_at(
+        self, world_x: float, world_y: float, team: str
+    ) -> Optional["Character"]:
+        """ワールド座標にいる陣営team（"player" / "enemy"）のキャラクター"""
+        # 座標を含むセルの停止中のキャラクターと移動中のキャラクターだけを調べる
+        self.get_layouts()
+        hits = []
+        for character in self.culling.query_characters(
+            world_x, world_y, world_x, world_y
+        ):
+            if self.game_state.get_team(character.id) != team:
+                continue
+            min_x, min_y, max_x, max_y = self.rect(character)
+            if min_x <= world_x <= max_x and min_y <= world_y <= max_y:
+                hits.append(character)
+        if len(hits) > 1:
+            # 重なっている場合は名簿で先のキャラクター
+            roster = (
+                self.game_state.players if team == "player" else self.game_state.enemies
+            )
+            return min(hits, key=roster.index)
+        return hits[0] if hits else None
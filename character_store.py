@@ -0,0 +1,207 @@
+"""
+キャラクターの状態を型付き配列にまとめて保持するストア（Struct of Arrays）
+
+Player/Enemyは自分のスロット番号を持つだけの軽量なビューで、
+位置・目標・兵力などの値はフィールドごとの配列に格納する。
+移動中のキャラクターはadvance()で1フレーム分をまとめて進める
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+NO_ID = -(1 << 63)  # 都市ID・キャラクターIDがNoneであることを表す値
+
+# 配列の型コードと初期値（浮動小数点のNoneはNaNで表す）
+FLOAT_FIELDS = ("x", "y", "speed", "target_x", "target_y")
+INT_FIELDS = (
+    "life",
+    "max_life",
+    "attack",
+    "initiative",
+    "image_index",
+    "width",
+    "height",
+    "current_city_id",
+    "target_city_id",
+    "id",
+)
+FLAG_FIELDS = ("is_moving", "facing_right")
+
+
+class CharacterStore:
+    """キャラクターの状態をフィールドごとの配列で保持する"""
+
+    def __init__(self):
+        self.arrays: Dict[str, array] = {}
+        for field in FLOAT_FIELDS:
+            self.arrays[field] = array("d")
+        for field in INT_FIELDS:
+            self.arrays[field] = array("q")
+        for field in FLAG_FIELDS:
+            self.arrays[field] = array("b")
+        self._capacity = 0
+        self._free: List[int] = []  # 解放済みで再利用できるスロット
+
+    def __len__(self) -> int:
+        """使用中のスロット数"""
+        return self._capacity - len(self._free)
+
+    def allocate(self) -> int:
+        """スロットを確保（値は呼び出し側で設定する）"""
+        if self._free:
+            return self._free.pop()
+        for field in FLOAT_FIELDS:
+            self.arrays[field].append(math.nan)
+        for field in INT_FIELDS:
+            self.arrays[field].append(NO_ID)
+        for field in FLAG_FIELDS:
+            self.arrays[field].append(0)
+        self._capacity += 1
+        return self._capacity - 1
+
+    def copy_slot(self, slot: int) -> int:
+        """スロットの値を新しいスロットに複製し、そのスロットを返す"""
+        new_slot = self.allocate()
+        for values in self.arrays.values():
+            values[new_slot] = values[slot]
+        return new_slot
+
+    def release(self, slot: int):
+        """スロットを解放して再利用できるようにする"""
+        self.arrays["is_moving"][slot] = 0
+        self._free.append(slot)
+
+    def advance(self, slots: Iterable[int]) -> List[int]:
+        """移動中のスロットを1フレーム分まとめて進め、到着したスロットを返す
+
+        到着したスロットの位置は変更しない（到着処理は呼び出し側で行う）
+        """
+        xs = self.arrays["x"]
+        ys = self.arrays["y"]
+        target_xs = self.arrays["target_x"]
+        target_ys = self.arrays["target_y"]
+        speeds = self.arrays["speed"]
+        moving = self.arrays["is_moving"]
+        facing = self.arrays["facing_right"]
+        isnan = math.isnan
+        arrived = []
+
+        for slot in slots:
+            target_x = target_xs[slot]
+            target_y = target_ys[slot]
+            if not moving[slot] or isnan(target_x) or isnan(target_y):
+                continue
+            dx = target_x - xs[slot]
+            dy = target_y - ys[slot]
+            distance = (dx * dx + dy * dy) ** 0.5
+
+            # 移動方向に基づいて向きを更新
+            if abs(dx) > 1:
+                facing[slot] = dx > 0
+
+            speed = speeds[slot]
+            if distance <= speed:
+                arrived.append(slot)
+            else:
+                xs[slot] += (dx / distance) * speed
+                ys[slot] += (dy / distance) * speed
+
+        return arrived
+
+
+class StoredField:
+    """ストアの配列要素を属性として見せるディスクリプタ"""
+
+    def __init__(self, field: Optional[str] = None):
+        self.field = field
+
+    def __set_name__(self, owner, name):
+        if self.field is None:
+            self.field = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._store.arrays[self.field][obj._slot]
+
+    def __set__(self, obj, value):
+        obj._store.arrays[self.field][obj._slot] = value
+        if obj._owner is not None:
+            obj._owner._dirty_characters.add(obj)  # 差分セーブ用の変更セット
+
+
+class OptionalFloatField(StoredField):
+    """NaNをNoneとして扱う浮動小数点フィールド"""
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj._store.arrays[self.field][obj._slot]
+        return None if math.isnan(value) else value
+
+    def __set__(self, obj, value):
+        obj._store.arrays[self.field][obj._slot] = math.nan if value is None else value
+        if obj._owner is not None:
+            obj._owner._dirty_characters.add(obj)
+
+
+class OptionalIdField(StoredField):
+    """NO_IDをNoneとして扱うIDフィールド"""
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = obj._store.arrays[self.field][obj._slot]
+        return None if value == NO_ID else value
+
+    def __set__(self, obj, value):
+        obj._store.arrays[self.field][obj._slot] = NO_ID if value is None else value
+        if obj._owner is not None:
+            obj._owner._dirty_characters.add(obj)
+
+
+class FlagField(StoredField):
+    """boolとして扱うフラグフィールド"""
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return bool(obj._store.arrays[self.field][obj._slot])
+
+    def __set__(self, obj, value):
+        obj._store.arrays[self.field][obj._slot] = 1 if value else 0
+        if obj._owner is not None:
+            obj._owner._dirty_characters.add(obj)
+
+
+class TrackedSlot:
+    """__slots__ の値を属性として見せ、代入時に変更セットへ通知するディスクリプタ
+
+    値はクラスの __slots__ に宣言した "_" + 属性名 のスロットに格納する。
+    リストなどを直接書き換えた場合は通知されないので、代入し直すこと
+    """
+
+    def __set_name__(self, owner, name):
+        self._member = owner.__dict__["_" + name]
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return self._member.__get__(obj, objtype)
+
+    def __set__(self, obj, value):
+        self._member.__set__(obj, value)
+        if obj._owner is not None:
+            obj._owner._dirty_characters.add(obj)
+
+
+def plain_number(value: float):
+    """整数値の浮動小数点数をintに戻す（to_dictの出力を従来と同じ見た目に保つ）"""
+    if value is not None and value.is_integer():
+        return int(value)
+    return value
+
+
+# キャラクターが既定で使うストア
+default_store = CharacterStore()
@@ -0,0 +1,250 @@
+"""
+敵AIの行動決定（pyxelに依存しない純粋なロジック）
+"""
+
+import weakref
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import tactical_ai
+from game_state import City, Enemy, GameState, Player
+from pathfinding import RoadWeight, find_path, get_routing_table
+
+# GameStateごとのプレイヤー距離場のキャッシュ
+_distance_fields: "weakref.WeakKeyDictionary[GameState, PlayerDistanceField]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _city_id(city) -> int:
+    return city.id if isinstance(city, City) else city
+
+
+def get_connected_cities(game_state: GameState, city) -> List[City]:
+    """指定したCityに接続されているCityのリストを取得"""
+    connected_ids = game_state.get_connected_city_ids(_city_id(city))
+    return [
+        game_state.get_city_by_id(city_id)
+        for city_id in connected_ids
+        if game_state.get_city_by_id(city_id)
+    ]
+
+
+def get_distance_to_nearest_player(
+    game_state: GameState, enemy_city: City
+) -> Tuple[float, Optional[Player]]:
+    """指定したCityから最も近いプレイヤーまでの距離を計算"""
+    min_distance = float("inf")
+    nearest_player = None
+
+    for player in game_state.players:
+        if player.current_city_id:
+            player_city = game_state.get_city_by_id(player.current_city_id)
+            if player_city:
+                dx = player_city.x - enemy_city.x
+                dy = player_city.y - enemy_city.y
+                distance = (dx * dx + dy * dy) ** 0.5
+                if distance < min_distance:
+                    min_distance = distance
+                    nearest_player = player
+
+    return min_distance, nearest_player
+
+
+def find_path_to_target(
+    game_state: GameState,
+    start_city,
+    target_city,
+    weight: Optional[RoadWeight] = None,
+) -> List[City]:
+    """A*で目標Cityへの最短経路（始点を含まないCityのリスト）を見つける"""
+    path = find_path(game_state, _city_id(start_city), _city_id(target_city), weight)
+    return [game_state.cities[city_id] for city_id in path]
+
+
+class PlayerDistanceField:
+    """全都市から最寄りのプレイヤーまでの道路上のホップ数と次の移動先
+
+    プレイヤーのいる全都市を始点とする1回のBFSで構築する。
+    到達できない都市は含まない
+    """
+
+    def __init__(self, game_state: GameState):
+        self._roads = game_state.roads
+        self._road_count = len(game_state.roads)
+        self._player_city_ids = _player_city_ids(game_state)
+        self.distance: Dict[int, int] = {}
+        # 都市ID → 最寄りのプレイヤーに1ホップ近づく隣接都市ID（始点はNone）
+        self.next_hop: Dict[int, Optional[int]] = {}
+
+        queue = deque()
+        for city_id in self._player_city_ids:
+            if city_id not in self.distance:
+                self.distance[city_id] = 0
+                self.next_hop[city_id] = None
+                queue.append(city_id)
+        while queue:
+            city_id = queue.popleft()
+            distance = self.distance[city_id] + 1
+            for connected_city_id in game_state.get_connected_city_ids(city_id):
+                if connected_city_id not in self.distance:
+                    self.distance[connected_city_id] = distance
+                    self.next_hop[connected_city_id] = city_id
+                    queue.append(connected_city_id)
+
+    def is_current(self, game_state: GameState) -> bool:
+        """道路とプレイヤーの位置が構築時から変わっていないか"""
+        return (
+            self._roads is game_state.roads
+            and self._road_count == len(game_state.roads)
+            and self._player_city_ids == _player_city_ids(game_state)
+        )
+
+    def distance_from(self, city_id: int) -> float:
+        """最寄りのプレイヤーまでのホップ数（到達できなければinf）"""
+        return self.distance.get(city_id, float("inf"))
+
+
+def _player_city_ids(game_state: GameState) -> Tuple[int, ...]:
+    return tuple(
+        player.current_city_id
+        for player in game_state.players
+        if player.current_city_id is not None
+    )
+
+
+def get_player_distance_field(game_state: GameState) -> PlayerDistanceField:
+    """プレイヤー距離場を取得（道路やプレイヤーの位置が変わった場合のみ再構築）"""
+    field = _distance_fields.get(game_state)
+    if field is None or not field.is_current(game_state):
+        # スナップショットでは共有元の距離場がそのまま使えればそれを使う
+        for source in game_state.snapshot_sources():
+            source_field = _distance_fields.get(source)
+            if source_field is not None and source_field.is_current(game_state):
+                return source_field
+        field = PlayerDistanceField(game_state)
+        _distance_fields[game_state] = field
+    return field
+
+
+def decide_enemy_action(game_state: GameState, enemy: Enemy) -> Optional[City]:
+    """敵のAIに基づいて行動を決定"""
+    if not enemy.current_city_id:
+        return None
+
+    current_city = game_state.get_city_by_id(enemy.current_city_id)
+    if not current_city:
+        return None
+
+    connected_cities = get_connected_cities(game_state, current_city)
+    if not connected_cities:
+        return None
+
+    if enemy.ai_type == "random":
+        # ランダムに接続されたCityから選択
+        return game_state.ai_rng.choice(connected_cities)
+
+    elif enemy.ai_type == "aggressive":
+        # 最寄りのプレイヤーに1ホップ近づく
+        next_city_id = get_player_distance_field(game_state).next_hop.get(
+            current_city.id
+        )
+        if next_city_id is not None:
+            return game_state.get_city_by_id(next_city_id)
+
+        # プレイヤーに到達できない（または同じ都市にいる）場合はランダム移動
+        return game_state.ai_rng.choice(connected_cities)
+
+    elif enemy.ai_type == "defensive":
+        # プレイヤーから遠ざかろうとする行動
+        field = get_player_distance_field(game_state)
+        best_city = None
+        max_distance = field.distance_from(current_city.id)
+
+        # 接続されたCityの中で最もプレイヤーから遠いCityを選択
+        for city in connected_cities:
+            distance = field.distance_from(city.id)
+            if distance > max_distance:
+                max_distance = distance
+                best_city = city
+
+        if best_city:
+            return best_city
+
+        # 遠ざかる場所がない場合はランダム移動
+        return game_state.ai_rng.choice(connected_cities)
+
+    elif enemy.ai_type == "patrol":
+        # パトロールルートに沿って移動
+        if enemy.patrol_city_ids and len(enemy.patrol_city_ids) > 1:
+            # 次のパトロール地点を取得
+            next_index = (enemy.patrol_index + 1) % len(enemy.patrol_city_ids)
+            target_city_id = enemy.patrol_city_ids[next_index]
+            target_city = game_state.get_city_by_id(target_city_id)
+
+            if target_city:
+                # 経路表から次のパトロール地点への最初の移動先を引く
+                # （patrol_indexは移動を指示したときにGameState.order_moveが進める。
+                # ワーカースレッドで決定しても状態を変更しないようにここでは書かない）
+                next_city_id = get_routing_table(game_state).next_hop(
+                    current_city.id, target_city.id
+                )
+                if next_city_id is not None:
+                    return game_state.get_city_by_id(next_city_id)
+                else:
+                    # 直接接続されているかチェック
+                    if target_city in connected_cities:
+                        return target_city
+
+        # パトロールルートが設定されていない場合はランダム移動
+        return game_state.ai_rng.choice(connected_cities)
+
+    elif enemy.ai_type == "tactical":
+        # 数ターン先までモンテカルロ木探索で読んで移動先を決める
+        # （プレイアウト回数で止めるので、同じシードなら結果も同じ）
+        result = tactical_ai.decide_tactical_move(game_state, enemy)
+        if result.city_id is not None:
+            return game_state.get_city_by_id(result.city_id)
+        return game_state.ai_rng.choice(connected_cities)
+
+    # デフォルトはランダム移動
+    return game_state.ai_rng.choice(connected_cities)
+
+
+def plan_enemy_turn(game_state: GameState) -> List[Tuple[Enemy, City]]:
+    """移動していない全ての敵の行動をまとめて決定し、(敵, 移動先)のリストを返す
+
+    距離場・経路表は全員で共有するため、敵の数が増えても探索は増えない
+    """
+    moves = []
+    for enemy in game_state.enemies:
+        if enemy.is_moving:
+            continue
+        target_city = decide_enemy_action(game_state, enemy)
+        if target_city and game_state.are_cities_connected(
+            enemy.current_city_id, target_city.id
+        ):
+            moves.append((enemy, target_city))
+    return moves
+
+
+def decide_enemy_turn(game_state: GameState) -> List[Tuple[Enemy, Optional[City]]]:
+    """敵ターンの行動を決定し、(敵, 移動先)のリストを返す
+
+    "single"モードでは選んだ1体だけ（移動先がなければNone）、
+    "all"モードではplan_enemy_turnの結果を返す
+    """
+    if game_state.enemy_turn_mode == "all":
+        return plan_enemy_turn(game_state)
+    enemy = select_enemy_to_move(game_state)
+    if enemy is None:
+        return []
+    return [(enemy, decide_enemy_action(game_state, enemy))]
+
+
+def select_enemy_to_move(game_state: GameState) -> Optional[Enemy]:
+    """このターンに移動する敵を選択（まだ移動していない敵からランダム）"""
+    available_enemies = [enemy for enemy in game_state.enemies if not enemy.is_moving]
+    if not available_enemies:
+        return None
+    return game_state.ai_rng.choice(available_enemies)
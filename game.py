@@ -1,8 +1,11 @@
 import argparse
+import atexit
 import os
 
 import pyxel
 
+from save_service import shutdown_default_save_service
+
 fps = 30  # FPSを30で定義
 pyxres_file = "resources.pyxres"  # pyxresファイル名を変数で定義
 screen_width = 320  # スクリーン幅
@@ -138,6 +141,8 @@ class App:
             screen_width, screen_height, fps=fps, quit_key=pyxel.KEY_NONE
         )  # 変数を適用
         pyxel.load(pyxres_file)
+        # 終了時にバックグラウンドのセーブを書き出しきる
+        atexit.register(shutdown_default_save_service)
         self.scene = TitleScene()
         pyxel.run(self.update, self.draw)
 
@@ -0,0 +1,70 @@
+"""
+シード付きで分岐可能な乱数生成器
+"""
+
+import random
+import zlib
+from typing import Optional
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix64(z: int) -> int:
+    """SplitMix64の出力関数（64ビット値をよく混ぜる）"""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class GameRandom(random.Random):
+    """SplitMix64による乱数生成器
+
+    状態が64ビット整数1つなのでセーブデータに含めやすい。
+    split()でラベルごとに独立した子ストリームを決定的に作れる
+    （子の生成は親の乱数列を消費しない）
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._state = 0
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = random.SystemRandom().getrandbits(64)
+        self.initial_seed = int(a) & _MASK64
+        self._state = self.initial_seed
+        self.gauss_next = None
+
+    def getstate(self) -> int:
+        return self._state
+
+    def setstate(self, state: int):
+        self._state = int(state) & _MASK64
+        self.gauss_next = None
+
+    def _next64(self) -> int:
+        self._state = (self._state + _GOLDEN_GAMMA) & _MASK64
+        return _mix64(self._state)
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            return self._next64() >> (64 - k)
+        result = 0
+        for shift in range(0, k, 64):
+            result |= self._next64() << shift
+        return result & ((1 << k) - 1)
+
+    def random(self) -> float:
+        return (self._next64() >> 11) * (1.0 / (1 << 53))
+
+    def copy(self) -> "GameRandom":
+        """同じシード・同じ状態の独立した乱数生成器を作成"""
+        clone = GameRandom(self.initial_seed)
+        clone._state = self._state
+        return clone
+
+    def split(self, label: str) -> "GameRandom":
+        """ラベルから決定的に導出した独立な子ストリームを作成"""
+        label_hash = zlib.crc32(label.encode("utf-8"))
+        return GameRandom(_mix64(self.initial_seed ^ _mix64(label_hash)))
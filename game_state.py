@@ -1,13 +1,47 @@
+import gc
 import json
 import os
 import random
-from typing import Any, Dict, List, Optional
-
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from character_store import (
+    CharacterStore,
+    FlagField,
+    OptionalFloatField,
+    OptionalIdField,
+    StoredField,
+    TrackedSlot,
+    default_store,
+    plain_number,
+)
 from coordinate_utils import create_default_coordinate_transformer
 from geometry_utils import point_too_close_to_line, roads_intersect
+from game_rng import GameRandom
+from json_snapshot import IncrementalJSONEncoder
+from save_format import BinarySave, encode_game_state, is_binary_save
+from save_service import SaveService, write_atomic
+from spatial_index import SpatialGrid
+from state_events import (
+    BATTLE_RESOLVED,
+    CHARACTER_DIED,
+    CHARACTER_MOVED,
+    CITY_DISCOVERED,
+    ROAD_ADDED,
+    TURN_SWITCHED,
+    StateEventBus,
+)
 
 # 都市発見の設定
 CITY_DISCOVERY_INTERVAL = 1  # nターンごとに新都市発見（n=1で毎ターン）
+PLACEMENT_GRID_CELL_SIZE = 64  # 都市配置検証用空間インデックスのセルサイズ（ピクセル）
+
+# 敵ターンの進め方（"single": 1体ずつ選んで移動、"all": 全員の行動をまとめて決めて同時に移動）
+ENEMY_TURN_MODE = "single"
+
+# オートセーブ（ターンジャーナル）の設定
+SNAPSHOT_INTERVAL_TURNS = 10  # nターンごとにフルスナップショットを書き出す
+JOURNAL_SIZE_LIMIT = 64 * 1024  # ジャーナルがこのバイト数を超えたらスナップショットで圧縮
 
 # 都市とキャラクターの名前組み合わせ辞書
 CITY_CHARACTER_NAMES = {
@@ -132,6 +166,29 @@ class Road:
 
 
 class Character:
+    """キャラクター（値はCharacterStoreの配列に格納し、自身はスロットを指すビュー）"""
+
+    __slots__ = ("_store", "_slot", "_owner", "_name")
+
+    x = StoredField()
+    y = StoredField()
+    width = StoredField()
+    height = StoredField()
+    speed = StoredField()
+    target_x = OptionalFloatField()
+    target_y = OptionalFloatField()
+    target_city_id = OptionalIdField()
+    is_moving = FlagField()
+    facing_right = FlagField()
+    _current_city_id = OptionalIdField("current_city_id")
+    id = OptionalIdField()  # 永続的なキャラクターID（GameStateへの登録時に採番）
+    image_index = StoredField()
+    life = StoredField()
+    max_life = StoredField()
+    attack = StoredField()
+    initiative = StoredField()
+    name = TrackedSlot()
+
     def __init__(
         self,
         x: float,
@@ -143,7 +200,13 @@ class Character:
         initiative: int = 10,
         image_index: int = 0,
         name: str = "Unknown",
+        store: Optional[CharacterStore] = None,
     ):
+        self._store = store if store is not None else default_store
+        self._slot = self._store.allocate()
+        # 所属するGameState（都市占有インデックスと変更セットへの通知先）
+        self._owner: Optional["GameState"] = None
+        self.id: Optional[int] = None
         self.x = x
         self.y = y
         self.width = 16  # char_width相当
@@ -154,7 +217,7 @@ class Character:
         self.target_city_id: Optional[int] = None
         self.is_moving = False
         self.facing_right = True
-        self.current_city_id = current_city_id  # 都市IDに変更
+        self._current_city_id = current_city_id  # 都市IDに変更
         self.image_index = image_index  # 画像の段数（0=1段目、1=2段目、2=3段目）
         self.name = name  # キャラクター名
         # 戦闘ステータス
@@ -163,6 +226,32 @@ class Character:
         self.attack = attack  # 攻撃力
         self.initiative = initiative  # イニシアチブ値（行動順決定）
 
+    def __del__(self):
+        store = getattr(self, "_store", None)
+        if store is not None and hasattr(self, "_slot"):
+            store.release(self._slot)
+
+    def copy(self) -> "Character":
+        """同じ値を持つキャラクターをストアの新しいスロットに作成（どのGameStateにも属さない）"""
+        clone = object.__new__(type(self))
+        clone._store = self._store
+        clone._slot = self._store.copy_slot(self._slot)
+        clone._owner = None
+        clone.name = self.name
+        return clone
+
+    @property
+    def current_city_id(self) -> Optional[int]:
+        return self._current_city_id
+
+    @current_city_id.setter
+    def current_city_id(self, city_id: Optional[int]):
+        old_city_id = self._current_city_id
+        self._current_city_id = city_id
+        if self._owner is not None and old_city_id != city_id:
+            # 都市の到着・離脱を占有インデックスに反映
+            self._owner._on_character_city_changed(self, old_city_id)
+
     def get_hover_info(self) -> List[str]:
         """ホバー時に表示する情報を取得（基底クラスの実装）"""
         info_lines = []
@@ -180,13 +269,14 @@ class Character:
 
     def to_dict(self) -> Dict[str, Any]:
         return {
-            "x": self.x,
-            "y": self.y,
+            "id": self.id,
+            "x": plain_number(self.x),
+            "y": plain_number(self.y),
             "width": self.width,
             "height": self.height,
-            "speed": self.speed,
-            "target_x": self.target_x,
-            "target_y": self.target_y,
+            "speed": plain_number(self.speed),
+            "target_x": plain_number(self.target_x),
+            "target_y": plain_number(self.target_y),
             "target_city_id": self.target_city_id,
             "is_moving": self.is_moving,
             "facing_right": self.facing_right,
@@ -201,6 +291,7 @@ class Character:
 
     def update_from_dict(self, data: Dict[str, Any]):
         """辞書からキャラクターデータを更新"""
+        self.id = data.get("id")  # 古いセーブファイルには含まれない（登録時に採番）
         self.x = data["x"]
         self.y = data["y"]
         self.width = data.get("width", 16)
@@ -221,6 +312,8 @@ class Character:
 
 
 class Player(Character):
+    __slots__ = ()
+
     def __init__(
         self,
         x: float,
@@ -228,6 +321,7 @@ class Player(Character):
         current_city_id: Optional[int] = None,
         initiative: int = 15,
         name: str = "Player",
+        store: Optional[CharacterStore] = None,
     ):
         super().__init__(
             x,
@@ -239,6 +333,7 @@ class Player(Character):
             initiative=initiative,
             image_index=0,
             name=name,
+            store=store,
         )  # 1段目を使用、イニシアチブを引数で受け取る
 
     def get_hover_info(self) -> List[str]:
@@ -265,6 +360,19 @@ class Player(Character):
 
 
 class Enemy(Character):
+    __slots__ = (
+        "_ai_type",
+        "_patrol_city_ids",
+        "_patrol_index",
+        "_last_player_position",
+    )
+
+    # 配列に入らない値も代入時に差分セーブ用の変更セットへ通知する
+    ai_type = TrackedSlot()
+    patrol_city_ids = TrackedSlot()
+    patrol_index = TrackedSlot()
+    last_player_position = TrackedSlot()
+
     def __init__(
         self,
         x: float,
@@ -273,6 +381,7 @@ class Enemy(Character):
         ai_type: str = "random",
         image_index: int = 1,
         name: str = "Enemy",
+        store: Optional[CharacterStore] = None,
     ):
         # AIタイプに応じてイニシアチブを設定
         initiative_by_type = {
@@ -280,6 +389,7 @@ class Enemy(Character):
             "defensive": 8,  # 防御的：低い
             "patrol": 10,  # パトロール：標準
             "random": 10,  # ランダム：標準
+            "tactical": 11,  # 戦術（先読み）：やや高い
         }
         initiative = initiative_by_type.get(ai_type, 10)
 
@@ -293,6 +403,7 @@ class Enemy(Character):
             initiative=initiative,
             image_index=image_index,
             name=name,
+            store=store,
         )  # 2段目以降を使用
         self.ai_type = ai_type
         self.patrol_city_ids: List[int] = []  # 都市IDのリストに変更
@@ -313,18 +424,36 @@ class Enemy(Character):
             info_lines.append("Patrols route")
         elif self.ai_type == "random":
             info_lines.append("Moves randomly")
+        elif self.ai_type == "tactical":
+            info_lines.append("Plans turns ahead")
 
         return info_lines
 
+    def copy(self) -> "Enemy":
+        clone = super().copy()
+        clone.ai_type = self.ai_type
+        clone.patrol_city_ids = list(self.patrol_city_ids)
+        clone.patrol_index = self.patrol_index
+        clone.last_player_position = (
+            dict(self.last_player_position)
+            if self.last_player_position is not None
+            else None
+        )
+        return clone
+
     def to_dict(self) -> Dict[str, Any]:
         data = super().to_dict()
         data.update(
             {
                 "type": "enemy",
                 "ai_type": self.ai_type,
-                "patrol_city_ids": self.patrol_city_ids,
+                "patrol_city_ids": list(self.patrol_city_ids),
                 "patrol_index": self.patrol_index,
-                "last_player_position": self.last_player_position,
+                "last_player_position": (
+                    dict(self.last_player_position)
+                    if self.last_player_position is not None
+                    else None
+                ),
             }
         )
         return data
@@ -349,7 +478,10 @@ class Enemy(Character):
 
 
 def get_character_name_for_city(
-    city_name: str, character_type: str, used_names: set = None
+    city_name: str,
+    character_type: str,
+    used_names: set = None,
+    rng: Optional[random.Random] = None,
 ) -> str:
     """指定された都市とキャラクタータイプに基づいて名前を選択する
 
@@ -357,12 +489,15 @@ def get_character_name_for_city(
         city_name: 都市名
         character_type: "players" または "enemies"
         used_names: 既に使用された名前のセット（重複回避）
+        rng: 名前の選択に使う乱数生成器（省略時はグローバルなrandom）
 
     Returns:
         選択された名前
     """
     if used_names is None:
         used_names = set()
+    if rng is None:
+        rng = random
 
     # 都市名に対応する名前リストを取得
     if (city_name in CITY_CHARACTER_NAMES
@@ -373,10 +508,10 @@ def get_character_name_for_city(
             name for name in available_names if name not in used_names
         ]
         if unused_names:
-            return random.choice(unused_names)
+            return rng.choice(unused_names)
         else:
             # 全て使用済みの場合は番号付きで返す
-            base_name = random.choice(available_names)
+            base_name = rng.choice(available_names)
             counter = 2
             while f"{base_name}{counter}" in used_names:
                 counter += 1
@@ -394,10 +529,10 @@ def get_character_name_for_city(
             name for name in available_names if name not in used_names
         ]
         if unused_names:
-            return random.choice(unused_names)
+            return rng.choice(unused_names)
         else:
             # フォールバック名も全て使用済みの場合
-            base_name = random.choice(available_names)
+            base_name = rng.choice(available_names)
             counter = 2
             while f"{base_name}{counter}" in used_names:
                 counter += 1
@@ -406,20 +541,144 @@ def get_character_name_for_city(
     return "Unknown"
 
 
+class CharacterRoster(list):
+    """GameStateの占有インデックスと連動するキャラクターリスト
+
+    append は差分更新、それ以外の変更はインデックスを再構築する
+    """
+
+    def __init__(self, characters=(), owner: Optional["GameState"] = None):
+        super().__init__(characters)
+        self._owner = owner
+
+    def append(self, character):
+        super().append(character)
+        if self._owner is not None:
+            self._owner._register_character(self, character)
+
+    def _reset(self):
+        if self._owner is not None:
+            self._owner._rebuild_occupancy()
+
+    def extend(self, characters):
+        super().extend(characters)
+        self._reset()
+
+    def insert(self, index, character):
+        super().insert(index, character)
+        self._reset()
+
+    def remove(self, character):
+        super().remove(character)
+        self._reset()
+
+    def pop(self, index=-1):
+        character = super().pop(index)
+        self._reset()
+        return character
+
+    def clear(self):
+        super().clear()
+        self._reset()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._reset()
+
+    def reverse(self):
+        super().reverse()
+        self._reset()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reset()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reset()
+
+    def __iadd__(self, characters):
+        super().extend(characters)
+        self._reset()
+        return self
+
+
+# スナップショット間で共有するコンテナ（名前 → 代表する属性）
+_SHARED_CONTAINERS = {"cities": "cities", "roads": "_roads", "occupancy": "_occupancy"}
+
+
+def _road_key(city1_id: int, city2_id: int) -> Tuple[int, int]:
+    """道路の向きに依存しない接続キーを作成"""
+    if city1_id <= city2_id:
+        return (city1_id, city2_id)
+    return (city2_id, city1_id)
+
+
 class GameState:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
+        # ゲームごとの乱数生成器（省略時はランダムなシード）と用途別の子ストリーム
+        self.rng = GameRandom(seed)
+        self.discovery_rng = self.rng.split("discovery")  # 都市発見
+        self.ai_rng = self.rng.split("ai")  # 敵AIの行動決定
+        self.naming_rng = self.rng.split("naming")  # キャラクター名
+        self._saved_rng_state: Optional[Dict[str, Any]] = None
+        # 状態変更イベントの購読（描画用キャッシュの無効化など、state_events を参照）
+        self.events = StateEventBus()
+
         self.cities: Dict[int, City] = {}  # 整数IDをキーに変更
+        # 道路グラフの隣接インデックス（roads の代入・add_road で更新）
+        self._adjacency: Dict[int, List[int]] = {}
+        self._road_keys: Set[Tuple[int, int]] = set()
+        # 都市配置検証用の空間インデックス（道路・都市・占有タイル）
+        self._coord_transformer = create_default_coordinate_transformer()
+        self._road_grid = SpatialGrid(PLACEMENT_GRID_CELL_SIZE)
+        self._city_grid = SpatialGrid(PLACEMENT_GRID_CELL_SIZE)
+        self._occupied_tiles: Set[Tuple[int, int]] = set()
+        self._geometry_cities: Optional[Dict[int, City]] = None
+        self._geometry_city_count = 0
+        self._geometry_road_count = 0
         self.roads: List[Road] = []
-        self.players: List[Player] = []
-        self.enemies: List[Enemy] = []
+        # 都市占有インデックス（都市ID → (プレイヤー, 敵)、名簿順を保持）
+        self._occupancy: Dict[int, Tuple[List[Player], List[Enemy]]] = {}
+        self._roster_seq: Dict[Character, int] = {}
+        self._next_roster_seq = 0
+        # キャラクターIDの登録簿（ID → キャラクター、ID は削除後も再利用しない）
+        self._characters_by_id: Dict[int, Character] = {}
+        self._next_character_id = 1
+        # 前回のJSONセーブ以降に変更されたキャラクター（差分エンコード用）
+        self._dirty_characters: Set[Character] = set()
+        self._json_encoder = IncrementalJSONEncoder()
+        self._players: List[Player] = CharacterRoster((), self)
+        self._enemies: List[Enemy] = CharacterRoster((), self)
         self.current_turn = "player"
         self.turn_counter = 1
         self.player_moved_this_turn = False
         self.enemy_moved_this_turn = False
         self.current_ai_enemy_index: Optional[int] = None
+        self.enemy_turn_mode = ENEMY_TURN_MODE
 
         # ゲーム状態ファイルのパス
         self.save_file_path = os.path.join("saves", "game_state.json")
+        # スナップショットの保存形式（"json" または "binary"、ロード時は自動判定）
+        self.save_format = "json"
+        # バックグラウンドでセーブを書き出すサービス（Noneの場合はその場で書き出す）
+        self.save_service: Optional[SaveService] = None
+        # 自動セーブの有効/無効（ヘッドレスシミュレーションでは無効にする）
+        self.autosave_enabled = True
+
+        # ターンジャーナル（スナップショット行の後ろに追記するイベント）
+        self._journal_pending: List[Dict[str, Any]] = []  # 未書き出しのイベント
+        self._journal_seq = 0  # 最後に発行したイベントの通し番号
+        self._journal_bytes = 0  # セーブファイル内のジャーナル部分のサイズ
+        self._snapshot_turn: Optional[int] = None  # 最後のスナップショットのターン
+        # 記録されたイベントを受け取るリスナー（リプレイ記録など）
+        self.event_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+        # コピーオンライトのスナップショット（snapshot() を参照）
+        self._shared: Set[str] = set()  # 元の状態と共有中のコンテナ名
+        self._sources: Tuple[weakref.ref, ...] = ()  # 共有元の状態（親から順）
+        self._snapshots: "weakref.WeakSet[GameState]" = weakref.WeakSet()
+        self._clones: Dict[Character, Character] = {}  # 共有元のキャラクター → 複製
 
         # savesフォルダが存在しない場合は作成
         os.makedirs(os.path.dirname(self.save_file_path), exist_ok=True)
@@ -453,11 +712,11 @@ class GameState:
         used_names = set()
 
         central_player_name = get_character_name_for_city(
-            "Central", "players", used_names
+            "Central", "players", used_names, self.naming_rng
         )
         used_names.add(central_player_name)
         west_player_name = get_character_name_for_city(
-            "West", "players", used_names
+            "West", "players", used_names, self.naming_rng
         )
         used_names.add(west_player_name)
 
@@ -475,7 +734,7 @@ class GameState:
 
         # 敵を作成（East に1体配置）
         east_enemy_name = get_character_name_for_city(
-            "East", "enemies", used_names
+            "East", "enemies", used_names, self.naming_rng
         )
         used_names.add(east_enemy_name)
 
@@ -495,24 +754,294 @@ class GameState:
         city = self.cities.get(city_id)
         return city.name if city else str(city_id)
 
+    @property
+    def roads(self) -> List[Road]:
+        """道路リスト（追加は add_road を使用すること）"""
+        return self._roads
+
+    @roads.setter
+    def roads(self, roads: List[Road]):
+        self._roads = list(roads)
+        self._rebuild_adjacency()
+        self._geometry_cities = None  # 空間インデックスは次回使用時に再構築
+
+    def _rebuild_adjacency(self):
+        """道路リストから隣接インデックスを再構築"""
+        self._adjacency = {}
+        self._road_keys = set()
+        for road in self._roads:
+            self._index_road(road)
+
+    def _index_road(self, road: Road):
+        """道路1本を隣接インデックスに登録（道路リストの走査順を保持）"""
+        self._adjacency.setdefault(road.city1_id, []).append(road.city2_id)
+        if road.city2_id != road.city1_id:
+            self._adjacency.setdefault(road.city2_id, []).append(road.city1_id)
+        self._road_keys.add(_road_key(road.city1_id, road.city2_id))
+
+    def add_road(self, road: Road):
+        """道路を追加して隣接インデックスと空間インデックスを更新"""
+        self._prepare_write("roads")
+        geometry_indexed = self._is_geometry_index_current()
+        self._roads.append(road)
+        self._index_road(road)
+        if geometry_indexed:
+            self._index_road_geometry(road)
+        self.events.publish(ROAD_ADDED, road=road)
+
+    @property
+    def players(self) -> List[Player]:
+        return self._players
+
+    @players.setter
+    def players(self, players: List[Player]):
+        self._players = CharacterRoster(players, self)
+        self._rebuild_occupancy()
+
+    @property
+    def enemies(self) -> List[Enemy]:
+        return self._enemies
+
+    @enemies.setter
+    def enemies(self, enemies: List[Enemy]):
+        self._enemies = CharacterRoster(enemies, self)
+        self._rebuild_occupancy()
+
+    def _rebuild_occupancy(self):
+        """名簿全体から都市占有インデックスを再構築"""
+        for character in self._roster_seq:
+            if character._owner is self:
+                character._owner = None
+        self._shared.discard("occupancy")  # 共有中のインデックスは変更せず作り直す
+        self._occupancy = {}
+        self._roster_seq = {}
+        self._next_roster_seq = 0
+        self._characters_by_id = {}
+        for roster in (self._players, self._enemies):
+            for character in roster:
+                self._register_character(roster, character)
+
+    def _register_character(self, roster: CharacterRoster, character: Character):
+        """名簿に追加されたキャラクターを占有インデックスに登録"""
+        self._prepare_write("occupancy")
+        if character._owner is None or not self._shares_with(character._owner):
+            character._owner = self
+        character_id = character.id
+        if character_id is None:
+            character_id = character.id = self._next_character_id
+        elif character_id in self._characters_by_id:
+            # 既存のIDは書き換えない（スナップショットと共有中のキャラクターもあるため）
+            raise ValueError(f"Duplicate character id: {character_id}")
+        self._next_character_id = max(self._next_character_id, character_id + 1)
+        self._characters_by_id[character_id] = character
+        self._roster_seq[character] = self._next_roster_seq
+        self._next_roster_seq += 1
+        self._occupancy_add(character, roster is self._players)
+        self.events.publish(
+            CHARACTER_MOVED,
+            character=character,
+            from_city_id=None,
+            to_city_id=character.current_city_id,
+        )
+
+    def _unregister_character(self, character: Character):
+        """名簿から外れたキャラクターを占有インデックスから削除"""
+        self._prepare_write("occupancy")
+        if character._owner is self:
+            character._owner = None
+        del self._characters_by_id[character.id]
+        self._occupancy_discard(
+            character, character.current_city_id, isinstance(character, Player)
+        )
+        del self._roster_seq[character]
+        self.events.publish(
+            CHARACTER_DIED, character=character, city_id=character.current_city_id
+        )
+
+    def _occupancy_add(self, character: Character, is_player: bool):
+        city_id = character.current_city_id
+        if city_id is None:
+            return
+        bucket = self._occupancy.setdefault(city_id, ([], []))[0 if is_player else 1]
+        # 名簿順を保つ位置に挿入（同一都市のキャラクター数は少ない）
+        seq = self._roster_seq[character]
+        index = len(bucket)
+        while index > 0 and self._roster_seq[bucket[index - 1]] > seq:
+            index -= 1
+        bucket.insert(index, character)
+
+    def _occupancy_discard(
+        self, character: Character, city_id: Optional[int], is_player: bool
+    ):
+        if city_id is None or city_id not in self._occupancy:
+            return
+        occupants = self._occupancy[city_id]
+        bucket = occupants[0 if is_player else 1]
+        if character in bucket:
+            bucket.remove(character)
+        if not occupants[0] and not occupants[1]:
+            del self._occupancy[city_id]
+
+    def _on_character_city_changed(
+        self, character: Character, old_city_id: Optional[int]
+    ):
+        """キャラクターの都市到着・離脱時に呼ばれる"""
+        self._prepare_write("occupancy")
+        is_player = isinstance(character, Player)
+        self._occupancy_discard(character, old_city_id, is_player)
+        self._occupancy_add(character, is_player)
+
+    def get_character(self, character_id: int) -> Optional[Character]:
+        """IDでキャラクターを取得（O(1)、名簿にいなければNone）"""
+        return self._characters_by_id.get(character_id)
+
+    def get_team(self, character_id: int) -> Optional[str]:
+        """キャラクターIDの陣営（"player" / "enemy"）を取得（名簿にいなければNone）"""
+        character = self._characters_by_id.get(character_id)
+        if character is None:
+            return None
+        return "player" if isinstance(character, Player) else "enemy"
+
+    def get_occupied_city_ids(self) -> List[int]:
+        """キャラクターがいる都市IDのリストを取得（都市ID順）"""
+        return sorted(
+            city_id for city_id in self._occupancy if city_id in self.cities
+        )
+
+    def get_city_occupants(self, city_id: int) -> Tuple[List[Player], List[Enemy]]:
+        """指定した都市にいるキャラクターを移動中も含めて取得"""
+        players, enemies = self._occupancy.get(city_id, ((), ()))
+        return list(players), list(enemies)
+
     def get_connected_city_ids(self, city_id: int) -> List[int]:
-        """指定した都市に接続されている都市IDのリストを取得"""
-        connected = []
-        for road in self.roads:
-            if road.city1_id == city_id:
-                connected.append(road.city2_id)
-            elif road.city2_id == city_id:
-                connected.append(road.city1_id)
-        return connected
+        """指定した都市に接続されている都市IDのリストを取得（O(次数)）"""
+        return list(self._adjacency.get(city_id, ()))
 
     def are_cities_connected(self, city1_id: int, city2_id: int) -> bool:
-        """2つの都市が道路で接続されているかチェック"""
-        for road in self.roads:
-            if (road.city1_id == city1_id and road.city2_id == city2_id) or (
-                road.city1_id == city2_id and road.city2_id == city1_id
-            ):
-                return True
-        return False
+        """2つの都市が道路で接続されているかチェック（O(1)）"""
+        return _road_key(city1_id, city2_id) in self._road_keys
+
+    def snapshot(self) -> "GameState":
+        """先読み・戦闘プレビュー・アンドゥ用のコピーオンライトのスナップショットを作成
+
+        都市・道路・占有インデックス・キャラクターは元の状態と共有し、どちらかが
+        変更する時点で必要な分だけコピーする。キャラクターを直接変更する場合は
+        writable() が返すオブジェクトを使うこと（GameStateのメソッドは自動で行う）。
+        スナップショットはセーブもリスナーへのイベント通知も行わない（購読者も引き継がない）
+        """
+        snapshot = GameState.__new__(GameState)
+        snapshot.__dict__.update(self.__dict__)
+        snapshot.rng = self.rng.copy()
+        snapshot.discovery_rng = self.discovery_rng.copy()
+        snapshot.ai_rng = self.ai_rng.copy()
+        snapshot.naming_rng = self.naming_rng.copy()
+        # 空間インデックスは共有せず、必要になった時点で構築する
+        snapshot._road_grid = SpatialGrid(PLACEMENT_GRID_CELL_SIZE)
+        snapshot._city_grid = SpatialGrid(PLACEMENT_GRID_CELL_SIZE)
+        snapshot._occupied_tiles = set()
+        snapshot._geometry_cities = None
+        snapshot._players = CharacterRoster(self._players, snapshot)
+        snapshot._enemies = CharacterRoster(self._enemies, snapshot)
+        snapshot.save_service = None
+        snapshot.autosave_enabled = False
+        snapshot._journal_pending = []
+        snapshot.event_listeners = []
+        snapshot.events = StateEventBus()
+        snapshot._dirty_characters = set()
+        snapshot._json_encoder = IncrementalJSONEncoder()
+        snapshot._shared = set(_SHARED_CONTAINERS)
+        snapshot._sources = (weakref.ref(self),) + self._sources
+        snapshot._snapshots = weakref.WeakSet()
+        snapshot._clones = dict(self._clones)
+        for source_ref in snapshot._sources:
+            source = source_ref()
+            if source is not None:
+                source._snapshots.add(snapshot)
+        return snapshot
+
+    def writable(self, character: Character) -> Character:
+        """キャラクターを変更する前に呼び、変更してよいオブジェクトを返す
+
+        他の状態から共有しているキャラクターはこの状態の名簿上で複製して複製を返す
+        （既に複製済みなら複製を返す）。この状態のキャラクターを共有している
+        スナップショットには先に複製させる
+        """
+        owner = character._owner
+        if owner is self:
+            self._dirty_characters.add(character)
+            if self._snapshots:
+                for snapshot in list(self._snapshots):
+                    if character in snapshot._roster_seq:
+                        snapshot._copy_on_write(character)
+            return character
+        if owner is None:
+            return character
+        clone = self._clones.get(character)
+        if clone is not None:
+            return self.writable(clone)
+        if character in self._roster_seq:
+            return self._copy_on_write(character)
+        return character
+
+    def snapshot_sources(self) -> List["GameState"]:
+        """スナップショットの共有元の状態（親から順、解放済みのものは除く）"""
+        sources = (source_ref() for source_ref in self._sources)
+        return [source for source in sources if source is not None]
+
+    def _shares_with(self, state: "GameState") -> bool:
+        """stateがこのスナップショットの共有元か"""
+        return any(source_ref() is state for source_ref in self._sources)
+
+    def _copy_on_write(self, character: Character) -> Character:
+        """共有中のキャラクターを複製し、名簿と占有インデックス上で置き換える"""
+        self._prepare_write("occupancy")
+        clone = character.copy()
+        clone._owner = self
+        self._clones[character] = clone
+        is_player = isinstance(character, Player)
+        roster = self._players if is_player else self._enemies
+        list.__setitem__(roster, roster.index(character), clone)
+        self._roster_seq[clone] = self._roster_seq.pop(character)
+        self._characters_by_id[clone.id] = clone
+        city_id = character.current_city_id
+        if city_id is not None:
+            bucket = self._occupancy[city_id][0 if is_player else 1]
+            bucket[bucket.index(character)] = clone
+        return clone
+
+    def _prepare_write(self, name: str):
+        """共有コンテナを変更する前に呼ぶ（共有している相手とは別のコピーにする）"""
+        if name in self._shared:
+            self._copy_shared(name)
+        if self._snapshots:
+            attribute = _SHARED_CONTAINERS[name]
+            container = getattr(self, attribute)
+            for snapshot in list(self._snapshots):
+                if getattr(snapshot, attribute) is container:
+                    snapshot._copy_shared(name)
+
+    def _copy_shared(self, name: str):
+        """共有中のコンテナをこの状態専用にコピー"""
+        self._shared.discard(name)
+        if name == "cities":
+            geometry_indexed = self._is_geometry_index_current()
+            self.cities = dict(self.cities)
+            if geometry_indexed:
+                self._geometry_cities = self.cities
+        elif name == "roads":
+            self._roads = list(self._roads)
+            self._adjacency = {
+                city_id: list(neighbors)
+                for city_id, neighbors in self._adjacency.items()
+            }
+            self._road_keys = set(self._road_keys)
+        else:
+            self._occupancy = {
+                city_id: (list(players), list(enemies))
+                for city_id, (players, enemies) in self._occupancy.items()
+            }
+            self._roster_seq = dict(self._roster_seq)
+            self._characters_by_id = dict(self._characters_by_id)
 
     def switch_turn(self):
         """ターンを切り替える"""
@@ -528,6 +1057,101 @@ class GameState:
 
             # 都市発見は別の状態で処理するためここでは実行しない
 
+        self._publish_turn()
+        self._record_event(
+            {
+                "e": "turn",
+                "turn": self.current_turn,
+                "n": self.turn_counter,
+                "pm": self.player_moved_this_turn,
+                "em": self.enemy_moved_this_turn,
+            }
+        )
+
+    def order_move(self, character: Character, city: City):
+        """キャラクターに隣接都市への移動を指示"""
+        character = self.writable(character)
+        self._apply_move_order(character, city.id)
+        event = {"e": "move", "c": self._character_ref(character), "to": city.id}
+        if isinstance(character, Enemy):
+            event["pi"] = character.patrol_index
+        self._record_event(event)
+
+    def _apply_move_order(self, character: Character, city_id: int):
+        city = self.cities[city_id]
+        character.target_x = city.x
+        character.target_y = city.y
+        character.target_city_id = city_id
+        character.is_moving = True
+        if isinstance(character, Player):
+            self.player_moved_this_turn = True
+        else:
+            self.enemy_moved_this_turn = True
+            # パトロールAIの場合はインデックスを更新
+            if character.ai_type == "patrol" and city_id in character.patrol_city_ids:
+                character.patrol_index = character.patrol_city_ids.index(city_id)
+        self.events.publish(
+            CHARACTER_MOVED,
+            character=character,
+            from_city_id=character.current_city_id,
+            to_city_id=city_id,
+        )
+
+    def complete_move(self, character: Character):
+        """移動中のキャラクターを目標都市に到着させる"""
+        character = self.writable(character)
+        self._apply_arrival(character)
+        self._record_event(
+            {
+                "e": "arrive",
+                "c": self._character_ref(character),
+                "f": character.facing_right,
+            }
+        )
+
+    def _apply_arrival(self, character: Character):
+        from_city_id = character.current_city_id
+        character.x = character.target_x
+        character.y = character.target_y
+        character.current_city_id = character.target_city_id
+        character.is_moving = False
+        character.target_x = None
+        character.target_y = None
+        character.target_city_id = None
+        self.events.publish(
+            CHARACTER_MOVED,
+            character=character,
+            from_city_id=from_city_id,
+            to_city_id=character.current_city_id,
+        )
+
+    def _publish_turn(self):
+        self.events.publish(
+            TURN_SWITCHED, turn=self.current_turn, turn_counter=self.turn_counter
+        )
+
+    def advance_movement(self, characters: List[Character]) -> List[Character]:
+        """移動中のキャラクターを1フレーム分まとめて進め、到着したキャラクターを返す
+
+        到着したキャラクターはcomplete_moveで目標都市に到着させる
+        """
+        by_store: Dict[int, Tuple[CharacterStore, Dict[int, Character]]] = {}
+        for character in characters:
+            if character.is_moving:
+                character = self.writable(character)  # 変更セットにも登録される
+                store = character._store
+                by_store.setdefault(id(store), (store, {}))[1][
+                    character._slot
+                ] = character
+
+        arrived = []
+        for store, slots in by_store.values():
+            for slot in store.advance(slots):
+                arrived.append(slots[slot])
+        for character in arrived:
+            self.complete_move(character)
+        return arrived
+
     def can_move_this_turn(self) -> bool:
         """このターンで移動可能かチェック"""
         if self.current_turn == "player":
@@ -539,10 +1163,48 @@ class GameState:
         """都市発見のタイミングかどうかをチェック"""
         return self.turn_counter % CITY_DISCOVERY_INTERVAL == 0
 
+    def _is_geometry_index_current(self) -> bool:
+        """空間インデックスが現在の都市・道路と一致しているか"""
+        return (
+            self._geometry_cities is self.cities
+            and self._geometry_city_count == len(self.cities)
+            and self._geometry_road_count == len(self._roads)
+        )
+
+    def _ensure_geometry_index(self):
+        """都市配置検証用の空間インデックスを必要に応じて構築"""
+        if self._is_geometry_index_current():
+            return
+        self._city_grid.clear()
+        self._road_grid.clear()
+        self._occupied_tiles = set()
+        self._geometry_cities = self.cities
+        self._geometry_city_count = 0
+        self._geometry_road_count = 0
+        for city in self.cities.values():
+            self._index_city_geometry(city)
+        for road in self._roads:
+            self._index_road_geometry(road)
+
+    def _index_city_geometry(self, city: City):
+        """都市を空間インデックスと占有タイル集合に登録"""
+        self._city_grid.insert_point(city.id, city.x, city.y)
+        self._occupied_tiles.add(self._coord_transformer.pixel_to_tile(city.x, city.y))
+        self._geometry_city_count += 1
+
+    def _index_road_geometry(self, road: Road):
+        """道路を線分の境界矩形で空間インデックスに登録"""
+        city1 = self.cities[road.city1_id]
+        city2 = self.cities[road.city2_id]
+        self._road_grid.insert_segment(road, city1.x, city1.y, city2.x, city2.y)
+        self._geometry_road_count += 1
+
     def is_valid_city_placement_for_midpoint(
         self, new_city_x, new_city_y, city1_id, city2_id
     ):
         """中点配置用の都市配置有効性チェック（元の道路は除外）"""
+        self._ensure_geometry_index()
+
         # 新しい都市から2つの既存都市への道路の座標
         city1 = self.cities[city1_id]
         city2 = self.cities[city2_id]
@@ -551,39 +1213,42 @@ class GameState:
         new_road1_end = (city1.x, city1.y)
         new_road2_start = (new_city_x, new_city_y)
         new_road2_end = (city2.x, city2.y)
-
-        # 既存の道路との交差をチェック（元の道路は除外）
-        for road in self.roads:
-            # 元の道路（city1_id - city2_id）は交差チェックから除外
-            if (road.city1_id == city1_id and road.city2_id == city2_id) or (
-                road.city1_id == city2_id and road.city2_id == city1_id
-            ):
-                continue
-
-            road_city1 = self.cities[road.city1_id]
-            road_city2 = self.cities[road.city2_id]
-            existing_road_start = (road_city1.x, road_city1.y)
-            existing_road_end = (road_city2.x, road_city2.y)
-
-            # 新しい道路1が既存の道路と交差するかチェック
-            if roads_intersect(
-                new_road1_start, new_road1_end, existing_road_start, existing_road_end
-            ):
-                return False
-
-            # 新しい道路2が既存の道路と交差するかチェック
-            if roads_intersect(
-                new_road2_start, new_road2_end, existing_road_start, existing_road_end
-            ):
-                return False
+        original_key = _road_key(city1_id, city2_id)
+
+        # 既存の道路との交差をチェック（新しい道路の範囲付近の道路のみ）
+        for new_road_start, new_road_end in (
+            (new_road1_start, new_road1_end),
+            (new_road2_start, new_road2_end),
+        ):
+            nearby_roads = self._road_grid.query(
+                min(new_road_start[0], new_road_end[0]),
+                min(new_road_start[1], new_road_end[1]),
+                max(new_road_start[0], new_road_end[0]),
+                max(new_road_start[1], new_road_end[1]),
+            )
+            for road in nearby_roads:
+                # 元の道路（city1_id - city2_id）は交差チェックから除外
+                if _road_key(road.city1_id, road.city2_id) == original_key:
+                    continue
+
+                road_city1 = self.cities[road.city1_id]
+                road_city2 = self.cities[road.city2_id]
+                existing_road_start = (road_city1.x, road_city1.y)
+                existing_road_end = (road_city2.x, road_city2.y)
+
+                # 新しい道路が既存の道路と交差するかチェック
+                if roads_intersect(
+                    new_road_start, new_road_end, existing_road_start, existing_road_end
+                ):
+                    return False
 
         # 新しい都市が既存の道路に近すぎないかチェック（元の道路は除外）
         min_distance_to_road = 20  # 最小距離（ピクセル）
-        for road in self.roads:
+        for road in self._road_grid.query_radius(
+            new_city_x, new_city_y, min_distance_to_road
+        ):
             # 元の道路（city1_id - city2_id）は距離チェックから除外
-            if (road.city1_id == city1_id and road.city2_id == city2_id) or (
-                road.city1_id == city2_id and road.city2_id == city1_id
-            ):
+            if _road_key(road.city1_id, road.city2_id) == original_key:
                 continue
 
             road_city1 = self.cities[road.city1_id]
@@ -603,8 +1268,11 @@ class GameState:
 
         # 新しい都市が既存の都市に近すぎないかチェック（接続先を除く）
         min_distance_to_city = 25  # 最小距離（ピクセル、少し短めに設定）
-        for city in self.cities.values():
-            if city.id not in [city1_id, city2_id]:  # 接続先の都市は除外
+        for city_id in self._city_grid.query_radius(
+            new_city_x, new_city_y, min_distance_to_city
+        ):
+            if city_id not in [city1_id, city2_id]:  # 接続先の都市は除外
+                city = self.cities[city_id]
                 distance_sq = (new_city_x - city.x) ** 2 + (new_city_y - city.y) ** 2
                 if distance_sq < min_distance_to_city**2:
                     return False
@@ -616,7 +1284,8 @@ class GameState:
         if not self.roads:
             return None  # 既存道路がない場合は何もしない
 
-        coord_transformer = create_default_coordinate_transformer()
+        coord_transformer = self._coord_transformer
+        self._ensure_geometry_index()
 
         # 候補となる道路とその中点位置を生成
         candidate_positions = []
@@ -639,17 +1308,9 @@ class GameState:
                     candidate_tile_y = mid_tile_y + dy
 
                     # 既存都市の位置でないことを確認
-                    occupied = False
-                    for city in self.cities.values():
-                        existing_tile_x, existing_tile_y = (
-                            coord_transformer.pixel_to_tile(city.x, city.y)
-                        )
-                        if (
-                            existing_tile_x == candidate_tile_x
-                            and existing_tile_y == candidate_tile_y
-                        ):
-                            occupied = True
-                            break
+                    occupied = (candidate_tile_x, candidate_tile_y) in (
+                        self._occupied_tiles
+                    )
 
                     if not occupied:
                         # ピクセル座標に変換
@@ -678,7 +1339,7 @@ class GameState:
 
         # ランダムに候補位置を選択
         chosen_tile_x, chosen_tile_y, chosen_x, chosen_y, city1_id, city2_id = (
-            random.choice(candidate_positions)
+            self.discovery_rng.choice(candidate_positions)
         )
 
         # 新しい都市IDを生成
@@ -706,7 +1367,7 @@ class GameState:
         available_names = [name for name in city_names if name not in used_names]
 
         if available_names:
-            new_city_name = random.choice(available_names)
+            new_city_name = self.discovery_rng.choice(available_names)
         else:
             new_city_name = f"City{new_city_id}"
 
@@ -737,18 +1398,17 @@ class GameState:
         new_enemy = discovery_plan["new_enemy"]
         chosen_tile_x, chosen_tile_y = discovery_plan["tile_position"]
 
-        # 新都市をGameStateに追加
-        self.cities[new_city.id] = new_city
-
-        # 選択された2つの既存都市と新都市を道路で接続
-        new_road1 = Road(city1_id, new_city.id)
-        new_road2 = Road(city2_id, new_city.id)
-        self.roads.append(new_road1)
-        self.roads.append(new_road2)
+        self._apply_discovery(new_city, city1_id, city2_id, new_enemy)
+        self._record_event(
+            {
+                "e": "discover",
+                "city": new_city.to_dict(),
+                "links": [city1_id, city2_id],
+                "enemy": new_enemy.to_dict() if new_enemy else None,
+            }
+        )
 
-        # 新都市に敵キャラクターを配置
         if new_enemy:
-            self.enemies.append(new_enemy)
             print(f"New enemy ({new_enemy.ai_type}) spawned in {new_city.name}")
 
         print(
@@ -764,6 +1424,28 @@ class GameState:
         self.auto_save()
         return True
 
+    def _apply_discovery(
+        self,
+        new_city: City,
+        city1_id: int,
+        city2_id: int,
+        new_enemy: Optional[Enemy],
+    ):
+        # 新都市をGameStateに追加
+        self._ensure_geometry_index()
+        self._prepare_write("cities")
+        self.cities[new_city.id] = new_city
+        self._index_city_geometry(new_city)
+
+        # 選択された2つの既存都市と新都市を道路で接続
+        self.add_road(Road(city1_id, new_city.id))
+        self.add_road(Road(city2_id, new_city.id))
+
+        # 新都市に敵キャラクターを配置
+        if new_enemy:
+            self.enemies.append(new_enemy)
+        self.events.publish(CITY_DISCOVERED, city=new_city, enemy=new_enemy)
+
     def discover_new_city(self):
         """新しい都市を発見して追加（後方互換性のため残存）"""
         # 計画を立てて即座に適用
@@ -784,13 +1466,14 @@ class GameState:
             ("random", 0.4),  # 40% - 最も一般的
             ("aggressive", 0.25),  # 25% - 積極的
             ("patrol", 0.20),  # 20% - パトロール
-            ("defensive", 0.15),  # 15% - 防御的
+            ("defensive", 0.10),  # 10% - 防御的
+            ("tactical", 0.05),  # 5% - 先読み（MCTS、思考コストが高いので少なめ）
         ]
 
         # 重み付きランダム選択
         weights = [weight for _, weight in ai_types_with_weights]
         ai_types = [ai_type for ai_type, _ in ai_types_with_weights]
-        selected_ai_type = random.choices(ai_types, weights=weights)[0]
+        selected_ai_type = self.discovery_rng.choices(ai_types, weights=weights)[0]
 
         # 敵のバリエーションのために異なる画像インデックスを使用
         # 既存の敵の数に基づいて画像を決定（1〜3段目をローテーション）
@@ -809,7 +1492,7 @@ class GameState:
 
         # 都市に基づいた敵の名前を選択
         enemy_name = get_character_name_for_city(
-            city_name, "enemies", used_names
+            city_name, "enemies", used_names, self.naming_rng
         )
 
         # 敵キャラクターを生成
@@ -839,13 +1522,54 @@ class GameState:
             "roads": [road.to_dict() for road in self.roads],
             "players": [player.to_dict() for player in self.players],
             "enemies": [enemy.to_dict() for enemy in self.enemies],
+            **self.scalar_state_dict(),
+        }
+
+    def scalar_state_dict(self) -> Dict[str, Any]:
+        """都市・道路・キャラクター以外の状態を辞書に変換（to_dictの後半部分）"""
+        return {
             "current_turn": self.current_turn,
             "turn_counter": self.turn_counter,
             "player_moved_this_turn": self.player_moved_this_turn,
             "enemy_moved_this_turn": self.enemy_moved_this_turn,
             "current_ai_enemy_index": self.current_ai_enemy_index,
+            "next_character_id": self._next_character_id,
+            "rng": self.get_rng_state(),
+        }
+
+    def pop_dirty_characters(self) -> Set[Character]:
+        """前回の呼び出し以降に変更されたキャラクターを取得して変更セットを空にする"""
+        dirty, self._dirty_characters = self._dirty_characters, set()
+        return dirty
+
+    def get_rng_state(self) -> Dict[str, Any]:
+        """乱数生成器のシードと各ストリームの状態を取得"""
+        return {
+            "seed": self.rng.initial_seed,
+            "streams": {
+                "main": self.rng.getstate(),
+                "discovery": self.discovery_rng.getstate(),
+                "ai": self.ai_rng.getstate(),
+                "naming": self.naming_rng.getstate(),
+            },
         }
 
+    def set_rng_state(self, data: Dict[str, Any]):
+        """乱数生成器をシードから作り直し、各ストリームの状態を復元"""
+        self.rng = GameRandom(data["seed"])
+        self.discovery_rng = self.rng.split("discovery")
+        self.ai_rng = self.rng.split("ai")
+        self.naming_rng = self.rng.split("naming")
+        streams = data.get("streams", {})
+        for name, rng in (
+            ("main", self.rng),
+            ("discovery", self.discovery_rng),
+            ("ai", self.ai_rng),
+            ("naming", self.naming_rng),
+        ):
+            if name in streams:
+                rng.setstate(streams[name])
+
     def from_dict(self, data: Dict[str, Any]):
         """辞書からゲーム状態を復元"""
         # 都市を復元
@@ -871,23 +1595,60 @@ class GameState:
         self.player_moved_this_turn = data["player_moved_this_turn"]
         self.enemy_moved_this_turn = data["enemy_moved_this_turn"]
         self.current_ai_enemy_index = data.get("current_ai_enemy_index")
+        self.restore_next_character_id(data.get("next_character_id", 1))
+
+        # 乱数生成器を復元（古いセーブファイルには含まれない）
+        if "rng" in data:
+            self.set_rng_state(data["rng"])
 
     def save_to_file(self):
-        """ゲーム状態をJSONファイルに保存"""
+        """ゲーム状態をフルスナップショットとして保存（ジャーナルは圧縮される）"""
         try:
-            with open(self.save_file_path, "w", encoding="utf-8") as f:
-                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+            encode = self._snapshot_encoder()
+            if self.save_service is not None:
+                self.save_service.submit_snapshot(self.save_file_path, encode)
+            else:
+                write_atomic(self.save_file_path, encode())
+            self._journal_pending = []
+            self._journal_bytes = 0
+            self._snapshot_turn = self.turn_counter
+            self._saved_rng_state = self.get_rng_state()
             print(f"Game state saved to {self.save_file_path}")
         except Exception as e:
             print(f"Failed to save game state: {e}")
 
+    def _snapshot_encoder(self) -> Callable[[], bytes]:
+        """現在の状態のスナップショットを取り、それをエンコードする関数を返す
+
+        返された関数はゲーム状態を参照しないため、別スレッドで呼び出せる
+        """
+        if self.save_format == "binary":
+            data = encode_game_state(self, self._journal_seq)
+            return lambda: data
+        # 変更のないエンティティはキャッシュ済みのJSON断片を再利用する
+        line = self._json_encoder.encode(self, {"journal_seq": self._journal_seq})
+
+        def encode() -> bytes:
+            return (line + "\n").encode("utf-8")
+
+        return encode
+
     def load_from_file(self) -> bool:
-        """JSONファイルからゲーム状態をロード"""
+        """セーブファイルからゲーム状態をロード（形式は自動判定、ジャーナルも再生）"""
         try:
+            if self.save_service is not None:
+                self.save_service.flush()  # 書き出し待ちのセーブを反映してから読む
             if os.path.exists(self.save_file_path):
-                with open(self.save_file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.from_dict(data)
+                with open(self.save_file_path, "rb") as f:
+                    raw = f.read()
+                # 大量のオブジェクトを一括生成する間はGCを止める
+                gc_was_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    self._load_snapshot(raw)
+                finally:
+                    if gc_was_enabled:
+                        gc.enable()
                 print(f"Game state loaded from {self.save_file_path}")
                 return True
             else:
@@ -897,29 +1658,175 @@ class GameState:
             print(f"Failed to load game state: {e}")
             return False
 
+    def _load_snapshot(self, raw: bytes):
+        """セーブデータ（スナップショット＋ジャーナル）から状態を復元"""
+        if is_binary_save(raw):
+            save = BinarySave(raw)
+            save.apply_to(self)
+            self.save_format = "binary"
+            journal_seq = save.meta.get("journal_seq", 0)
+            journal_lines = save.journal_text.splitlines()
+        else:
+            text = raw.decode("utf-8")
+            lines = text.splitlines()
+            try:
+                # 1行目がスナップショット、2行目以降がジャーナル
+                data = json.loads(lines[0])
+                journal_lines = lines[1:]
+            except ValueError:
+                # 旧形式（インデント付きJSON全体）のセーブファイル
+                data = json.loads(text)
+                journal_lines = []
+            self.from_dict(data)
+            self.save_format = "json"
+            journal_seq = data.get("journal_seq", 0)
+        self._journal_pending = []
+        self._journal_seq = journal_seq
+        self._snapshot_turn = self.turn_counter
+        self._journal_bytes = self._replay_journal(journal_lines)
+        self._saved_rng_state = self.get_rng_state()
+
+    def _replay_journal(self, journal_lines: List[str]) -> int:
+        """ジャーナルのイベントをスナップショットの上に再適用し、ジャーナルのサイズを返す"""
+        journal_bytes = 0
+        for line in journal_lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # 書き込み途中でクラッシュした最後の行は無視する
+                break
+            journal_bytes += len(line.encode("utf-8")) + 1
+            if event["seq"] <= self._journal_seq:
+                continue  # スナップショットに含まれているイベント
+            self.apply_event(event)
+            self._journal_seq = event["seq"]
+        return journal_bytes
+
+    @property
+    def next_character_id(self) -> int:
+        """次に採番するキャラクターID"""
+        return self._next_character_id
+
+    def restore_next_character_id(self, next_character_id: int):
+        """セーブデータから次に採番するキャラクターIDを復元（既存のIDとは重複させない）"""
+        self._next_character_id = max(self._next_character_id, next_character_id)
+
+    def _character_ref(self, character: Character) -> int:
+        """ジャーナル用のキャラクター参照（キャラクターID）"""
+        return character.id
+
+    def _resolve_character_ref(self, ref: Any) -> Character:
+        if isinstance(ref, list):
+            # 旧形式のジャーナル（陣営と名簿内の位置）
+            roster = self._players if ref[0] == "p" else self._enemies
+            return roster[ref[1]]
+        return self._characters_by_id[ref]
+
+    def _record_event(self, event: Dict[str, Any]):
+        """ジャーナルにイベントを記録（書き出しは auto_save で行う）"""
+        self._journal_seq += 1
+        event["seq"] = self._journal_seq
+        self._journal_pending.append(event)
+        for listener in self.event_listeners:
+            listener(event)
+
+    def apply_event(self, event: Dict[str, Any]):
+        """ジャーナルのイベントを1件適用（未知の種類のイベントは無視）"""
+        kind = event["e"]
+        if kind == "move":
+            character = self.writable(self._resolve_character_ref(event["c"]))
+            self._apply_move_order(character, event["to"])
+            if "pi" in event:
+                character.patrol_index = event["pi"]
+        elif kind == "arrive":
+            character = self.writable(self._resolve_character_ref(event["c"]))
+            character.facing_right = event["f"]
+            self._apply_arrival(character)
+        elif kind == "turn":
+            self.current_turn = event["turn"]
+            self.turn_counter = event["n"]
+            self.player_moved_this_turn = event["pm"]
+            self.enemy_moved_this_turn = event["em"]
+            if "rng" in event:  # リプレイのターン開始の記録
+                self.set_rng_state(event["rng"])
+            self._publish_turn()
+        elif kind == "battle":
+            characters = []
+            for ref, life in event["lives"]:
+                character = self.writable(self._resolve_character_ref(ref))
+                character.life = life
+                characters.append(character)
+            self.events.publish(
+                BATTLE_RESOLVED, city_id=event["city"], characters=characters
+            )
+        elif kind == "defeat":
+            self._remove_defeated_from(self._players)
+            self._remove_defeated_from(self._enemies)
+        elif kind == "rng":
+            self.set_rng_state(event["state"])
+        elif kind == "discover":
+            new_enemy = Enemy.from_dict(event["enemy"]) if event["enemy"] else None
+            city1_id, city2_id = event["links"]
+            self._apply_discovery(
+                City.from_dict(event["city"]), city1_id, city2_id, new_enemy
+            )
+
+    def _needs_snapshot(self) -> bool:
+        """ジャーナル追記ではなくフルスナップショットを書くべきか"""
+        return (
+            self._snapshot_turn is None
+            or (self.save_service is None and not os.path.exists(self.save_file_path))
+            or self.turn_counter - self._snapshot_turn >= SNAPSHOT_INTERVAL_TURNS
+            or self._journal_bytes >= JOURNAL_SIZE_LIMIT
+        )
+
+    def _append_journal(self):
+        """未書き出しのイベントをセーブファイルに追記"""
+        if not self._journal_pending:
+            return
+        try:
+            data = "".join(
+                json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+                for event in self._journal_pending
+            ).encode("utf-8")
+            if self.save_service is not None:
+                self.save_service.submit_append(self.save_file_path, data)
+            else:
+                with open(self.save_file_path, "ab") as f:
+                    f.write(data)
+            self._journal_bytes += len(data)
+            self._journal_pending = []
+        except Exception as e:
+            print(f"Failed to append game journal: {e}")
+
+    def record_battle(self, city_id: int, players: List[Player], enemies: List[Enemy]):
+        """戦闘結果（参加キャラクターの残りlife）をジャーナルに記録"""
+        characters = [c for c in list(players) + list(enemies) if c in self._roster_seq]
+        self.events.publish(BATTLE_RESOLVED, city_id=city_id, characters=characters)
+        self._record_event(
+            {
+                "e": "battle",
+                "city": city_id,
+                "lives": [[self._character_ref(c), c.life] for c in characters],
+            }
+        )
+
     def check_battles(self):
         """各都市で戦闘をチェックし、戦闘が発生する都市の情報を返す（実際の戦闘は実行しない）"""
         battle_locations = []
 
-        for city_id, city in self.cities.items():
+        # キャラクターがいる都市だけを調べる
+        for city_id in self.get_occupied_city_ids():
             # この都市にいるプレイヤーと敵を取得
-            players_in_city = [
-                p
-                for p in self.players
-                if p.current_city_id == city_id and not p.is_moving
-            ]
-            enemies_in_city = [
-                e
-                for e in self.enemies
-                if e.current_city_id == city_id and not e.is_moving
-            ]
+            players_in_city, enemies_in_city = self.get_characters_in_city(city_id)
 
             # プレイヤーと敵の両方がいる場合は戦闘
             if players_in_city and enemies_in_city:
                 battle_info = {
                     "city_id": city_id,
-                    "players": players_in_city.copy(),  # コピーして元のリストを保護
-                    "enemies": enemies_in_city.copy(),
+                    # 戦闘で変更するため、共有中のキャラクターは複製してから渡す
+                    "players": [self.writable(p) for p in players_in_city],
+                    "enemies": [self.writable(e) for e in enemies_in_city],
                     "players_before": len(players_in_city),
                     "enemies_before": len(enemies_in_city),
                 }
@@ -930,30 +1837,51 @@ class GameState:
     def remove_defeated_characters(self):
         """lifeが0以下のキャラクターを削除"""
         # プレイヤーから削除
-        original_player_count = len(self.players)
-        self.players = [p for p in self.players if p.life > 0]
-        players_defeated = original_player_count - len(self.players)
+        players_defeated = self._remove_defeated_from(self._players)
 
         # 敵から削除
-        original_enemy_count = len(self.enemies)
-        self.enemies = [e for e in self.enemies if e.life > 0]
-        enemies_defeated = original_enemy_count - len(self.enemies)
+        enemies_defeated = self._remove_defeated_from(self._enemies)
+
+        if players_defeated or enemies_defeated:
+            self._record_event({"e": "defeat"})
 
         if players_defeated > 0:
             print(f"{players_defeated} player(s) were defeated!")
         if enemies_defeated > 0:
             print(f"{enemies_defeated} enemy(ies) were defeated!")
 
+    def _remove_defeated_from(self, roster: CharacterRoster) -> int:
+        """名簿からlifeが0以下のキャラクターを削除し、削除数を返す
+
+        lifeは戦闘で直接書き換えられるため倒れたキャラクターの検出には走査が
+        必要だが、削除は倒れたキャラクターの位置だけで行う
+        """
+        defeated_indices = [i for i, c in enumerate(roster) if c.life <= 0]
+        # 後ろから削除して前のインデックスをずらさない
+        for index in reversed(defeated_indices):
+            self._unregister_character(roster[index])
+            # 生存者の名簿順は変わらないためインデックスの再構築は不要
+            list.__delitem__(roster, index)
+        return len(defeated_indices)
+
     def get_characters_in_city(self, city_id: int) -> tuple[List[Player], List[Enemy]]:
         """指定した都市にいるキャラクターを取得"""
-        players_in_city = [
-            p for p in self.players if p.current_city_id == city_id and not p.is_moving
-        ]
-        enemies_in_city = [
-            e for e in self.enemies if e.current_city_id == city_id and not e.is_moving
-        ]
+        players, enemies = self._occupancy.get(city_id, ((), ()))
+        players_in_city = [p for p in players if not p.is_moving]
+        enemies_in_city = [e for e in enemies if not e.is_moving]
         return players_in_city, enemies_in_city
 
     def auto_save(self):
-        """自動セーブを実行"""
-        self.save_to_file()
+        """自動セーブを実行（通常はジャーナル追記、定期的にスナップショット）"""
+        if not self.autosave_enabled:
+            self._journal_pending = []
+            return
+        if self._needs_snapshot():
+            self.save_to_file()
+        else:
+            # 前回のセーブ以降に乱数を消費していれば、その状態も記録する
+            rng_state = self.get_rng_state()
+            if rng_state != self._saved_rng_state:
+                self._record_event({"e": "rng", "state": rng_state})
+                self._saved_rng_state = rng_state
+            self._append_journal()
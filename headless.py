@@ -0,0 +1,167 @@
+"""
+pyxelを使わずにゲームのルールだけでターンを進めるヘッドレスエンジン
+"""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import enemy_ai
+from battle_rules import resolve_battle
+from game_state import City, Character, GameState, Player
+from pathfinding import get_routing_table
+
+DEFAULT_MAX_TURNS = 200  # 決着がつかない場合に打ち切るターン数
+
+PlayerPolicy = Callable[[GameState], Optional[Tuple[Player, City]]]
+
+
+def decide_player_move(game_state: GameState) -> Optional[Tuple[Player, City]]:
+    """プレイヤー側の簡易AI: ランダムに選んだプレイヤーを最も近い敵へ向かわせる"""
+    players = [
+        player
+        for player in game_state.players
+        if game_state.get_city_by_id(player.current_city_id)
+    ]
+    if not players:
+        return None
+
+    player = game_state.ai_rng.choice(players)
+    current_city = game_state.get_city_by_id(player.current_city_id)
+    connected_cities = enemy_ai.get_connected_cities(game_state, current_city)
+    if not connected_cities:
+        return None
+
+    nearest_city = None
+    min_distance = float("inf")
+    for enemy in game_state.enemies:
+        enemy_city = game_state.get_city_by_id(enemy.current_city_id)
+        if enemy_city:
+            dx = enemy_city.x - current_city.x
+            dy = enemy_city.y - current_city.y
+            distance = (dx * dx + dy * dy) ** 0.5
+            if distance < min_distance:
+                min_distance = distance
+                nearest_city = enemy_city
+
+    if nearest_city:
+        next_city_id = get_routing_table(game_state).next_hop(
+            current_city.id, nearest_city.id
+        )
+        if next_city_id is not None:
+            return player, game_state.get_city_by_id(next_city_id)
+    return player, game_state.ai_rng.choice(connected_cities)
+
+
+class HeadlessGame:
+    """ヘッドレスのターンエンジン
+
+    map_states.pyの状態遷移（PlayerTurnState → TransitionState →
+    BattleSequenceState → CityDiscoveryState → EnemySelectionState ...）と
+    同じ順序でルールを適用するが、演出やアニメーションは行わない
+    """
+
+    def __init__(
+        self,
+        game_state: Optional[GameState] = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        player_policy: PlayerPolicy = decide_player_move,
+        seed: Optional[int] = None,
+    ):
+        if game_state is None:
+            game_state = GameState(seed)
+            game_state.initialize_default_state()
+        game_state.autosave_enabled = False
+        self.game_state = game_state
+        self.max_turns = max_turns
+        self.player_policy = player_policy
+        self.battles_fought = 0
+
+    @property
+    def winner(self) -> Optional[str]:
+        """勝者（"player" / "enemy"）、決着していなければNone"""
+        if not self.game_state.players:
+            return "enemy"
+        if not self.game_state.enemies:
+            return "player"
+        return None
+
+    def is_finished(self) -> bool:
+        return self.winner is not None or self.game_state.turn_counter > self.max_turns
+
+    def move_character(self, character: Character, city: City):
+        """移動を指示して即座に到着させる（アニメーションなし）"""
+        character = self.game_state.writable(character)
+        self.game_state.order_move(character, city)
+        dx = city.x - character.x
+        if abs(dx) > 1:
+            character.facing_right = dx > 0
+        self.game_state.complete_move(character)
+
+    def play_player_turn(self):
+        """プレイヤーターン: 1体のプレイヤーを移動"""
+        self.game_state.player_moved_this_turn = False
+        move = self.player_policy(self.game_state)
+        if move:
+            player, city = move
+            self.move_character(player, city)
+
+    def play_enemy_turn(self):
+        """敵ターン: 1体の敵を選んでAIに従って移動（"all"モードでは全員が移動）"""
+        self.game_state.enemy_moved_this_turn = False
+        if self.game_state.enemy_turn_mode == "all":
+            for enemy, target_city in enemy_ai.plan_enemy_turn(self.game_state):
+                self.move_character(enemy, target_city)
+            return
+        enemy = enemy_ai.select_enemy_to_move(self.game_state)
+        if not enemy:
+            return
+        target_city = enemy_ai.decide_enemy_action(self.game_state, enemy)
+        if target_city and self.game_state.are_cities_connected(
+            enemy.current_city_id, target_city.id
+        ):
+            self.move_character(enemy, target_city)
+
+    def end_turn(self):
+        """ターン終了処理: 戦闘、ターン切り替え、戦闘解決、都市発見"""
+        game_state = self.game_state
+        battle_locations = game_state.check_battles()
+        game_state.switch_turn()
+        game_state.auto_save()
+
+        if self.winner:
+            return
+
+        if battle_locations:
+            for battle in battle_locations:
+                resolve_battle(battle["players"], battle["enemies"])
+                game_state.record_battle(
+                    battle["city_id"], battle["players"], battle["enemies"]
+                )
+            self.battles_fought += len(battle_locations)
+            game_state.remove_defeated_characters()
+            game_state.auto_save()
+
+        if game_state.current_turn == "player" and game_state.should_discover_city():
+            discovery_plan = game_state.plan_new_city()
+            if discovery_plan:
+                game_state.apply_city_discovery(discovery_plan)
+
+    def step(self):
+        """現在の手番を1回進める"""
+        if self.game_state.current_turn == "player":
+            self.play_player_turn()
+        else:
+            self.play_enemy_turn()
+        self.end_turn()
+
+    def play(self) -> Dict[str, Any]:
+        """決着がつくか打ち切りターンに達するまで進め、結果を返す"""
+        while not self.is_finished():
+            self.step()
+        return {
+            "winner": self.winner,
+            "turns": self.game_state.turn_counter,
+            "cities": len(self.game_state.cities),
+            "battles": self.battles_fought,
+            "players_left": len(self.game_state.players),
+            "enemies_left": len(self.game_state.enemies),
+        }
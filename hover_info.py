@@ -1,6 +1,7 @@
 import pyxel
 
 from game import screen_height, screen_width
+from state_events import BATTLE_RESOLVED, CHARACTER_DIED, CHARACTER_MOVED
 
 
 class HoverInfo:
@@ -10,7 +11,9 @@ class HoverInfo:
     統一的に情報を表示する
     """
 
-    def __init__(self):
+    def __init__(self, label_atlas=None):
+        # 文字列をbltで描くアトラス（Noneならpyxel.textで描く）
+        self.label_atlas = label_atlas
         self.padding = 4  # 枠の内側の余白
         self.line_height = 8  # 行の高さ
         self.min_width = 60  # 最小幅
@@ -18,6 +21,34 @@ class HoverInfo:
         self.bg_color = 0  # 背景色（黒）
         self.text_color = 7  # テキスト色（白）
 
+        # 情報の行のキャッシュ（subscribe したGameStateのイベントで無効化）
+        self.game_state = None
+        self.invalidation_counter = None
+        self._character_lines = {}  # キャラクターID → 情報の行
+        self._city_lines = {}  # 都市ID → 情報の行（都市は変更されない）
+
+    def subscribe(self, game_state, invalidation_counter=None):
+        """GameStateの状態変更イベントを購読して情報の行をキャッシュする"""
+        self.game_state = game_state
+        self.invalidation_counter = invalidation_counter
+        self._character_lines = {}
+        self._city_lines = {}
+        game_state.events.subscribe(CHARACTER_MOVED, self._on_character_changed)
+        game_state.events.subscribe(CHARACTER_DIED, self._on_character_changed)
+        game_state.events.subscribe(BATTLE_RESOLVED, self._on_battle_resolved)
+
+    def _on_character_changed(self, event):
+        self._invalidate_character(event.character)
+
+    def _on_battle_resolved(self, event):
+        for character in event.characters:
+            self._invalidate_character(character)
+
+    def _invalidate_character(self, character):
+        if self._character_lines.pop(character.id, None) is not None:
+            if self.invalidation_counter is not None:
+                self.invalidation_counter.count()
+
     def get_text_width(self, text):
         """テキストの幅を計算"""
         return len(text) * 4  # pyxelのフォント幅は4ピクセル
@@ -85,11 +116,18 @@ class HoverInfo:
         text_y = info_y + self.padding
 
         for line in info_lines:
-            pyxel.text(text_x, text_y, line, self.text_color)
+            if self.label_atlas is not None:
+                self.label_atlas.draw_text(text_x, text_y, line, self.text_color)
+            else:
+                pyxel.text(text_x, text_y, line, self.text_color)
             text_y += self.line_height
 
     def get_character_info(self, character, game_state=None):
         """キャラクターの情報を取得（都市表示名を考慮）"""
+        cacheable = game_state is not None and game_state is self.game_state
+        if cacheable and character.id in self._character_lines:
+            return self._character_lines[character.id]
+
         info_lines = character.get_hover_info()
 
         # 都市名を表示名に置き換える
@@ -101,11 +139,18 @@ class HoverInfo:
                     info_lines[i] = f"Location: {display_name}"
                     break
 
+        if cacheable:
+            self._character_lines[character.id] = info_lines
         return info_lines
 
     def get_city_info(self, city):
         """都市の情報を取得（Cityクラスのget_hover_info()メソッドを使用）"""
-        return city.get_hover_info()
+        if self.game_state is None:
+            return city.get_hover_info()
+        info_lines = self._city_lines.get(city.id)
+        if info_lines is None:
+            info_lines = self._city_lines[city.id] = city.get_hover_info()
+        return info_lines
 
     def draw_hover_info(
         self, mouse_x, mouse_y, hovered_character, hovered_city, game_state=None
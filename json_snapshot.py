@@ -0,0 +1,114 @@
+"""
+JSON形式のセーブ（スナップショット行）の差分エンコーダ
+
+都市・道路・キャラクターごとにエンコード済みのJSON断片をキャッシュし、
+前回から変更されたものだけをエンコードし直して1行のJSONを組み立てる。
+出力は dumps(game_state.to_dict()) と同じ文字列になる
+"""
+
+import itertools
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from game_state import Character, City, GameState, Road
+
+
+def dumps(value: Any) -> str:
+    """セーブファイルと同じ設定（ASCIIエスケープなし、空白なし）でエンコード"""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class IncrementalJSONEncoder:
+    """GameStateのスナップショット行を差分だけエンコードして組み立てる
+
+    都市と道路は追加のみ（既存の要素は変更・削除されない）として、
+    辞書・リストが同じオブジェクトである間は増えた分だけをエンコードする。
+    キャラクターはGameStateの変更セット（pop_dirty_characters）を使い、
+    変更されたものと新しく名簿に入ったものだけをエンコードする
+    （変更セットを取り出すので、1つのGameStateに対して使うエンコーダは1つにすること）
+    """
+
+    def __init__(self):
+        self._cities: Optional[Dict[int, "City"]] = None
+        self._city_fragments: List[str] = []
+        self._cities_json = "{}"
+        self._roads: Optional[List["Road"]] = None
+        self._road_fragments: List[str] = []
+        self._roads_json = "[]"
+        # キャラクターID → (キャラクター, エンコード済みの断片)
+        self._characters: Dict[int, Tuple["Character", str]] = {}
+        self.encoded_entities = 0  # 直近の encode でエンコードしたエンティティ数
+
+    def encode(
+        self, game_state: "GameState", extra: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """ゲーム状態（とextraの項目）を1行のJSONにエンコード"""
+        self.encoded_entities = 0
+        for character in game_state.pop_dirty_characters():
+            self._characters.pop(character.id, None)
+
+        cities_json = self._encode_cities(game_state.cities)
+        roads_json = self._encode_roads(game_state.roads)
+        players_json = self._encode_characters(game_state.players)
+        enemies_json = self._encode_characters(game_state.enemies)
+        self._prune_characters(game_state)
+
+        scalars = game_state.scalar_state_dict()
+        if extra:
+            scalars.update(extra)
+        return (
+            f'{{"cities":{cities_json},"roads":{roads_json},'
+            f'"players":{players_json},"enemies":{enemies_json},'
+            f"{dumps(scalars)[1:]}"
+        )
+
+    def _encode_cities(self, cities: Dict[int, "City"]) -> str:
+        if cities is not self._cities or len(cities) < len(self._city_fragments):
+            self._cities = cities
+            self._city_fragments = []
+            self._cities_json = "{}"
+        known = len(self._city_fragments)
+        if len(cities) > known:
+            for city_id, city in itertools.islice(cities.items(), known, None):
+                self._city_fragments.append(
+                    f"{dumps(str(city_id))}:{dumps(city.to_dict())}"
+                )
+            self.encoded_entities += len(cities) - known
+            self._cities_json = "{" + ",".join(self._city_fragments) + "}"
+        return self._cities_json
+
+    def _encode_roads(self, roads: List["Road"]) -> str:
+        if roads is not self._roads or len(roads) < len(self._road_fragments):
+            self._roads = roads
+            self._road_fragments = []
+            self._roads_json = "[]"
+        known = len(self._road_fragments)
+        if len(roads) > known:
+            for road in roads[known:]:
+                self._road_fragments.append(dumps(road.to_dict()))
+            self.encoded_entities += len(roads) - known
+            self._roads_json = "[" + ",".join(self._road_fragments) + "]"
+        return self._roads_json
+
+    def _encode_characters(self, characters: Iterable["Character"]) -> str:
+        return "[" + ",".join(map(self._character_fragment, characters)) + "]"
+
+    def _character_fragment(self, character: "Character") -> str:
+        cached = self._characters.get(character.id)
+        if cached is not None and cached[0] is character:
+            return cached[1]
+        fragment = dumps(character.to_dict())
+        self._characters[character.id] = (character, fragment)
+        self.encoded_entities += 1
+        return fragment
+
+    def _prune_characters(self, game_state: "GameState"):
+        """名簿から外れたキャラクターの断片が溜まったら捨てる"""
+        character_count = len(game_state.players) + len(game_state.enemies)
+        if len(self._characters) > 2 * character_count + 16:
+            self._characters = {
+                character_id: cached
+                for character_id, cached in self._characters.items()
+                if game_state.get_character(character_id) is cached[0]
+            }
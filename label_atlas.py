@@ -0,0 +1,65 @@
+"""
+文字列ラベルのアトラス（描画済みの文字列をイメージバンクに置いて1回のbltで描く）
+
+都市名・デバッグ表示・ホバー情報のように毎フレーム同じ文字列を描く箇所で使う。
+文字列と色の組ごとに1回だけイメージバンクの予約領域に描き、以降はbltで描画する。
+スロットの割り当てと追い出し（LRU）はlabel_slots.LabelSlotTableで行う
+"""
+
+from typing import Dict
+
+import pyxel
+
+from label_slots import SLOT_HEIGHT, LabelSlotTable
+
+LABEL_ATLAS_BANK = 2  # ラベル用に予約するイメージバンク（0はキャラクター画像）
+TRANSPARENT_COLOR = 0  # アトラスの透明色（この色の文字はアトラスを使わずに描く）
+# スロットの幅 → 行数（合計32行で256x256の領域を使う）
+SLOT_ROWS = {32: 8, 64: 12, 128: 8, 256: 4}
+
+
+class LabelAtlas:
+    """文字列ラベルをイメージバンクに描いておき、bltで描画するキャッシュ"""
+
+    def __init__(
+        self,
+        bank: int = LABEL_ATLAS_BANK,
+        slot_rows: Dict[int, int] = SLOT_ROWS,
+        origin_y: int = 0,
+    ):
+        self.bank = bank
+        self.image = pyxel.images[bank]
+        # スロットの割り当てとヒット率などの統計
+        self.slots = LabelSlotTable(
+            self.image.width,
+            slot_rows,
+            pyxel.FONT_WIDTH,
+            origin_y=origin_y,
+            transparent_color=TRANSPARENT_COLOR,
+        )
+        self.image.rect(
+            0, origin_y, self.image.width, self.slots.height, TRANSPARENT_COLOR
+        )
+
+    def draw_text(self, x: float, y: float, text: str, color: int):
+        """pyxel.text と同じ位置・色で文字列を描画
+
+        毎フレーム変わる文字列（座標など）に使うと他のラベルを追い出すだけなので、
+        そうした文字列は pyxel.text で描くこと
+        """
+        label = self.slots.get(text, color)
+        if label is None:
+            label = self.slots.add(text, color)
+            if label is None:
+                pyxel.text(x, y, text, color)
+                return
+            # 割り当てられたスロットに描き直す
+            u, v, _, slot_width = label
+            self.image.rect(u, v, slot_width, SLOT_HEIGHT, TRANSPARENT_COLOR)
+            self.image.text(u, v, text, color)
+        u, v, width, _ = label
+        pyxel.blt(x, y, self.bank, u, v, width, SLOT_HEIGHT, TRANSPARENT_COLOR)
+
+    def get_stats_text(self) -> str:
+        """デバッグ表示用の統計（ヒット率とスロットの使用率）"""
+        return self.slots.get_stats_text()
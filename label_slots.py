@@ -0,0 +1,106 @@
+"""
+ラベルアトラスのスロット管理（pyxelに依存しない部分）
+
+領域を幅の異なるスロットの行に分けておき、文字列と色の組ごとにスロットを
+割り当てる。空きがなければ同じ幅のスロットのうち最も長く使われていない
+ラベルを追い出す（LRU）。ヒット・ミスなどの統計もここで数える
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+SLOT_HEIGHT = 8  # 1行の高さ（フォントの高さ6ピクセル＋余白）
+
+Label = Tuple[int, int, int, int]  # (u, v, 文字列の幅, スロットの幅)
+
+
+class LabelSlotTable:
+    """文字列ラベルへのスロットの割り当てとLRUによる追い出し"""
+
+    def __init__(
+        self,
+        width: int,
+        slot_rows: Dict[int, int],
+        char_width: int,
+        origin_y: int = 0,
+        transparent_color: int = 0,
+    ):
+        self.char_width = char_width
+        self.transparent_color = transparent_color
+        self.slot_widths = sorted(w for w, rows in slot_rows.items() if rows > 0)
+        # スロットの幅 → 空きスロットの (u, v)
+        self._free_slots: Dict[int, List[Tuple[int, int]]] = {}
+        v = origin_y
+        for slot_width in self.slot_widths:
+            slots = []
+            for _ in range(slot_rows[slot_width]):
+                for u in range(0, width - slot_width + 1, slot_width):
+                    slots.append((u, v))
+                v += SLOT_HEIGHT
+            slots.reverse()  # 領域の先頭から使う
+            self._free_slots[slot_width] = slots
+        self.height = v - origin_y  # スロットが使う領域の高さ
+        self.slot_count = sum(len(slots) for slots in self._free_slots.values())
+
+        # (文字列, 色) → ラベル、古く使われたものが先頭
+        self._labels: "OrderedDict[Tuple[str, int], Label]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypasses = 0  # アトラスを使わずに描いた回数（長すぎる・透明色の文字列）
+
+    @property
+    def hit_rate(self) -> float:
+        """アトラスに描いてあったラベルの割合"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def occupancy(self) -> float:
+        """使用中のスロットの割合"""
+        return len(self._labels) / self.slot_count if self.slot_count else 0.0
+
+    def get(self, text: str, color: int) -> Optional[Label]:
+        """割り当て済みのラベル（なければNone）を取得し、最近使ったものにする"""
+        key = (text, color)
+        label = self._labels.get(key)
+        if label is not None:
+            self._labels.move_to_end(key)
+            self.hits += 1
+        return label
+
+    def add(self, text: str, color: int) -> Optional[Label]:
+        """ラベルにスロットを割り当てる（置けない文字列ならNone）
+
+        呼び出し側は返されたスロットを透明色で消してから文字列を描くこと
+        """
+        width = len(text) * self.char_width
+        if not text or color == self.transparent_color or width > self.slot_widths[-1]:
+            self.bypasses += 1
+            return None
+        slot_width = next(w for w in self.slot_widths if w >= width)
+        free_slots = self._free_slots[slot_width]
+        if not free_slots:
+            self._evict(slot_width)
+        u, v = free_slots.pop()
+
+        label = (u, v, width, slot_width)
+        self._labels[(text, color)] = label
+        self.misses += 1
+        return label
+
+    def _evict(self, slot_width: int):
+        """同じ幅のスロットで最も長く使われていないラベルを追い出す"""
+        for key, (u, v, _, label_slot_width) in self._labels.items():
+            if label_slot_width == slot_width:
+                del self._labels[key]
+                self._free_slots[slot_width].append((u, v))
+                self.evictions += 1
+                return
+
+    def get_stats_text(self) -> str:
+        """デバッグ表示用の統計（ヒット率とスロットの使用率）"""
+        return (
+            f"Labels: hit {self.hit_rate * 100:.1f}% "
+            f"atlas {len(self._labels)}/{self.slot_count} slots"
+        )
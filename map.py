@@ -1,7 +1,8 @@
-import random
-
 import pyxel
 
+import enemy_ai
+from ai_planner import AIPlanner
+from character_layout import CharacterLayoutCache
 from coordinate_utils import create_default_coordinate_transformer
 
 # game.pyから定数をインポート
@@ -9,8 +10,22 @@ from game import Scene, screen_height, screen_width
 from game_state import City, GameState
 from geometry_utils import line_intersects_line
 from hover_info import HoverInfo
+from label_atlas import LabelAtlas
+from map_culling import MapCullingIndex
+from map_layers import BakedBackground, RoadLayer
 from map_state_machine import StateContext
 from map_states import PlayerTurnState
+from replay import REPLAY_FILE_PATH, ReplayRecorder
+from save_service import get_default_save_service
+from state_events import (
+    BATTLE_RESOLVED,
+    CHARACTER_DIED,
+    CHARACTER_MOVED,
+    CITY_DISCOVERED,
+    ROAD_ADDED,
+    TURN_SWITCHED,
+    InvalidationCounter,
+)
 
 
 class MapScene(Scene):
@@ -20,8 +35,9 @@ class MapScene(Scene):
         self.debug_page = 0  # デバッグ情報のページ番号 (0=非表示, 1〜3=ページ)
         self.max_debug_page = 3  # デバッグページの最大数
 
-        # ゲーム状態を初期化
+        # ゲーム状態を初期化（セーブはバックグラウンドで書き出す）
         self.game_state = GameState()
+        self.game_state.save_service = get_default_save_service()
 
         # セーブファイルがあれば読み込み、なければデフォルト状態で初期化
         if not self.game_state.load_from_file():
@@ -29,6 +45,9 @@ class MapScene(Scene):
             self.game_state.save_to_file()  # 初回作成時はセーブ
 
         self.selected_enemy = None  # 選択中の敵（エネミーターン用）
+        self.selected_enemies = []  # まとめて移動する敵（"all"モードの敵ターン用）
+        # 敵AIの行動決定をプレイヤーターン終了時からワーカーで先行実行する
+        self.ai_planner = AIPlanner(self.game_state)
 
         # 戦闘処理用（後方互換性のため残す）
         self.pending_battle_results = []  # 処理待ちの戦闘結果
@@ -69,17 +88,49 @@ class MapScene(Scene):
 
         # 30x30のマップデータを生成（中央座標系対応）
         self.map_data = self.generate_centered_map()
+        # 背景はマップ全体を1枚の画像に焼き込んでおき、毎フレーム1回のbltで描く
+        self.background = BakedBackground(self.map_data, self.tile_size)
 
         # マップ全体のピクセルサイズ
         self.map_pixel_width = self.map_width * self.tile_size
         self.map_pixel_height = self.map_height * self.tile_size
-
-        # ホバー情報表示
-        self.hover_info = HoverInfo()
+        # 道路はワールド座標の画像に描いておき、道路の追加時だけ描き足す
+        self.road_layer = RoadLayer(self.map_pixel_width, self.map_pixel_height)
+
+        # 描画用キャッシュ（GameStateの状態変更イベントで変更された分だけ無効化する）
+        self.invalidation_counter = InvalidationCounter()  # フレームごとの無効化回数
+        self._road_segments = []  # 道路のワールド座標の線分
+        self._road_segments_source = None  # 線分を作った道路リスト
+        self._debug_turn_text = None  # デバッグページ1のターン表示
+        self._debug_city_lines = None  # デバッグページ2の都市一覧
+        self._debug_character_lines = None  # デバッグページ3のキャラクター一覧
+        # 描画対象を表示範囲と重なるセルだけに絞る空間インデックス（セルは画面サイズ）
+        self.culling = MapCullingIndex(max(screen_width, screen_height))
+        for city in self.game_state.cities.values():
+            self.culling.add_city(city)
+        # 停止中のキャラクターの都市内の配置（到着・離脱した都市だけ計算し直す）
+        self.character_layout = CharacterLayoutCache(self.culling)
+        self.character_layout.subscribe(self.game_state, self.invalidation_counter)
+        self.subscribe_state_events()
+
+        # 都市名・デバッグ表示・ホバー情報の文字列はイメージバンクに描いてbltで描く
+        self.label_atlas = LabelAtlas()
+
+        # ホバー情報表示（イベントを購読してキャラクター・都市ごとにキャッシュ）
+        self.hover_info = HoverInfo(self.label_atlas)
+        self.hover_info.subscribe(self.game_state, self.invalidation_counter)
 
         # 状態マシン初期化
         self.state_context = StateContext()
         self.state_context.game_state = self.game_state  # GameStateの参照を設定
+
+        # リプレイを記録（イベントと状態遷移をバックグラウンドで書き出す）
+        self.replay_recorder = ReplayRecorder(
+            self.game_state, REPLAY_FILE_PATH, self.game_state.save_service
+        )
+        self.state_context.transition_listeners.append(
+            lambda state_type: self.replay_recorder.record_state(state_type.value)
+        )
         self.state_context.change_state(PlayerTurnState(self))
 
         # シーン遷移用
@@ -112,6 +163,10 @@ class MapScene(Scene):
             map_data.append(map_row)
         return map_data
 
+    def rebake_background(self):
+        """map_data を変更した後に背景画像を焼き直す"""
+        self.background.bake(self.map_data)
+
     def tile_to_pixel(self, tile_x: int, tile_y: int) -> tuple[float, float]:
         """タイル座標をピクセル座標に変換（中央座標系対応）"""
         return self.coord_transformer.tile_to_pixel(tile_x, tile_y)
@@ -184,225 +239,131 @@ class MapScene(Scene):
 
     def get_connected_cities(self, city):
         """指定したCityに接続されているCityのリストを取得"""
-        if isinstance(city, City):
-            city_id = city.id
-        else:
-            city_id = city
-
-        connected_ids = self.game_state.get_connected_city_ids(city_id)
-        return [
-            self.game_state.get_city_by_id(city_id)
-            for city_id in connected_ids
-            if self.game_state.get_city_by_id(city_id)
-        ]
+        return enemy_ai.get_connected_cities(self.game_state, city)
 
     def get_distance_to_nearest_player(self, enemy_city):
         """指定したCityから最も近いプレイヤーまでの距離を計算"""
-        min_distance = float("inf")
-        nearest_player = None
-
-        for player in self.game_state.players:
-            if player.current_city_id:
-                player_city = self.game_state.get_city_by_id(player.current_city_id)
-                if player_city:
-                    dx = player_city.x - enemy_city.x
-                    dy = player_city.y - enemy_city.y
-                    distance = (dx * dx + dy * dy) ** 0.5
-                    if distance < min_distance:
-                        min_distance = distance
-                        nearest_player = player
-
-        return min_distance, nearest_player
+        return enemy_ai.get_distance_to_nearest_player(self.game_state, enemy_city)
 
     def find_path_to_target(self, start_city, target_city):
-        """簡単なパス検索（BFS）で目標Cityへの最短経路を見つける"""
-        if start_city == target_city:
-            return []
-
-        # 都市IDで処理
-        start_id = start_city.id if isinstance(start_city, City) else start_city
-        target_id = target_city.id if isinstance(target_city, City) else target_city
-
-        if start_id == target_id:
-            return []
-
-        # BFS for pathfinding
-        queue = [(start_id, [])]
-        visited = {start_id}
-
-        while queue:
-            current_city_id, path = queue.pop(0)
-
-            for connected_city_id in self.game_state.get_connected_city_ids(
-                current_city_id
-            ):
-                if connected_city_id == target_id:
-                    result_cities = []
-                    for city_id in path + [connected_city_id]:
-                        city = self.game_state.get_city_by_id(city_id)
-                        if city:
-                            result_cities.append(city)
-                    return result_cities
-
-                if connected_city_id not in visited:
-                    visited.add(connected_city_id)
-                    queue.append((connected_city_id, path + [connected_city_id]))
-
-        return []  # No path found
+        """A*で目標Cityへの最短経路（道路の長さの合計が最小）を見つける"""
+        return enemy_ai.find_path_to_target(self.game_state, start_city, target_city)
 
     def decide_enemy_action(self, enemy):
         """敵のAIに基づいて行動を決定"""
-        if not enemy.current_city_id:
-            return None
+        return enemy_ai.decide_enemy_action(self.game_state, enemy)
+
+    def subscribe_state_events(self):
+        """描画用キャッシュを無効化するため、GameStateの状態変更イベントを購読"""
+        events = self.game_state.events
+        events.subscribe(CHARACTER_MOVED, self._on_character_moved)
+        events.subscribe(CHARACTER_DIED, self._on_character_died)
+        events.subscribe(CITY_DISCOVERED, self._on_city_discovered)
+        events.subscribe(ROAD_ADDED, self._on_road_added)
+        events.subscribe(TURN_SWITCHED, self._on_turn_switched)
+        events.subscribe(BATTLE_RESOLVED, self._on_battle_resolved)
+
+    def _on_character_moved(self, event):
+        self._invalidate_debug_characters()
+
+    def _on_character_died(self, event):
+        self._invalidate_debug_characters()
+
+    def _on_city_discovered(self, event):
+        self.culling.add_city(event.city)
+        if self._debug_city_lines is not None:
+            self._debug_city_lines = None
+            self.invalidation_counter.count()
+
+    def _on_road_added(self, event):
+        roads = self.game_state.roads
+        if self._road_segments_source is None:
+            return
+        if len(self._road_segments) + 1 == len(roads):
+            # 追加された1本だけを線分リストに加える
+            # （共有中の道路リストはコピーされるため、追加後のリストを引き継ぐ）
+            self._append_road_segment(event.road)
+            self._road_segments_source = roads
+        else:
+            self._road_segments_source = None
+        self.invalidation_counter.count()
 
-        current_city = self.game_state.get_city_by_id(enemy.current_city_id)
-        if not current_city:
-            return None
+    def _on_turn_switched(self, event):
+        if self._debug_turn_text is not None:
+            self._debug_turn_text = None
+            self.invalidation_counter.count()
 
-        connected_cities = self.get_connected_cities(current_city)
-        if not connected_cities:
-            return None
+    def _on_battle_resolved(self, event):
+        self._invalidate_debug_characters()
 
-        if enemy.ai_type == "random":
-            # ランダムに接続されたCityから選択
-            return random.choice(connected_cities)
+    def _invalidate_debug_characters(self):
+        if self._debug_character_lines is not None:
+            self._debug_character_lines = None
+            self.invalidation_counter.count()
 
-        elif enemy.ai_type == "aggressive":
-            # プレイヤーに近づこうとする行動
-            min_distance, nearest_player = self.get_distance_to_nearest_player(
-                current_city
-            )
+    def get_view_rect(self):
+        """カメラの表示範囲（ワールド座標の矩形 min_x, min_y, max_x, max_y）"""
+        return (
+            self.camera_x,
+            self.camera_y,
+            self.camera_x + screen_width,
+            self.camera_y + screen_height,
+        )
 
-            if nearest_player and nearest_player.current_city_id:
-                nearest_player_city = self.game_state.get_city_by_id(
-                    nearest_player.current_city_id
-                )
-                if nearest_player_city:
-                    # プレイヤーに向かうパスを検索
-                    path = self.find_path_to_target(current_city, nearest_player_city)
-                    if path:
-                        # パスの最初のステップに移動
-                        return path[0]
-
-            # プレイヤーが見つからない場合はランダム移動
-            return random.choice(connected_cities)
-
-        elif enemy.ai_type == "defensive":
-            # プレイヤーから遠ざかろうとする行動
-            min_distance, nearest_player = self.get_distance_to_nearest_player(
-                current_city
-            )
+    def get_visible_cities(self):
+        """表示範囲と重なるセルの都市（描画候補）"""
+        return self.culling.query_cities(*self.get_view_rect())
+
+    def get_visible_characters(self):
+        """表示範囲と重なるセルのキャラクター（描画候補）を (プレイヤー, 敵) で返す"""
+        self.character_layout.get_layouts()  # 配置の変更を反映してから問い合わせる
+        players = []
+        enemies = []
+        for character in self.culling.query_characters(*self.get_view_rect()):
+            if self.game_state.get_team(character.id) == "player":
+                players.append(character)
+            else:
+                enemies.append(character)
+        return players, enemies
 
-            if nearest_player and nearest_player.current_city_id:
-                nearest_player_city = self.game_state.get_city_by_id(
-                    nearest_player.current_city_id
-                )
-                if nearest_player_city:
-                    best_city = None
-                    max_distance = min_distance
-
-                    # 接続されたCityの中で最もプレイヤーから遠いCityを選択
-                    for city in connected_cities:
-                        dx = nearest_player_city.x - city.x
-                        dy = nearest_player_city.y - city.y
-                        distance = (dx * dx + dy * dy) ** 0.5
-
-                        if distance > max_distance:
-                            max_distance = distance
-                            best_city = city
-
-                    if best_city:
-                        return best_city
-
-            # 遠ざかる場所がない場合はランダム移動
-            return random.choice(connected_cities)
-
-        elif enemy.ai_type == "patrol":
-            # パトロールルートに沿って移動
-            if enemy.patrol_city_ids and len(enemy.patrol_city_ids) > 1:
-                # 次のパトロール地点を取得
-                next_index = (enemy.patrol_index + 1) % len(enemy.patrol_city_ids)
-                target_city_id = enemy.patrol_city_ids[next_index]
-                target_city = self.game_state.get_city_by_id(target_city_id)
-
-                if target_city:
-                    # 現在位置から次のパトロール地点への経路を検索
-                    path = self.find_path_to_target(current_city, target_city)
-                    if path:
-                        # パスの最初のステップに移動
-                        return path[0]
-                    else:
-                        # 直接接続されているかチェック
-                        if target_city in connected_cities:
-                            enemy.patrol_index = next_index
-                            return target_city
-
-            # パトロールルートが設定されていない場合はランダム移動
-            return random.choice(connected_cities)
-
-        # デフォルトはランダム移動
-        return random.choice(connected_cities)
-
-    def get_character_positions_by_city(self):
-        """各Cityにいるキャラクターを収集して辞書で返す"""
-        character_positions = {}
-        for city_id, city in self.game_state.cities.items():
-            character_positions[city] = []
-            for player in self.game_state.players:
-                if player.current_city_id == city_id:
-                    character_positions[city].append(("player", player))
-            for enemy in self.game_state.enemies:
-                if enemy.current_city_id == city_id:
-                    character_positions[city].append(("enemy", enemy))
-        return character_positions
+    def get_road_segments(self):
+        """道路のワールド座標の線分 (x1, y1, x2, y2) のリスト
 
-    def get_player_at_position(self, screen_x, screen_y):
-        """指定したスクリーン座標にいるプレイヤーを取得"""
+        道路の追加通知で1本ずつ追加し、道路リストが置き換えられた場合は作り直す
+        """
+        roads = self.game_state.roads
+        if roads is not self._road_segments_source:
+            self._road_segments = []
+            for road in roads:
+                self._append_road_segment(road)
+            self._road_segments_source = roads
+            self.invalidation_counter.count()
+        return self._road_segments
+
+    def _append_road_segment(self, road):
+        city1 = self.game_state.get_city_by_id(road.city1_id)
+        city2 = self.game_state.get_city_by_id(road.city2_id)
+        if city1 and city2:
+            self._road_segments.append((city1.x, city1.y, city2.x, city2.y))
+
+    def get_character_layout_x(self, character):
+        """同じCity内で重ならないように横に並べたキャラクターのワールドX座標"""
+        return self.character_layout.layout_x(character)
+
+    def get_character_rect(self, character):
+        """キャラクターの描画範囲（ワールド座標の矩形、停止中はキャッシュを使う）"""
+        return self.character_layout.rect(character)
+
+    def get_character_at_position(self, screen_x, screen_y, team):
+        """指定したスクリーン座標にいる陣営team（"player" / "enemy"）のキャラクター"""
         # スクリーン座標をワールド座標に変換
         world_x = screen_x + self.camera_x
         world_y = screen_y + self.camera_y
+        return self.character_layout.character_at(world_x, world_y, team)
 
-        # 各Cityにいるキャラクターを収集
-        character_positions = self.get_character_positions_by_city()
-
-        for player in self.game_state.players:
-            # キャラクターの描画位置を計算（重なり防止と同じロジック）
-            if player.current_city_id and not player.is_moving:
-                # 移動中でない場合のみオフセットを適用
-                current_city = self.game_state.get_city_by_id(player.current_city_id)
-                if current_city and current_city in character_positions:
-                    city_characters = character_positions[current_city]
-                    char_index = next(
-                        (
-                            idx
-                            for idx, (char_type, char) in enumerate(city_characters)
-                            if char_type == "player" and char == player
-                        ),
-                        0,
-                    )
-
-                    offset_x = 0
-                    if len(city_characters) > 1:
-                        total_width = len(city_characters) * player.width
-                        start_x = -(total_width - player.width) // 2
-                        offset_x = start_x + char_index * player.width
-
-                    adjusted_x = player.x + offset_x
-                else:
-                    adjusted_x = player.x
-            else:
-                # 移動中または現在のCityがない場合はオフセットなし
-                adjusted_x = player.x
-
-            # プレイヤーの範囲内かチェック
-            half_width = player.width // 2
-            half_height = player.height // 2
-            if (
-                adjusted_x - half_width <= world_x <= adjusted_x + half_width
-                and player.y - half_height <= world_y <= player.y + half_height
-            ):
-                return player
-        return None
+    def get_player_at_position(self, screen_x, screen_y):
+        """指定したスクリーン座標にいるプレイヤーを取得"""
+        return self.get_character_at_position(screen_x, screen_y, "player")
 
     def get_city_at_position(self, screen_x, screen_y):
         """指定したスクリーン座標にあるCityを取得"""
@@ -556,53 +517,12 @@ class MapScene(Scene):
 
     def get_enemy_at_position(self, screen_x, screen_y):
         """指定したスクリーン座標にいる敵を取得"""
-        # スクリーン座標をワールド座標に変換
-        world_x = screen_x + self.camera_x
-        world_y = screen_y + self.camera_y
-
-        # 各Cityにいるキャラクターを収集
-        character_positions = self.get_character_positions_by_city()
-
-        for enemy in self.game_state.enemies:
-            # キャラクターの描画位置を計算（重なり防止と同じロジック）
-            if enemy.current_city_id and not enemy.is_moving:
-                # 移動中でない場合のみオフセットを適用
-                current_city = self.game_state.get_city_by_id(enemy.current_city_id)
-                if current_city and current_city in character_positions:
-                    city_characters = character_positions[current_city]
-                    char_index = next(
-                        (
-                            idx
-                            for idx, (char_type, char) in enumerate(city_characters)
-                            if char_type == "enemy" and char == enemy
-                        ),
-                        0,
-                    )
-
-                    offset_x = 0
-                    if len(city_characters) > 1:
-                        total_width = len(city_characters) * enemy.width
-                        start_x = -(total_width - enemy.width) // 2
-                        offset_x = start_x + char_index * enemy.width
-
-                    adjusted_x = enemy.x + offset_x
-                else:
-                    adjusted_x = enemy.x
-            else:
-                # 移動中または現在のCityがない場合はオフセットなし
-                adjusted_x = enemy.x
-
-            # 敵の範囲内かチェック
-            half_width = enemy.width // 2
-            half_height = enemy.height // 2
-            if (
-                adjusted_x - half_width <= world_x <= adjusted_x + half_width
-                and enemy.y - half_height <= world_y <= enemy.y + half_height
-            ):
-                return enemy
-        return None
+        return self.get_character_at_position(screen_x, screen_y, "enemy")
 
     def update(self):
+        # キャッシュの無効化回数をフレームごとに集計
+        self.invalidation_counter.end_frame()
+
         # サブシーンの処理を先に実行
         if super().update():
             return self
@@ -612,6 +532,7 @@ class MapScene(Scene):
         if pyxel.btnp(pyxel.KEY_Q):
             from game import TitleScene
 
+            self.ai_planner.close()
             return TitleScene()
 
         # Vキーでデバッグ情報のページ切り替え
@@ -720,33 +641,78 @@ class MapScene(Scene):
             self.draw_debug_page(self.debug_page)
         else:
             # デバッグ情報非表示時は最小限の情報のみ
-            pyxel.text(5, 5, "Press V for debug info", 8)
+            self.label_atlas.draw_text(5, 5, "Press V for debug info", 8)
+
+    def build_debug_character_lines(self):
+        """デバッグページ3のキャラクター一覧を (y座標, テキスト, 色) のリストで作成"""
+        lines = []
+        # プレイヤーの情報を表示
+        lines.append((25, "Players:", 14))
+        y_pos = 35
+        for i, player in enumerate(self.game_state.players):
+            player_city_id = player.current_city_id if player.current_city_id else None
+            # 都市の表示名を取得
+            if player_city_id is not None:
+                display_name = self.game_state.get_city_display_name(player_city_id)
+            else:
+                display_name = "None"
+            player_info = (
+                f"Player {i+1} at {display_name}: "
+                f"Life {player.life}/{player.max_life}"
+            )
+            lines.append((y_pos, player_info, 11))
+            y_pos += 10
+
+        # 敵の情報を表示
+        y_pos += 5
+        lines.append((y_pos, "Enemies:", 14))
+        y_pos += 10
+        for i, enemy in enumerate(self.game_state.enemies):
+            enemy_city_id = enemy.current_city_id if enemy.current_city_id else None
+            # 都市の表示名を取得
+            if enemy_city_id is not None:
+                display_name = self.game_state.get_city_display_name(enemy_city_id)
+            else:
+                display_name = "None"
+            enemy_info = f"Enemy {i+1} ({enemy.ai_type}) at {display_name}:"
+            lines.append((y_pos, enemy_info, 8))
+            y_pos += 10
+            life_info = f"  Life {enemy.life}/{enemy.max_life}"
+            lines.append((y_pos, life_info, 8))
+            y_pos += 10
+        return lines
 
     def draw_debug_page(self, page):
         """デバッグ情報のページを描画"""
         # ページ番号表示
         page_text = f"Debug Page {page}/{self.max_debug_page} (V to switch)"
-        pyxel.text(5, 5, page_text, 7)
+        self.label_atlas.draw_text(5, 5, page_text, 7)
 
         if page == 1:
             # ページ1: 基本操作とターン情報
-            pyxel.text(5, 15, "Map Scene (30x30) - Press Q to Title", 7)
+            self.label_atlas.draw_text(5, 15, "Map Scene (30x30) - Press Q to Title", 7)
             if self.game_state.current_turn == "enemy" and self.camera_follow_target:
-                pyxel.text(5, 25, "Camera following enemy - Manual control disabled", 6)
+                self.label_atlas.draw_text(
+                    5, 25, "Camera following enemy - Manual control disabled", 6
+                )
             else:
-                pyxel.text(5, 25, "WASD: Move Camera, ESC: Deselect", 7)
-            pyxel.text(5, 35, "Click: Select character, Click connected City", 7)
+                self.label_atlas.draw_text(5, 25, "WASD: Move Camera, ESC: Deselect", 7)
+            self.label_atlas.draw_text(
+                5, 35, "Click: Select character, Click connected City", 7
+            )
 
-            # ターン情報を表示
-            turn_counter = self.game_state.turn_counter
-            turn_name = self.game_state.current_turn.upper()
-            turn_text = f"Turn {turn_counter}: {turn_name} TURN"
-            turn_color = 11 if self.game_state.current_turn == "player" else 8
-            pyxel.text(5, 45, turn_text, turn_color)
+            # ターン情報を表示（ターン切り替えの通知で作り直す）
+            if self._debug_turn_text is None:
+                turn_counter = self.game_state.turn_counter
+                turn_name = self.game_state.current_turn.upper()
+                turn_text = f"Turn {turn_counter}: {turn_name} TURN"
+                turn_color = 11 if self.game_state.current_turn == "player" else 8
+                self._debug_turn_text = (turn_text, turn_color)
+            self.label_atlas.draw_text(5, 45, *self._debug_turn_text)
 
             can_move = "YES" if self.can_move_this_turn() else "NO"
             move_text = f"Can move this turn: {can_move}"
-            pyxel.text(5, 55, move_text, 10)
+            self.label_atlas.draw_text(5, 55, move_text, 10)
 
             # 状態マシン情報を表示
             self.state_context.draw_debug_info(5, 65)
@@ -766,11 +732,12 @@ class MapScene(Scene):
                 else:
                     display_name = "None"
                 selected_text = f"Selected Player at {display_name}:"
-                pyxel.text(5, 65, selected_text, 11)
+                self.label_atlas.draw_text(5, 65, selected_text, 11)
                 pos_text = (
                     f"  Position: ({int(self.selected_player.x)}, "
                     f"{int(self.selected_player.y)})"
                 )
+                # 移動中は毎フレーム変わるためアトラスを使わない
                 pyxel.text(5, 75, pos_text, 11)
                 # プレイヤーの戦闘ステータスを表示
                 player_life = self.selected_player.life
@@ -780,7 +747,7 @@ class MapScene(Scene):
                     f"  Life: {player_life}/{player_max_life}, "
                     f"Attack: {player_attack}"
                 )
-                pyxel.text(5, 85, status_text, 11)
+                self.label_atlas.draw_text(5, 85, status_text, 11)
             elif self.game_state.current_turn == "enemy" and self.selected_enemy:
                 current_city_id = (
                     self.selected_enemy.current_city_id
@@ -795,11 +762,12 @@ class MapScene(Scene):
                 else:
                     display_name = "None"
                 selected_text = f"Selected Enemy at {display_name}:"
-                pyxel.text(5, 65, selected_text, 8)
+                self.label_atlas.draw_text(5, 65, selected_text, 8)
                 pos_text = (
                     f"  Position: ({int(self.selected_enemy.x)}, "
                     f"{int(self.selected_enemy.y)})"
                 )
+                # 移動中は毎フレーム変わるためアトラスを使わない
                 pyxel.text(5, 75, pos_text, 8)
                 # 敵の戦闘ステータスを表示
                 enemy_life = self.selected_enemy.life
@@ -808,17 +776,28 @@ class MapScene(Scene):
                 status_text = (
                     f"  Life: {enemy_life}/{enemy_max_life}, " f"Attack: {enemy_attack}"
                 )
-                pyxel.text(5, 85, status_text, 8)
+                self.label_atlas.draw_text(5, 85, status_text, 8)
             else:
-                pyxel.text(5, 65, "No character selected", 8)
+                self.label_atlas.draw_text(5, 65, "No character selected", 8)
+
+            # 描画用キャッシュの無効化回数（プロファイル用）
+            counter = self.invalidation_counter
+            invalidation_text = (
+                f"Cache invalidations: {counter.last_frame}/frame "
+                f"(peak {counter.peak})"
+            )
+            # 無効化が続くフレームでは毎フレーム変わるためアトラスを使わない
+            pyxel.text(5, screen_height - 15, invalidation_text, 6)
+            # ラベルアトラスのヒット率と使用率（毎フレーム変わるためアトラスを使わない）
+            pyxel.text(5, screen_height - 25, self.label_atlas.get_stats_text(), 6)
 
         elif page == 2:
             # ページ2: カメラとマップ情報
-            pyxel.text(5, 15, "Camera & Map Information", 14)
+            self.label_atlas.draw_text(5, 15, "Camera & Map Information", 14)
 
             # カメラ位置を表示
             camera_text = f"Camera: ({int(self.camera_x)}, {int(self.camera_y)})"
-            pyxel.text(5, 25, camera_text, 10)
+            pyxel.text(5, 25, camera_text, 10)  # カメラの移動中は毎フレーム変わる
 
             # カメラ追従情報を表示
             if self.camera_follow_target:
@@ -827,74 +806,48 @@ class MapScene(Scene):
                 else:
                     target_type = "Player"
                 follow_info = f"Camera following: {target_type}"
-                pyxel.text(5, 35, follow_info, 13)
+                self.label_atlas.draw_text(5, 35, follow_info, 13)
             else:
-                pyxel.text(5, 35, "Camera: Manual control", 6)
+                self.label_atlas.draw_text(5, 35, "Camera: Manual control", 6)
 
-            # Cities情報を表示
-            pyxel.text(5, 50, "Cities:", 14)
+            # Cities情報を表示（都市発見の通知で作り直す）
+            self.label_atlas.draw_text(5, 50, "Cities:", 14)
+            if self._debug_city_lines is None:
+                # 表示名を使用
+                self._debug_city_lines = [
+                    f"{city.name}: ({int(city.x)}, {int(city.y)})"
+                    for city in self.game_state.cities.values()
+                ]
             y_pos = 60
-            for city_name, city in self.game_state.cities.items():
+            for city_info in self._debug_city_lines:
                 if y_pos > screen_height - 10:  # 画面からはみ出さないように制限
                     break
-                # 表示名を使用
-                display_name = city.name
-                city_info = f"{display_name}: ({int(city.x)}, {int(city.y)})"
-                pyxel.text(5, y_pos, city_info, 12)
+                self.label_atlas.draw_text(5, y_pos, city_info, 12)
                 y_pos += 10
 
         elif page == 3:
             # ページ3: キャラクター情報とAI情報
-            pyxel.text(5, 15, "Characters & AI Information", 14)
-
-            # プレイヤーの情報を表示
-            pyxel.text(5, 25, "Players:", 14)
-            y_pos = 35
-            for i, player in enumerate(self.game_state.players):
-                player_city_id = (
-                    player.current_city_id if player.current_city_id else None
-                )
-                # 都市の表示名を取得
-                if player_city_id is not None:
-                    display_name = self.game_state.get_city_display_name(player_city_id)
-                else:
-                    display_name = "None"
-                player_info = (
-                    f"Player {i+1} at {display_name}: "
-                    f"Life {player.life}/{player.max_life}"
-                )
-                pyxel.text(5, y_pos, player_info, 11)
-                y_pos += 10
+            self.label_atlas.draw_text(5, 15, "Characters & AI Information", 14)
 
-            # 敵の情報を表示
-            y_pos += 5
-            pyxel.text(5, y_pos, "Enemies:", 14)
-            y_pos += 10
-            for i, enemy in enumerate(self.game_state.enemies):
-                enemy_city_id = enemy.current_city_id if enemy.current_city_id else None
-                # 都市の表示名を取得
-                if enemy_city_id is not None:
-                    display_name = self.game_state.get_city_display_name(enemy_city_id)
-                else:
-                    display_name = "None"
-                enemy_info = f"Enemy {i+1} ({enemy.ai_type}) at {display_name}:"
-                pyxel.text(5, y_pos, enemy_info, 8)
-                y_pos += 10
-                life_info = f"  Life {enemy.life}/{enemy.max_life}"
-                pyxel.text(5, y_pos, life_info, 8)
-                y_pos += 10
+            # キャラクター一覧を表示（移動・撃破・戦闘の通知で作り直す）
+            if self._debug_character_lines is None:
+                self._debug_character_lines = self.build_debug_character_lines()
+            for y_pos, text, color in self._debug_character_lines:
+                self.label_atlas.draw_text(5, y_pos, text, color)
 
             # AI凡例を表示（画面の下部に）
             legend_y = screen_height - 35
-            pyxel.text(5, legend_y, "AI Legend:", 14)
+            self.label_atlas.draw_text(5, legend_y, "AI Legend:", 14)
             pyxel.circ(15, legend_y + 8, 2, 8)  # 赤色
-            pyxel.text(20, legend_y + 6, "Aggressive", 7)
+            self.label_atlas.draw_text(20, legend_y + 6, "Aggressive", 7)
             pyxel.circ(80, legend_y + 8, 2, 11)  # ライトブルー
-            pyxel.text(85, legend_y + 6, "Patrol", 7)
+            self.label_atlas.draw_text(85, legend_y + 6, "Patrol", 7)
             pyxel.circ(15, legend_y + 16, 2, 3)  # 緑色
-            pyxel.text(20, legend_y + 14, "Defensive", 7)
+            self.label_atlas.draw_text(20, legend_y + 14, "Defensive", 7)
             pyxel.circ(80, legend_y + 16, 2, 14)  # ピンク
-            pyxel.text(85, legend_y + 14, "Random", 7)
+            self.label_atlas.draw_text(85, legend_y + 14, "Random", 7)
+            pyxel.circ(15, legend_y + 24, 2, 10)  # 黄色
+            self.label_atlas.draw_text(20, legend_y + 22, "Tactical", 7)
 
             # 戦闘処理状態を表示
             if self.is_processing_battles:
@@ -902,7 +855,7 @@ class MapScene(Scene):
                 total_battles = len(self.pending_battle_results)
                 battle_info = f"Processing battles: {current_battle}/{total_battles}"
                 battle_y = legend_y - 20
-                pyxel.text(5, battle_y, battle_info, 13)
+                self.label_atlas.draw_text(5, battle_y, battle_info, 13)
 
             # 現在のマウス座標を表示
             # スクリーン座標からワールド座標に変換
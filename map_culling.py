@@ -0,0 +1,89 @@
+"""
+マップ描画のカリング用空間インデックス
+
+都市と停止中のキャラクターを画面サイズのセルのグリッドに登録しておき、
+描画時はカメラの表示範囲と重なるセルの要素だけを取り出す。
+移動中のキャラクターは位置が毎フレーム変わるため、グリッドに入れずに別に持つ
+"""
+
+from typing import TYPE_CHECKING, Dict, List
+
+from spatial_index import SpatialGrid
+
+if TYPE_CHECKING:
+    from game_state import Character, City
+
+
+class MapCullingIndex:
+    """都市と停止中のキャラクターの空間インデックス（セルは画面サイズ）
+
+    要素は画面内判定と同じ余白（都市は大きさ、キャラクターは幅・高さ）を付けた
+    矩形で登録するので、表示範囲の矩形で問い合わせれば描画対象の候補が揃う
+    """
+
+    def __init__(self, cell_size: float):
+        self._cities = SpatialGrid(cell_size)
+        self._characters = SpatialGrid(cell_size)
+        self._city_objects: Dict[int, "City"] = {}
+        # キャラクターID → キャラクター（グリッドに登録したもの・移動中のもの）
+        self._placed: Dict[int, "Character"] = {}
+        self._moving: Dict[int, "Character"] = {}
+
+    def add_city(self, city: "City"):
+        """都市を登録（都市は移動しない）"""
+        self._city_objects[city.id] = city
+        self._cities.insert(
+            city.id,
+            city.x - city.size,
+            city.y - city.size,
+            city.x + city.size,
+            city.y + city.size,
+        )
+
+    def place_character(self, character: "Character", layout_x: float):
+        """停止中のキャラクターを都市内の並び位置（ワールドX座標）で登録"""
+        self._moving.pop(character.id, None)
+        self._placed[character.id] = character
+        self._characters.insert(
+            character.id,
+            layout_x - character.width,
+            character.y - character.height,
+            layout_x + character.width,
+            character.y + character.height,
+        )
+
+    def set_moving(self, character: "Character"):
+        """移動中のキャラクターとしてグリッドから外す（毎フレーム判定する）"""
+        self._placed.pop(character.id, None)
+        self._characters.remove(character.id)
+        self._moving[character.id] = character
+
+    def remove_character(self, character_id: int):
+        """名簿から外れたキャラクターを削除"""
+        self._placed.pop(character_id, None)
+        self._characters.remove(character_id)
+        self._moving.pop(character_id, None)
+
+    def query_cities(self, min_x, min_y, max_x, max_y) -> List["City"]:
+        """矩形と重なるセルの都市を登録順で取得"""
+        return [
+            self._city_objects[city_id]
+            for city_id in self._cities.query(min_x, min_y, max_x, max_y)
+        ]
+
+    def query_characters(self, min_x, min_y, max_x, max_y) -> List["Character"]:
+        """矩形と重なるセルの停止中のキャラクターと、移動中の全キャラクターを取得"""
+        characters = [
+            self._placed[character_id]
+            for character_id in self._characters.query(min_x, min_y, max_x, max_y)
+        ]
+        characters.extend(self._moving.values())
+        return characters
+
+    @property
+    def city_count(self) -> int:
+        return len(self._cities)
+
+    @property
+    def character_count(self) -> int:
+        return len(self._placed) + len(self._moving)
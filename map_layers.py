@@ -0,0 +1,100 @@
+"""
+マップシーンの描画レイヤー（変化の少ない部分を画像に描いておき毎フレーム1回のbltで描く）
+"""
+
+from typing import List, Optional, Tuple
+
+import pyxel
+
+WALL_COLOR = 4  # 壁（茶色）
+FLOOR_COLOR = 6  # 床（薄い色）
+ROAD_COLOR = 9  # 道路（オレンジ色）
+TRANSPARENT_COLOR = 0  # レイヤーの透明色（道路の色と重ならないこと）
+
+Segment = Tuple[float, float, float, float]  # ワールド座標の線分 (x1, y1, x2, y2)
+
+
+class BakedBackground:
+    """タイルマップ全体を1枚の画像に焼き込んだ背景レイヤー
+
+    マップはシーンの初期化後に変化しないので、タイルごとのrectは焼き込み時に
+    1回だけ描き、毎フレームはカメラ位置だけずらした1回のbltで描画する。
+    マップを変更した場合は bake() で焼き直す
+    """
+
+    def __init__(self, map_data: List[List[int]], tile_size: int):
+        self.tile_size = tile_size
+        self.image = None
+        self.bake_count = 0  # 焼き込んだ回数（プロファイル用）
+        self.bake(map_data)
+
+    def bake(self, map_data: List[List[int]]):
+        """マップデータを画像に焼き込む（マップを変更したら呼び直す）"""
+        rows = len(map_data)
+        cols = len(map_data[0]) if rows else 0
+        width = max(1, cols * self.tile_size)
+        height = max(1, rows * self.tile_size)
+        if self.image is None or (self.image.width, self.image.height) != (
+            width,
+            height,
+        ):
+            self.image = pyxel.Image(width, height)
+
+        self.image.cls(FLOOR_COLOR)
+        for row, tiles in enumerate(map_data):
+            for col, tile in enumerate(tiles):
+                if tile == 1:
+                    self.image.rect(
+                        col * self.tile_size,
+                        row * self.tile_size,
+                        self.tile_size,
+                        self.tile_size,
+                        WALL_COLOR,
+                    )
+        self.bake_count += 1
+
+    def draw(self, camera_x: float, camera_y: float):
+        """カメラ位置に合わせて背景を描画（画面外はpyxelがクリップする）"""
+        pyxel.blt(
+            -camera_x, -camera_y, self.image, 0, 0, self.image.width, self.image.height
+        )
+
+
+class RoadLayer:
+    """道路をワールド座標の画像に描いておくレイヤー
+
+    道路は都市の発見時に追加されるだけなので、追加された線分だけを画像に描き足し、
+    毎フレームはカメラ位置でずらした1回のbltで描画する（道路の本数に依存しない）。
+    線分リストが置き換えられた（ロード）場合は作り直す
+    """
+
+    def __init__(self, width: int, height: int, color: int = ROAD_COLOR):
+        self.image = pyxel.Image(max(1, width), max(1, height))
+        self.color = color
+        self._segments: Optional[List[Segment]] = None  # 描いた線分リスト
+        self._drawn = 0  # 描いた線分の数
+        self.rebuild_count = 0  # 作り直した回数（プロファイル用）
+
+    def sync(self, segments: List[Segment]):
+        """線分リストのうち、まだ描いていない分を画像に描き足す"""
+        if segments is not self._segments or len(segments) < self._drawn:
+            self.image.cls(TRANSPARENT_COLOR)
+            self._segments = segments
+            self._drawn = 0
+            self.rebuild_count += 1
+        for x1, y1, x2, y2 in segments[self._drawn :]:
+            self.image.line(x1, y1, x2, y2, self.color)
+        self._drawn = len(segments)
+
+    def draw(self, camera_x: float, camera_y: float):
+        """カメラ位置に合わせて道路を描画（画面外はpyxelがクリップする）"""
+        pyxel.blt(
+            -camera_x,
+            -camera_y,
+            self.image,
+            0,
+            0,
+            self.image.width,
+            self.image.height,
+            TRANSPARENT_COLOR,
+        )
@@ -74,64 +74,20 @@ class MapGameState(ABC):
 
     # マップ描画共通メソッド群
     def draw_map_background(self, map_scene):
-        """マップ背景の描画"""
-        from game import screen_height, screen_width
-
-        # 画面に表示するタイルの範囲を計算
-        start_col = int(map_scene.camera_x // map_scene.tile_size)
-        end_col = min(
-            int((map_scene.camera_x + screen_width) // map_scene.tile_size) + 1,
-            map_scene.map_width,
-        )
-        start_row = int(map_scene.camera_y // map_scene.tile_size)
-        end_row = min(
-            int((map_scene.camera_y + screen_height) // map_scene.tile_size) + 1,
-            map_scene.map_height,
-        )
-
-        # マップを描画（カメラ位置を考慮）
-        for row in range(start_row, end_row):
-            for col in range(start_col, end_col):
-                if 0 <= row < map_scene.map_height and 0 <= col < map_scene.map_width:
-                    x = col * map_scene.tile_size - map_scene.camera_x
-                    y = row * map_scene.tile_size - map_scene.camera_y
-
-                    if map_scene.map_data[row][col] == 1:
-                        # 壁（茶色）
-                        pyxel.rect(x, y, map_scene.tile_size, map_scene.tile_size, 4)
-                    else:
-                        # 床（薄い色）
-                        pyxel.rect(x, y, map_scene.tile_size, map_scene.tile_size, 6)
+        """マップ背景の描画（シーン初期化時に焼き込んだ画像をカメラ位置で1回blt）"""
+        map_scene.background.draw(map_scene.camera_x, map_scene.camera_y)
 
     def draw_roads(self, map_scene):
-        """道路の描画"""
-        for road in self.context.game_state.roads:
-            city1 = self.context.game_state.get_city_by_id(road.city1_id)
-            city2 = self.context.game_state.get_city_by_id(road.city2_id)
-
-            if city1 and city2:
-                city1_screen_x = city1.x - map_scene.camera_x
-                city1_screen_y = city1.y - map_scene.camera_y
-                city2_screen_x = city2.x - map_scene.camera_x
-                city2_screen_y = city2.y - map_scene.camera_y
-
-                # 線分が画面と交差するかチェック
-                if map_scene.line_intersects_screen(
-                    city1_screen_x, city1_screen_y, city2_screen_x, city2_screen_y
-                ):
-                    pyxel.line(
-                        city1_screen_x,
-                        city1_screen_y,
-                        city2_screen_x,
-                        city2_screen_y,
-                        9,
-                    )  # オレンジ色の線
+        """道路の描画（道路レイヤーに追加分を描き足し、カメラ位置で1回blt）"""
+        road_layer = map_scene.road_layer
+        road_layer.sync(map_scene.get_road_segments())
+        road_layer.draw(map_scene.camera_x, map_scene.camera_y)
 
     def draw_cities(self, map_scene):
-        """都市の描画"""
+        """都市の描画（表示範囲と重なるセルの都市だけを調べる）"""
         from game import screen_height, screen_width
 
-        for city_name, city in self.context.game_state.cities.items():
+        for city in map_scene.get_visible_cities():
             city_screen_x = city.x - map_scene.camera_x
             city_screen_y = city.y - map_scene.camera_y
 
@@ -151,25 +107,28 @@ class MapGameState(ABC):
                 display_name = city.name
                 text_x = city_screen_x - len(display_name) * 2
                 text_y = city_screen_y + half_size + 2
-                pyxel.text(text_x, text_y, display_name, 7)  # 白文字
+                map_scene.label_atlas.draw_text(
+                    text_x, text_y, display_name, 7
+                )  # 白文字
 
     def draw_map_characters(self, map_scene):
         """マップ上のキャラクター描画"""
-        # キャラクターの描画位置を計算（重なりを防ぐ）
-        character_positions = map_scene.get_character_positions_by_city()
+        # 表示範囲と重なるセルのキャラクターだけを描画候補にする
+        # （都市内の並び位置はMapSceneの配置キャッシュを使う）
+        players, enemies = map_scene.get_visible_characters()
 
         # プレイヤーを描画
-        self.draw_players(map_scene, character_positions)
+        self.draw_players(map_scene, players)
 
         # 敵キャラクターを描画
-        self.draw_enemies(map_scene, character_positions)
+        self.draw_enemies(map_scene, enemies)
 
-    def draw_players(self, map_scene, character_positions):
+    def draw_players(self, map_scene, players):
         """プレイヤーキャラクターの描画"""
-        for i, player in enumerate(self.context.game_state.players):
+        for player in players:
             # キャラクターの描画位置を計算
             player_screen_x, player_screen_y = self.calculate_character_screen_position(
-                player, map_scene, character_positions, "player"
+                player, map_scene
             )
 
             # プレイヤーが画面内にある場合のみ描画
@@ -191,12 +150,12 @@ class MapGameState(ABC):
                         player, player_screen_x, player_screen_y, 11
                     )
 
-    def draw_enemies(self, map_scene, character_positions):
+    def draw_enemies(self, map_scene, enemies):
         """敵キャラクターの描画"""
-        for i, enemy in enumerate(self.context.game_state.enemies):
+        for enemy in enemies:
             # キャラクターの描画位置を計算
             enemy_screen_x, enemy_screen_y = self.calculate_character_screen_position(
-                enemy, map_scene, character_positions, "enemy"
+                enemy, map_scene
             )
 
             # 敵が画面内にある場合のみ描画
@@ -218,46 +177,16 @@ class MapGameState(ABC):
                 # 選択された敵に点滅する枠線を描画
                 if (
                     enemy == map_scene.selected_enemy
-                    and self.context.game_state.current_turn == "enemy"
-                ):
+                    or enemy in map_scene.selected_enemies
+                ) and self.context.game_state.current_turn == "enemy":
                     self.draw_enemy_selection_frame(
                         enemy, enemy_screen_x, enemy_screen_y, map_scene
                     )
 
-    def calculate_character_screen_position(
-        self, character, map_scene, character_positions, char_type
-    ):
+    def calculate_character_screen_position(self, character, map_scene):
         """キャラクターのスクリーン座標を計算"""
-        if character.current_city_id and not character.is_moving:
-            # 移動中でない場合のみ同じCity内での位置調整を行う
-            current_city = self.context.game_state.get_city_by_id(
-                character.current_city_id
-            )
-            if current_city and current_city in character_positions:
-                city_characters = character_positions[current_city]
-                char_index = next(
-                    (
-                        idx
-                        for idx, (c_type, char) in enumerate(city_characters)
-                        if c_type == char_type and char == character
-                    ),
-                    0,
-                )
-
-                # 複数キャラクターがいる場合は横に並べる
-                offset_x = 0
-                if len(city_characters) > 1:
-                    total_width = len(city_characters) * character.width
-                    start_x = -(total_width - character.width) // 2
-                    offset_x = start_x + char_index * character.width
-
-                screen_x = character.x + offset_x - map_scene.camera_x
-            else:
-                screen_x = character.x - map_scene.camera_x
-        else:
-            # 移動中または現在のCityがない場合はオフセットなし
-            screen_x = character.x - map_scene.camera_x
-
+        # 移動中でない場合のみ同じCity内での位置調整を行う
+        screen_x = map_scene.get_character_layout_x(character) - map_scene.camera_x
         screen_y = character.y - map_scene.camera_y
         return screen_x, screen_y
 
@@ -343,6 +272,8 @@ class MapGameState(ABC):
             pyxel.circ(indicator_x, indicator_y, 2, 11)  # ライトブルー
         elif enemy.ai_type == "defensive":
             pyxel.circ(indicator_x, indicator_y, 2, 3)  # 緑色
+        elif enemy.ai_type == "tactical":
+            pyxel.circ(indicator_x, indicator_y, 2, 10)  # 黄色
         else:  # random
             pyxel.circ(indicator_x, indicator_y, 2, 14)  # ピンク
 
@@ -425,6 +356,7 @@ class StateContext:
         self.previous_state = None
         self.state_history = []  # デバッグ用状態履歴
         self.game_state = None  # GameStateへの参照を追加
+        self.transition_listeners = []  # 状態遷移の通知先（新しい状態タイプを渡す）
 
     def change_state(self, new_state):
         """状態を変更"""
@@ -432,6 +364,9 @@ class StateContext:
             self.current_state.exit()
             self.previous_state = self.current_state
 
+        for listener in self.transition_listeners:
+            listener(new_state.state_type)
+
         # 状態履歴を記録（最新10件まで）
         if len(self.state_history) >= 10:
             self.state_history.pop(0)
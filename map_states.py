@@ -1,5 +1,3 @@
-import random
-
 import pyxel
 
 from battle import BattleScene
@@ -22,38 +20,10 @@ class PlayerTurnState(MapGameState):
         self.context.clear_camera_follow()
 
     def update(self):
-        # プレイヤーの移動処理
-        for player in self.context.game_state.players:
-            if (
-                player.is_moving
-                and player.target_x is not None
-                and player.target_y is not None
-            ):
-                # 移動処理
-                dx = player.target_x - player.x
-                dy = player.target_y - player.y
-                distance = (dx * dx + dy * dy) ** 0.5
-
-                # 移動方向に基づいて向きを更新
-                if abs(dx) > 1:
-                    player.facing_right = dx > 0
-
-                if distance <= player.speed:
-                    # 目標地点に到達
-                    player.x = player.target_x
-                    player.y = player.target_y
-                    player.current_city_id = player.target_city_id
-                    player.is_moving = False
-                    player.target_x = None
-                    player.target_y = None
-                    player.target_city_id = None
-                    # プレイヤーの移動完了時にTransitionStateに遷移
-                    self.transition_to(TransitionState(self.context))
-                    return self.context
-                else:
-                    # 目標地点に向かって移動
-                    player.x += (dx / distance) * player.speed
-                    player.y += (dy / distance) * player.speed
+        # プレイヤーの移動処理（移動中の全員をまとめて1フレーム進める）
+        if self.context.game_state.advance_movement(self.context.game_state.players):
+            # プレイヤーの移動完了時にTransitionStateに遷移
+            self.transition_to(TransitionState(self.context))
 
         return self.context
 
@@ -87,12 +57,9 @@ class PlayerTurnState(MapGameState):
                         current_city, clicked_city
                     ):
                         # 接続されているCityにのみ移動可能
-                        clicked_city_id = clicked_city.id
-                        self.context.selected_player.target_x = clicked_city.x
-                        self.context.selected_player.target_y = clicked_city.y
-                        self.context.selected_player.target_city_id = clicked_city_id
-                        self.context.selected_player.is_moving = True
-                        self.context.game_state.player_moved_this_turn = True
+                        self.context.game_state.order_move(
+                            self.context.selected_player, clicked_city
+                        )
                         # 移動開始時に選択を解除
                         self.context.selected_player = None
                         self.context.game_state.auto_save()
@@ -113,6 +80,8 @@ class EnemySelectionState(MapGameState):
         super().__init__(context, MapStateType.ENEMY_SELECTION)
         self.selected_enemy = None
         self.target_city = None
+        self.moves = None  # "all"モードでまとめて決定した(敵, 移動先)のリスト
+        self.plan_received = False  # AIの行動決定を受け取ったか
         self.blink_timer = 0
         self.blink_count = 0
         self.max_blinks = 4  # 2回点滅 = 4回の表示切り替え
@@ -123,25 +92,31 @@ class EnemySelectionState(MapGameState):
         self.context.game_state.current_turn = "enemy"
         self.context.game_state.enemy_moved_this_turn = False
         self.context.selected_enemy = None
+        self.context.selected_enemies = []
         self.context.clear_camera_follow()
 
-        # AI決定を即座に実行（待機時間なし）
-        self.select_enemy_to_move()
-
-    def select_enemy_to_move(self):
-        """移動する敵を選択"""
-        # まだ移動していない敵を選択
-        available_enemies = [
-            enemy for enemy in self.context.game_state.enemies if not enemy.is_moving
-        ]
-        if available_enemies:
-            self.selected_enemy = random.choice(available_enemies)
+        # AI決定を受け取る（プレイヤーターン終了時にワーカーで開始済み）
+        self.plan_received = self.receive_plan()
+
+    def receive_plan(self) -> bool:
+        """AIの行動決定を受け取る（フレーム予算内に計算が終わらなければFalse）"""
+        plan = self.context.ai_planner.result()
+        if plan is None:
+            return False
+        if self.context.game_state.enemy_turn_mode == "all":
+            self.plan_enemy_moves(plan)
+        else:
+            self.select_enemy_to_move(plan)
+        return True
+
+    def select_enemy_to_move(self, plan):
+        """AIが選んだ移動する敵と移動先を設定"""
+        if plan:
+            self.selected_enemy, self.target_city = plan[0]
             self.context.selected_enemy = self.selected_enemy
             # 敵を選択時にカメラ追従を設定
             self.context.set_camera_follow_target(self.selected_enemy)
 
-            # AI行動決定
-            self.target_city = self.context.decide_enemy_action(self.selected_enemy)
             if not self.target_city:
                 # 移動先が見つからない場合はそのまま敵ターン終了
                 self.transition_to(TransitionState(self.context))
@@ -149,7 +124,29 @@ class EnemySelectionState(MapGameState):
             # 移動可能な敵がいない場合はターン終了
             self.transition_to(TransitionState(self.context))
 
+    def plan_enemy_moves(self, plan):
+        """まとめて決定した全ての敵の行動を設定（点滅演出も全員で1回）"""
+        self.moves = plan
+        if self.moves:
+            self.selected_enemy = self.moves[0][0]
+            self.context.selected_enemies = [enemy for enemy, _ in self.moves]
+            self.context.set_camera_follow_target(self.selected_enemy)
+        else:
+            # 移動できる敵がいない場合はターン終了
+            self.transition_to(TransitionState(self.context))
+
+    def next_state(self):
+        """点滅演出後の移動実行状態"""
+        if self.moves:
+            return EnemyTurnState(self.context, moves=self.moves)
+        return EnemyTurnState(self.context, self.selected_enemy, self.target_city)
+
     def update(self):
+        if not self.plan_received:
+            # AIの計算が終わるまで待つ（1フレームで待つのは予算の範囲内だけ）
+            self.plan_received = self.receive_plan()
+            return self.context
+
         if self.selected_enemy is None:
             return self.context
 
@@ -161,19 +158,15 @@ class EnemySelectionState(MapGameState):
 
             if self.blink_count >= self.max_blinks:
                 # 点滅演出完了、移動実行状態へ遷移
-                self.transition_to(
-                    EnemyTurnState(self.context, self.selected_enemy, self.target_city)
-                )
+                self.transition_to(self.next_state())
 
         return self.context
 
     def handle_input(self):
         # この状態では基本的に入力を受け付けない（演出中）
         # ただし、SPACEキーでスキップ可能
-        if pyxel.btnp(pyxel.KEY_SPACE):
-            self.transition_to(
-                EnemyTurnState(self.context, self.selected_enemy, self.target_city)
-            )
+        if pyxel.btnp(pyxel.KEY_SPACE) and self.selected_enemy is not None:
+            self.transition_to(self.next_state())
 
     def exit(self):
         pass
@@ -182,15 +175,18 @@ class EnemySelectionState(MapGameState):
 class EnemyTurnState(MapGameState):
     """敵移動実行状態"""
 
-    def __init__(self, context, selected_enemy=None, target_city=None):
+    def __init__(self, context, selected_enemy=None, target_city=None, moves=None):
         super().__init__(context, MapStateType.ENEMY_TURN)
         self.selected_enemy = selected_enemy
         self.target_city = target_city
+        self.moves = moves  # まとめて移動する(敵, 移動先)のリスト
 
     def enter(self):
         super().enter()
         # 既に選択された敵の移動を開始
-        if self.selected_enemy and self.target_city:
+        if self.moves:
+            self.execute_enemy_moves()
+        elif self.selected_enemy and self.target_city:
             self.execute_enemy_move()
         else:
             # 何らかの理由で敵が選択されていない場合はターン終了
@@ -207,60 +203,32 @@ class EnemyTurnState(MapGameState):
         if current_city and self.context.is_cities_connected(
             current_city, self.target_city
         ):
-            # 接続されているCityにのみ移動可能
-            target_city_id = self.target_city.id
-            self.selected_enemy.target_x = self.target_city.x
-            self.selected_enemy.target_y = self.target_city.y
-            self.selected_enemy.target_city_id = target_city_id
-            self.selected_enemy.is_moving = True
-            self.context.game_state.enemy_moved_this_turn = True
+            # 接続されているCityにのみ移動可能（パトロールのインデックスも更新される）
+            self.context.game_state.order_move(self.selected_enemy, self.target_city)
             self.context.game_state.auto_save()
-
-            # パトロールAIの場合はインデックスを更新
-            if (
-                self.selected_enemy.ai_type == "patrol"
-                and target_city_id in self.selected_enemy.patrol_city_ids
-            ):
-                self.selected_enemy.patrol_index = (
-                    self.selected_enemy.patrol_city_ids.index(target_city_id)
-                )
         else:
             # 移動できない場合はターン終了
             self.transition_to(TransitionState(self.context))
 
+    def execute_enemy_moves(self):
+        """まとめて決定した全ての敵の移動を同時に開始"""
+        game_state = self.context.game_state
+        for enemy, target_city in self.moves:
+            game_state.order_move(enemy, target_city)
+        game_state.auto_save()
+
     def update(self):
-        # 敵の移動処理
-        if (
-            self.selected_enemy
-            and self.selected_enemy.is_moving
-            and self.selected_enemy.target_x is not None
-            and self.selected_enemy.target_y is not None
-        ):
-            # 移動処理
-            dx = self.selected_enemy.target_x - self.selected_enemy.x
-            dy = self.selected_enemy.target_y - self.selected_enemy.y
-            distance = (dx * dx + dy * dy) ** 0.5
-
-            # 移動方向に基づいて向きを更新
-            if abs(dx) > 1:
-                self.selected_enemy.facing_right = dx > 0
-
-            if distance <= self.selected_enemy.speed:
-                # 目標地点に到達
-                self.selected_enemy.x = self.selected_enemy.target_x
-                self.selected_enemy.y = self.selected_enemy.target_y
-                self.selected_enemy.current_city_id = self.selected_enemy.target_city_id
-                self.selected_enemy.is_moving = False
-                self.selected_enemy.target_x = None
-                self.selected_enemy.target_y = None
-                self.selected_enemy.target_city_id = None
-                # 敵の移動完了時にTransitionStateに遷移
+        # 敵の移動処理（まとめて移動する場合は全員の到着を待つ）
+        if self.moves:
+            movers = [enemy for enemy, _ in self.moves]
+            self.context.game_state.advance_movement(movers)
+            if not any(enemy.is_moving for enemy in movers):
                 self.transition_to(TransitionState(self.context))
-                return self.context
-            else:
-                # 目標地点に向かって移動
-                self.selected_enemy.x += (dx / distance) * self.selected_enemy.speed
-                self.selected_enemy.y += (dy / distance) * self.selected_enemy.speed
+        elif self.selected_enemy and self.context.game_state.advance_movement(
+            [self.selected_enemy]
+        ):
+            # 敵の移動完了時にTransitionStateに遷移
+            self.transition_to(TransitionState(self.context))
 
         return self.context
 
@@ -295,6 +263,10 @@ class TransitionState(MapGameState):
         # 自動セーブ
         self.context.game_state.auto_save()
 
+        # 戦闘がなければ敵ターンの状態は確定しているので、AIの計算を先に始める
+        if self.next_turn == "enemy" and not self.battle_locations:
+            self.context.ai_planner.start()
+
     def update(self):
         # ゲーム終了条件チェック
         if not self.context.game_state.players:
@@ -398,6 +370,11 @@ class BattleSequenceState(MapGameState):
     def on_battle_finished(self):
         print("on_battle_finished")
         """戦闘終了時の処理"""
+        # 戦闘結果をジャーナルに記録
+        battle = self.battle_locations[self.current_battle_index]
+        self.context.game_state.record_battle(
+            battle["city_id"], battle["players"], battle["enemies"]
+        )
         self.current_battle_index += 1
         if self.current_battle_index < len(self.battle_locations):
             self.start_next_battle()
@@ -407,6 +384,7 @@ class BattleSequenceState(MapGameState):
     def finish_battles(self):
         """全戦闘完了時の処理"""
         self.context.game_state.remove_defeated_characters()
+        self.context.game_state.auto_save()
 
         # ターン切り替えは既にTransitionStateで実行済み
         # 現在のターンに基づいて次の状態を決定
@@ -417,7 +395,8 @@ class BattleSequenceState(MapGameState):
             else:
                 self.transition_to(CutinState(self.context, "PLAYER TURN", "player"))
         else:
-            # 敵ターンの場合はそのままカットインへ
+            # 敵ターンの場合はAIの計算を始めてからカットインへ
+            self.context.ai_planner.start()
             self.transition_to(CutinState(self.context, "ENEMY TURN", "enemy"))
 
     def handle_input(self):
@@ -0,0 +1,232 @@
+"""
+都市間の経路探索（A*）と全都市ペアの経路表
+"""
+
+import heapq
+import weakref
+from typing import Callable, Dict, List, Optional
+
+from game_state import City, GameState
+
+# 道路のコスト関数（隣接する2都市を受け取る）。省略時は道路の長さ
+RoadWeight = Callable[[City, City], float]
+
+
+def city_distance(city1: City, city2: City) -> float:
+    """2都市間の直線距離"""
+    dx = city2.x - city1.x
+    dy = city2.y - city1.y
+    return (dx * dx + dy * dy) ** 0.5
+
+
+def find_path(
+    game_state: GameState,
+    start_id: int,
+    target_id: int,
+    weight: Optional[RoadWeight] = None,
+) -> List[int]:
+    """start_idからtarget_idへの最短経路の都市IDリスト（始点を含まない）を取得
+
+    ヒューリスティックは都市間の直線距離。weightを指定する場合は
+    直線距離以上のコストを返すこと（下回ると最短経路にならないことがある）。
+    経路がない場合や始点と終点が同じ場合は空リスト
+    """
+    if start_id == target_id:
+        return []
+    cities = game_state.cities
+    start = cities.get(start_id)
+    target = cities.get(target_id)
+    if start is None or target is None:
+        return []
+    if weight is None:
+        weight = city_distance
+
+    # 親ポインタで経路を復元する（探索中に経路のコピーを作らない）
+    parent: Dict[int, int] = {}
+    cost: Dict[int, float] = {start_id: 0.0}
+    closed = set()
+    # (推定コスト, 追加順, 都市ID)。追加順で同点時の順序を決定的にする
+    frontier = [(city_distance(start, target), 0, start_id)]
+    pushed = 1
+
+    while frontier:
+        _, _, city_id = heapq.heappop(frontier)
+        if city_id == target_id:
+            break
+        if city_id in closed:
+            continue
+        closed.add(city_id)
+
+        city = cities[city_id]
+        city_cost = cost[city_id]
+        for connected_city_id in game_state.get_connected_city_ids(city_id):
+            connected_city = cities.get(connected_city_id)
+            if connected_city is None or connected_city_id in closed:
+                continue
+            new_cost = city_cost + weight(city, connected_city)
+            if new_cost < cost.get(connected_city_id, float("inf")):
+                cost[connected_city_id] = new_cost
+                parent[connected_city_id] = city_id
+                estimate = new_cost + city_distance(connected_city, target)
+                heapq.heappush(frontier, (estimate, pushed, connected_city_id))
+                pushed += 1
+    else:
+        return []  # No path found
+
+    path = [target_id]
+    while path[-1] in parent:
+        path.append(parent[path[-1]])
+    path.pop()  # 始点を除く
+    path.reverse()
+    return path
+
+
+class RoutingTable:
+    """全都市ペアの最短距離と次の移動先の表
+
+    初回の参照時に全都市からのダイクストラ法で構築し、以降は道路リストに
+    追加された道路だけを差分で反映する（都市発見では新都市を経由する経路
+    だけが変わる）。道路リストが置き換えられた場合は作り直す。
+    GameStateは弱参照で持つ（キャッシュのキーになるGameStateを解放できるように）
+    """
+
+    def __init__(self, game_state: GameState, weight: Optional[RoadWeight] = None):
+        self._game_state_ref = weakref.ref(game_state)
+        self.weight = weight if weight is not None else city_distance
+        self._roads: Optional[List] = None  # 構築時の道路リスト
+        self._road_count = 0  # 反映済みの道路数
+        # 始点の都市ID → {終点の都市ID: 距離 / 次の移動先の都市ID}
+        self._distance: Dict[int, Dict[int, float]] = {}
+        self._next_hop: Dict[int, Dict[int, int]] = {}
+
+    @property
+    def game_state(self) -> GameState:
+        game_state = self._game_state_ref()
+        if game_state is None:
+            raise ReferenceError("GameState of this routing table was released")
+        return game_state
+
+    def next_hop(self, source_id: int, target_id: int) -> Optional[int]:
+        """source_idからtarget_idへ向かう最初の移動先（到達できなければNone）"""
+        self._sync()
+        return self._next_hop.get(source_id, {}).get(target_id)
+
+    def distance(self, source_id: int, target_id: int) -> float:
+        """source_idからtarget_idまでの最短距離（到達できなければinf）"""
+        self._sync()
+        return self._distance.get(source_id, {}).get(target_id, float("inf"))
+
+    def route(self, source_id: int, target_id: int) -> List[int]:
+        """source_idからtarget_idへの経路の都市IDリスト（始点を含まない）"""
+        path = []
+        city_id = source_id
+        while city_id != target_id:
+            city_id = self.next_hop(city_id, target_id)
+            if city_id is None:
+                return []
+            path.append(city_id)
+        return path
+
+    def _sync(self):
+        """道路の変更を表に反映"""
+        roads = self.game_state.roads
+        if self._roads is not roads or len(roads) < self._road_count:
+            self._rebuild()
+        elif len(roads) > self._road_count:
+            for road in roads[self._road_count :]:
+                self._add_road(road.city1_id, road.city2_id)
+            self._road_count = len(roads)
+
+    def _rebuild(self):
+        """全都市からのダイクストラ法で表を構築"""
+        game_state = self.game_state
+        self._roads = game_state.roads
+        self._road_count = len(game_state.roads)
+        self._distance = {}
+        self._next_hop = {}
+        for source_id in game_state.cities:
+            self._distance[source_id], self._next_hop[source_id] = self._dijkstra(
+                source_id
+            )
+
+    def _dijkstra(self, source_id: int):
+        game_state = self.game_state
+        cities = game_state.cities
+        distance = {source_id: 0.0}
+        next_hop: Dict[int, int] = {}
+        closed = set()
+        frontier = [(0.0, source_id)]
+        while frontier:
+            current_distance, city_id = heapq.heappop(frontier)
+            if city_id in closed:
+                continue
+            closed.add(city_id)
+            city = cities[city_id]
+            for connected_city_id in game_state.get_connected_city_ids(city_id):
+                connected_city = cities.get(connected_city_id)
+                if connected_city is None or connected_city_id in closed:
+                    continue
+                new_distance = current_distance + self.weight(city, connected_city)
+                if new_distance < distance.get(connected_city_id, float("inf")):
+                    distance[connected_city_id] = new_distance
+                    # 始点の隣接都市はそれ自身、それ以外は親の最初の移動先を引き継ぐ
+                    next_hop[connected_city_id] = next_hop.get(
+                        city_id, connected_city_id
+                    )
+                    heapq.heappush(frontier, (new_distance, connected_city_id))
+        return distance, next_hop
+
+    def _add_road(self, city1_id: int, city2_id: int):
+        """道路1本の追加を反映（その道路を通る経路だけを更新する）"""
+        cities = self.game_state.cities
+        if city1_id not in cities or city2_id not in cities:
+            return
+        for city_id in (city1_id, city2_id):
+            if city_id not in self._distance:
+                self._distance[city_id] = {city_id: 0.0}
+                self._next_hop[city_id] = {}
+        road_cost = self.weight(cities[city1_id], cities[city2_id])
+
+        # 道路の両端からの距離は更新前の値を使う（新しい経路は道路を1回しか通らない）
+        from1 = dict(self._distance[city1_id])
+        from2 = dict(self._distance[city2_id])
+        inf = float("inf")
+        for source_id, distance in self._distance.items():
+            next_hop = self._next_hop[source_id]
+            to1 = distance.get(city1_id, inf)
+            to2 = distance.get(city2_id, inf)
+            # 始点から道路の入口までの最初の移動先（始点が入口なら道路の出口）
+            via1 = next_hop.get(city1_id, city2_id)
+            via2 = next_hop.get(city2_id, city1_id)
+            for entry_cost, via, beyond in ((to1, via1, from2), (to2, via2, from1)):
+                if entry_cost == inf:
+                    continue
+                base = entry_cost + road_cost
+                for target_id, exit_cost in beyond.items():
+                    if target_id == source_id:
+                        continue
+                    new_distance = base + exit_cost
+                    if new_distance < distance.get(target_id, inf):
+                        distance[target_id] = new_distance
+                        next_hop[target_id] = via
+
+
+# GameStateごとの経路表のキャッシュ（GameStateが解放されると経路表も消える）
+_routing_tables: "weakref.WeakKeyDictionary[GameState, RoutingTable]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_routing_table(game_state: GameState) -> RoutingTable:
+    """GameStateの経路表を取得（初回の参照時に構築される）
+
+    都市と道路を共有元と共有しているスナップショットには共有元の経路表を返す
+    """
+    table = _routing_tables.get(game_state)
+    if table is None:
+        for source in game_state.snapshot_sources():
+            if source.roads is game_state.roads and source.cities is game_state.cities:
+                return get_routing_table(source)
+        table = RoutingTable(game_state)
+        _routing_tables[game_state] = table
+    return table
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+ゲームのリプレイ記録と再生
+
+記録はJSON Linesで、1行目が開始時の状態（to_dict）、以降がGameStateの
+ジャーナルイベント（移動指示・到着・ターン切り替え・戦闘結果・都市発見など）と
+状態遷移（MapStateTypeの値）、一定ターンごとのキーフレーム（to_dict）。
+ターン開始のイベントには、前回の記録以降に変わっていれば乱数の状態も含める。
+再生はAIを動かさずにイベントを適用するだけで行い、キーフレームから
+目的のターンまで早送りする
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from game_state import GameState
+from save_service import SaveService, write_atomic
+
+KEYFRAME_INTERVAL = 10  # nターンごとにキーフレームを記録
+REPLAY_FILE_PATH = os.path.join("saves", "replay.jsonl")
+
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    return (
+        json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    ).encode("utf-8")
+
+
+def _is_turn_start(event: Dict[str, Any]) -> bool:
+    """プレイヤーターン開始（ターン番号が進んだ時点）のイベントか"""
+    return event.get("e") == "turn" and event["turn"] == "player"
+
+
+class ReplayRecorder:
+    """GameStateのイベントを購読してリプレイを記録する"""
+
+    def __init__(
+        self,
+        game_state: GameState,
+        path: Optional[str] = None,
+        save_service: Optional[SaveService] = None,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+    ):
+        self.game_state = game_state
+        self.path = path
+        self.save_service = save_service
+        self.keyframe_interval = keyframe_interval
+        self.records: List[Dict[str, Any]] = []  # path=Noneの場合の記録先
+        initial_state = game_state.to_dict()
+        self._rng_state = initial_state["rng"]  # 最後に記録した乱数の状態
+        self._write({"e": "start", "state": initial_state}, truncate=True)
+        game_state.event_listeners.append(self.on_event)
+
+    def detach(self):
+        """記録を終了"""
+        if self.on_event in self.game_state.event_listeners:
+            self.game_state.event_listeners.remove(self.on_event)
+
+    def on_event(self, event: Dict[str, Any]):
+        """GameStateのイベントを記録（ターン開始時は乱数の状態とキーフレームも）"""
+        if not _is_turn_start(event):
+            self._write(event)
+            return
+
+        # ジャーナルの"rng"イベントはターン開始より後にしか書かれないため、
+        # 再生でターン開始時の乱数を復元できるようにターン開始の記録に含める
+        rng_state = self.game_state.get_rng_state()
+        if rng_state != self._rng_state:
+            event = dict(event, rng=rng_state)
+            self._rng_state = rng_state
+        self._write(event)
+        if event["n"] % self.keyframe_interval == 0:
+            self._write(
+                {
+                    "e": "keyframe",
+                    "turn": event["n"],
+                    "state": self.game_state.to_dict(),
+                }
+            )
+
+    def record_state(self, state_type: str):
+        """状態遷移（MapStateTypeの値）を記録"""
+        self._write({"e": "state", "state": state_type})
+
+    def _write(self, record: Dict[str, Any], truncate: bool = False):
+        if self.path is None:
+            self.records.append(record)  # ファイルに書かない場合はメモリに保持
+            return
+        data = _encode_record(record)
+        if self.save_service is not None:
+            if truncate:
+                self.save_service.submit_snapshot(self.path, lambda: data)
+            else:
+                self.save_service.submit_append(self.path, data)
+        elif truncate:
+            write_atomic(self.path, data)
+        else:
+            with open(self.path, "ab") as f:
+                f.write(data)
+
+
+class Replay:
+    """記録されたリプレイの再生"""
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        if not records or records[0].get("e") != "start":
+            raise ValueError("Replay must begin with a start record")
+        self.initial_state = records[0]["state"]
+        self.events: List[Dict[str, Any]] = []
+        # ターン番号 → (そのキーフレーム以降に適用するイベントの位置, 状態)
+        self.keyframes: Dict[int, Tuple[int, Dict[str, Any]]] = {}
+        # ターン番号 → そのターン開始イベントの位置
+        self.turn_starts: Dict[int, int] = {}
+        for record in records[1:]:
+            if record["e"] == "keyframe":
+                self.keyframes[record["turn"]] = (len(self.events), record["state"])
+                continue
+            if _is_turn_start(record):
+                self.turn_starts[record["n"]] = len(self.events)
+            self.events.append(record)
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        """リプレイファイルを読み込む（書き込み途中の最終行は無視）"""
+        records = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+        return cls(records)
+
+    @property
+    def first_turn(self) -> int:
+        return self.initial_state["turn_counter"]
+
+    @property
+    def last_turn(self) -> int:
+        return max(self.turn_starts, default=self.first_turn)
+
+    def state_transitions(self) -> List[str]:
+        """記録された状態遷移（MapStateTypeの値）の列"""
+        return [event["state"] for event in self.events if event["e"] == "state"]
+
+    def _new_game_state(self, state: Dict[str, Any]) -> GameState:
+        game_state = GameState()
+        game_state.autosave_enabled = False
+        game_state.from_dict(state)
+        return game_state
+
+    def state_at_turn(self, turn: int) -> GameState:
+        """ターンturn開始時（プレイヤーターンに切り替わった直後）の状態を再構築"""
+        if turn == self.first_turn:
+            return self._new_game_state(self.initial_state)
+        if turn not in self.turn_starts:
+            raise ValueError(f"Turn {turn} is not in this replay")
+
+        # 目的のターン以前で最も新しいキーフレームから早送りする
+        start_index = 0
+        state = self.initial_state
+        keyframe_turns = [t for t in self.keyframes if t <= turn]
+        if keyframe_turns:
+            start_index, state = self.keyframes[max(keyframe_turns)]
+
+        game_state = self._new_game_state(state)
+        for event in self.events[start_index : self.turn_starts[turn] + 1]:
+            game_state.apply_event(event)
+        return game_state
+
+    def turn_costs(self) -> List[Tuple[int, int, float]]:
+        """ターンごとの(ターン番号, イベント数, 適用時間ms)を計測"""
+        game_state = self._new_game_state(self.initial_state)
+        costs = []
+        turn = self.first_turn
+        index = 0
+        for next_turn in sorted(self.turn_starts):
+            end = self.turn_starts[next_turn] + 1
+            start = time.perf_counter()
+            for event in self.events[index:end]:
+                game_state.apply_event(event)
+            elapsed = (time.perf_counter() - start) * 1000
+            costs.append((turn, end - index, elapsed))
+            turn = next_turn
+            index = end
+        return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and fast-forward replays")
+    parser.add_argument(
+        "replay",
+        nargs="?",
+        default=REPLAY_FILE_PATH,
+        help="Replay file",
+    )
+    parser.add_argument("--turn", type=int, help="Rebuild the state at this turn")
+    parser.add_argument(
+        "--profile", action="store_true", help="Show replay cost per turn"
+    )
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    print(
+        f"Turns {replay.first_turn}-{replay.last_turn}, "
+        f"{len(replay.events)} events, {len(replay.keyframes)} keyframes"
+    )
+
+    if args.turn is not None:
+        start = time.perf_counter()
+        game_state = replay.state_at_turn(args.turn)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"Turn {args.turn}: {len(game_state.cities)} cities, "
+            f"{len(game_state.players)} players, {len(game_state.enemies)} enemies "
+            f"(rebuilt in {elapsed:.2f} ms)"
+        )
+
+    if args.profile:
+        print(f"{'turn':>6} {'events':>7} {'ms':>8}")
+        for turn, event_count, elapsed in replay.turn_costs():
+            print(f"{turn:>6} {event_count:>7} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""セーブファイルをJSON形式とバイナリ形式の間で変換するツール"""
+
+import argparse
+import sys
+
+from game_state import GameState
+from save_format import is_binary_save
+
+
+def convert_save_file(input_path: str, output_path: str, save_format: str) -> bool:
+    """セーブファイルを指定形式に変換（ジャーナルは再生してスナップショットに統合）"""
+    game_state = GameState()
+    game_state.save_file_path = input_path
+    if not game_state.load_from_file():
+        return False
+
+    game_state.save_format = save_format
+    game_state.save_file_path = output_path
+    game_state.save_to_file()
+    return True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert save files between JSON and binary formats"
+    )
+    parser.add_argument("input", help="Input save file (format is auto-detected)")
+    parser.add_argument("output", help="Output save file")
+    parser.add_argument(
+        "--to",
+        choices=["json", "binary"],
+        help="Output format (default: the opposite of the input format)",
+    )
+    args = parser.parse_args(argv)
+
+    save_format = args.to
+    if save_format is None:
+        with open(args.input, "rb") as f:
+            save_format = "json" if is_binary_save(f.read(4)) else "binary"
+
+    return 0 if convert_save_file(args.input, args.output, save_format) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""
+バイナリ形式のセーブファイル
+
+ファイル構成（リトルエンディアン）:
+    ヘッダー: マジック、バージョン、セクション数、本体の長さ
+    セクションテーブル: (タグ, オフセット, 長さ, 件数) × セクション数
+    各セクション: 固定長レコードの並び（文字列は文字列テーブルの番号で参照）
+
+本体の後ろにはテキストのターンジャーナルを追記できる
+"""
+
+import json
+import math
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from game_state import City, Enemy, GameState, Player, Road
+
+MAGIC = b"GSVB"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHI")  # マジック, バージョン, セクション数, 本体の長さ
+SECTION_ENTRY = struct.Struct("<4sIII")  # タグ, オフセット, 長さ, 件数
+
+# 固定長レコード
+CITY_RECORD = struct.Struct("<iiddi")  # id, 名前, x, y, size
+ROAD_RECORD = struct.Struct("<ii")  # city1_id, city2_id
+# x, y, width, height, speed, target_x, target_y, target_city_id, is_moving,
+# facing_right, current_city_id, life, max_life, attack, initiative,
+# image_index, 名前
+CHARACTER_RECORD = struct.Struct("<ddiidddi??iiiiiii")
+# キャラクター共通部 + ai_type, patrol_index, 巡回リストの開始位置, 件数
+ENEMY_RECORD = struct.Struct("<ddiidddi??iiiiiiiiiii")
+STRING_LENGTH = struct.Struct("<I")
+CHARACTER_FIELD_COUNT = 17  # ENEMY_RECORDのうちキャラクター共通部のフィールド数
+
+NONE_ID = -(2**31)  # Noneを表すID
+
+
+def is_binary_save(data: bytes) -> bool:
+    """バイナリ形式のセーブデータか判定"""
+    return data[: len(MAGIC)] == MAGIC
+
+
+class _StringTable:
+    """文字列テーブル（同じ文字列は1度だけ格納）"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, text: str) -> int:
+        index = self._index.get(text)
+        if index is None:
+            index = len(self.strings)
+            self._index[text] = index
+            self.strings.append(text)
+        return index
+
+    def pack(self) -> bytes:
+        encoded = [text.encode("utf-8") for text in self.strings]
+        lengths = struct.pack(f"<{len(encoded)}I", *map(len, encoded))
+        return lengths + b"".join(encoded)
+
+
+def _id_or_none(value: Optional[int]) -> int:
+    return NONE_ID if value is None else value
+
+
+def _float_or_nan(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _character_fields(character, strings: _StringTable) -> Tuple[Any, ...]:
+    return (
+        character.x,
+        character.y,
+        character.width,
+        character.height,
+        character.speed,
+        _float_or_nan(character.target_x),
+        _float_or_nan(character.target_y),
+        _id_or_none(character.target_city_id),
+        character.is_moving,
+        character.facing_right,
+        _id_or_none(character.current_city_id),
+        character.life,
+        character.max_life,
+        character.attack,
+        character.initiative,
+        character.image_index,
+        strings.add(character.name),
+    )
+
+
+def encode_game_state(game_state: "GameState", journal_seq: int = 0) -> bytes:
+    """ゲーム状態をバイナリ形式にエンコード"""
+    strings = _StringTable()
+
+    cities = bytearray(CITY_RECORD.size * len(game_state.cities))
+    offset = 0
+    for city in game_state.cities.values():
+        CITY_RECORD.pack_into(
+            cities, offset, city.id, strings.add(city.name), city.x, city.y, city.size
+        )
+        offset += CITY_RECORD.size
+
+    roads = bytearray(ROAD_RECORD.size * len(game_state.roads))
+    offset = 0
+    for road in game_state.roads:
+        ROAD_RECORD.pack_into(roads, offset, road.city1_id, road.city2_id)
+        offset += ROAD_RECORD.size
+
+    # キャラクターID（プレイヤー、敵の順。固定長レコードとは別セクションに格納）
+    character_ids = [
+        _id_or_none(character.id)
+        for character in list(game_state.players) + list(game_state.enemies)
+    ]
+
+    players = b"".join(
+        CHARACTER_RECORD.pack(*_character_fields(player, strings))
+        for player in game_state.players
+    )
+
+    patrol_ids: List[int] = []
+    enemy_records = []
+    last_positions = {}
+    for index, enemy in enumerate(game_state.enemies):
+        enemy_records.append(
+            ENEMY_RECORD.pack(
+                *_character_fields(enemy, strings),
+                strings.add(enemy.ai_type),
+                enemy.patrol_index,
+                len(patrol_ids),
+                len(enemy.patrol_city_ids),
+            )
+        )
+        patrol_ids.extend(enemy.patrol_city_ids)
+        if enemy.last_player_position is not None:
+            last_positions[str(index)] = enemy.last_player_position
+    enemies = b"".join(enemy_records)
+    patrols = struct.pack(f"<{len(patrol_ids)}i", *patrol_ids)
+
+    # 件数の少ないスカラー値はJSONでまとめて格納
+    meta = {
+        "current_turn": game_state.current_turn,
+        "turn_counter": game_state.turn_counter,
+        "player_moved_this_turn": game_state.player_moved_this_turn,
+        "enemy_moved_this_turn": game_state.enemy_moved_this_turn,
+        "current_ai_enemy_index": game_state.current_ai_enemy_index,
+        "journal_seq": journal_seq,
+        "next_character_id": game_state.next_character_id,
+        "last_player_positions": last_positions,
+        "rng": game_state.get_rng_state(),
+    }
+
+    sections = [
+        (b"META", json.dumps(meta, ensure_ascii=False).encode("utf-8"), 1),
+        (b"STRS", strings.pack(), len(strings.strings)),
+        (b"CITY", bytes(cities), len(game_state.cities)),
+        (b"ROAD", bytes(roads), len(game_state.roads)),
+        (b"PLYR", players, len(game_state.players)),
+        (b"ENMY", enemies, len(game_state.enemies)),
+        (b"PTRL", patrols, len(patrol_ids)),
+        (
+            b"CIDS",
+            struct.pack(f"<{len(character_ids)}i", *character_ids),
+            len(character_ids),
+        ),
+    ]
+
+    table_end = HEADER.size + SECTION_ENTRY.size * len(sections)
+    table = bytearray()
+    offset = table_end
+    for tag, payload, count in sections:
+        table += SECTION_ENTRY.pack(tag, offset, len(payload), count)
+        offset += len(payload)
+
+    header = HEADER.pack(MAGIC, VERSION, len(sections), offset)
+    return header + bytes(table) + b"".join(payload for _, payload, _ in sections)
+
+
+class BinarySave:
+    """バイナリセーブの読み込み
+
+    ヘッダーとセクションテーブルだけを先に読み、各セクションは
+    最初に要求されたときにまとめてデコードする
+    """
+
+    def __init__(self, data: bytes):
+        if not is_binary_save(data):
+            raise ValueError("Not a binary save file")
+        _, version, section_count, self.body_length = HEADER.unpack_from(data, 0)
+        if version > VERSION:
+            raise ValueError(f"Unsupported save version: {version}")
+        self._data = memoryview(data)
+        self._sections: Dict[bytes, Tuple[int, int, int]] = {}
+        for index in range(section_count):
+            tag, offset, length, count = SECTION_ENTRY.unpack_from(
+                data, HEADER.size + index * SECTION_ENTRY.size
+            )
+            self._sections[tag] = (offset, length, count)
+        self._meta: Optional[Dict[str, Any]] = None
+        self._strings: Optional[List[str]] = None
+
+    def section_count(self, tag: bytes) -> int:
+        """セクションの件数（デコードせずに取得）"""
+        return self._sections[tag][2] if tag in self._sections else 0
+
+    def _section(self, tag: bytes) -> memoryview:
+        if tag not in self._sections:
+            return self._data[0:0]
+        offset, length, _ = self._sections[tag]
+        return self._data[offset : offset + length]
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._meta = json.loads(bytes(self._section(b"META")).decode("utf-8"))
+        return self._meta
+
+    @property
+    def strings(self) -> List[str]:
+        if self._strings is None:
+            section = self._section(b"STRS")
+            count = self.section_count(b"STRS")
+            lengths = struct.unpack_from(f"<{count}I", section, 0)
+            blob = bytes(section[STRING_LENGTH.size * count :])
+            strings = []
+            offset = 0
+            for length in lengths:
+                strings.append(blob[offset : offset + length].decode("utf-8"))
+                offset += length
+            self._strings = strings
+        return self._strings
+
+    @property
+    def journal_text(self) -> str:
+        """本体の後ろに追記されたジャーナル"""
+        return bytes(self._data[self.body_length :]).decode("utf-8")
+
+    def iter_city_records(self) -> Iterator[Tuple[int, str, float, float, int]]:
+        strings = self.strings
+        for city_id, name, x, y, size in CITY_RECORD.iter_unpack(
+            self._section(b"CITY")
+        ):
+            yield city_id, strings[name], x, y, size
+
+    def iter_road_records(self) -> Iterator[Tuple[int, int]]:
+        return ROAD_RECORD.iter_unpack(self._section(b"ROAD"))
+
+    def load_cities(self) -> Dict[int, "City"]:
+        """都市を一括でデコード"""
+        from game_state import City
+
+        cities = {}
+        for city_id, name, x, y, size in self.iter_city_records():
+            city = City(city_id, name, x, y)
+            city.size = size
+            cities[city_id] = city
+        return cities
+
+    def load_roads(self) -> List["Road"]:
+        """道路を一括でデコード"""
+        from game_state import Road
+
+        return [Road(city1, city2) for city1, city2 in self.iter_road_records()]
+
+    def _character_dict(self, fields: Tuple[Any, ...]) -> Dict[str, Any]:
+        (
+            x,
+            y,
+            width,
+            height,
+            speed,
+            target_x,
+            target_y,
+            target_city_id,
+            is_moving,
+            facing_right,
+            current_city_id,
+            life,
+            max_life,
+            attack,
+            initiative,
+            image_index,
+            name,
+        ) = fields
+        return {
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            "speed": speed,
+            "target_x": None if math.isnan(target_x) else target_x,
+            "target_y": None if math.isnan(target_y) else target_y,
+            "target_city_id": None if target_city_id == NONE_ID else target_city_id,
+            "is_moving": is_moving,
+            "facing_right": facing_right,
+            "current_city_id": None if current_city_id == NONE_ID else current_city_id,
+            "life": life,
+            "max_life": max_life,
+            "attack": attack,
+            "initiative": initiative,
+            "image_index": image_index,
+            "name": self.strings[name],
+        }
+
+    def load_players(self) -> List["Player"]:
+        from game_state import Player
+
+        return [
+            Player.from_dict(self._character_dict(fields))
+            for fields in CHARACTER_RECORD.iter_unpack(self._section(b"PLYR"))
+        ]
+
+    def load_enemies(self) -> List["Enemy"]:
+        from game_state import Enemy
+
+        patrol_count = self.section_count(b"PTRL")
+        patrol_ids = struct.unpack_from(f"<{patrol_count}i", self._section(b"PTRL"))
+        last_positions = self.meta.get("last_player_positions", {})
+        common = CHARACTER_FIELD_COUNT
+
+        enemies = []
+        for index, fields in enumerate(
+            ENEMY_RECORD.iter_unpack(self._section(b"ENMY"))
+        ):
+            data = self._character_dict(fields[:common])
+            ai_type, patrol_index, patrol_start, patrol_len = fields[common:]
+            data["ai_type"] = self.strings[ai_type]
+            data["patrol_index"] = patrol_index
+            data["patrol_city_ids"] = list(
+                patrol_ids[patrol_start : patrol_start + patrol_len]
+            )
+            data["last_player_position"] = last_positions.get(str(index))
+            enemies.append(Enemy.from_dict(data))
+        return enemies
+
+    def load_character_ids(self) -> List[Optional[int]]:
+        """キャラクターID（プレイヤー、敵の順、古いセーブファイルでは空）"""
+        count = self.section_count(b"CIDS")
+        return [
+            None if character_id == NONE_ID else character_id
+            for character_id in struct.unpack_from(f"<{count}i", self._section(b"CIDS"))
+        ]
+
+    def apply_to(self, game_state: "GameState"):
+        """ゲーム状態を復元（from_dictのバイナリ版）"""
+        meta = self.meta
+        game_state.cities = self.load_cities()
+        game_state.roads = self.load_roads()
+        players = self.load_players()
+        enemies = self.load_enemies()
+        for character, character_id in zip(
+            players + enemies, self.load_character_ids()
+        ):
+            character.id = character_id
+        game_state.players = players
+        game_state.enemies = enemies
+        game_state.restore_next_character_id(meta.get("next_character_id", 1))
+        game_state.current_turn = meta["current_turn"]
+        game_state.turn_counter = meta["turn_counter"]
+        game_state.player_moved_this_turn = meta["player_moved_this_turn"]
+        game_state.enemy_moved_this_turn = meta["enemy_moved_this_turn"]
+        game_state.current_ai_enemy_index = meta.get("current_ai_enemy_index")
+        if "rng" in meta:
+            game_state.set_rng_state(meta["rng"])
@@ -0,0 +1,123 @@
+"""
+バックグラウンドでセーブファイルを書き出すサービス
+"""
+
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+def write_atomic(path: str, data: bytes):
+    """一時ファイルに書き出してから置き換える（書き込み中の破損を防ぐ）"""
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+class _PendingWrite:
+    """ファイル1つ分の未書き出しデータ"""
+
+    def __init__(self):
+        # スナップショットの生成関数
+        self.snapshot: Optional[Callable[[], bytes]] = None
+        self.appends: List[bytes] = []  # スナップショットの後ろに追記するデータ
+
+
+class SaveService:
+    """ワーカースレッドでセーブを書き出すサービス
+
+    書き込み中に届いた要求はファイルごとに1つの書き込みにまとめられる。
+    新しいスナップショットはそれ以前の未書き出しデータをすべて置き換える
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._writing = False
+        self._closed = False
+        self.completed_writes = 0  # 実際に行った書き込みの回数
+        self._thread = threading.Thread(
+            target=self._run, name="SaveService", daemon=True
+        )
+        self._thread.start()
+
+    def submit_snapshot(self, path: str, encode: Callable[[], bytes]):
+        """スナップショットの書き出しを要求（エンコードはワーカーで行う）"""
+        with self._condition:
+            pending = _PendingWrite()
+            pending.snapshot = encode
+            self._pending[path] = pending
+            self._condition.notify_all()
+
+    def submit_append(self, path: str, data: bytes):
+        """ファイル末尾への追記を要求"""
+        with self._condition:
+            self._pending.setdefault(path, _PendingWrite()).appends.append(data)
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """未書き出しの要求がすべて書き出されるまで待つ"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def close(self, timeout: Optional[float] = None):
+        """未書き出しの要求を書き出してからワーカーを停止"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return  # 停止要求があり、書き出すものもない
+                pending = self._pending
+                self._pending = {}
+                self._writing = True
+
+            for path, write in pending.items():
+                self._write(path, write)
+
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _write(self, path: str, write: _PendingWrite):
+        try:
+            appended = b"".join(write.appends)
+            if write.snapshot is not None:
+                write_atomic(path, write.snapshot() + appended)
+            else:
+                with open(path, "ab") as f:
+                    f.write(appended)
+            self.completed_writes += 1
+        except Exception as e:
+            print(f"Failed to write save file {path}: {e}")
+
+
+_default_service: Optional[SaveService] = None
+_default_lock = threading.Lock()
+
+
+def get_default_save_service() -> SaveService:
+    """アプリ全体で共有するセーブサービスを取得（初回に起動）"""
+    global _default_service
+    with _default_lock:
+        if _default_service is None:
+            _default_service = SaveService()
+        return _default_service
+
+
+def shutdown_default_save_service():
+    """共有セーブサービスの未書き出しデータを書き出して停止（終了時フック用）"""
+    global _default_service
+    with _default_lock:
+        service = _default_service
+        _default_service = None
+    if service is not None:
+        service.close()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""AI同士の対戦をプロセスプールで大量に実行し、結果と処理速度を集計するツール"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+from game_rng import GameRandom
+from headless import DEFAULT_MAX_TURNS, HeadlessGame
+
+
+def run_game(seed: int, max_turns: int) -> Dict[str, Any]:
+    """ヘッドレスで1ゲームを最後まで実行"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = HeadlessGame(max_turns=max_turns, seed=seed).play()
+    result["seed"] = seed
+    return result
+
+
+def game_seeds(base_seed: int, games: int) -> List[int]:
+    """ベースシードから各ゲームのシードを導出（ワーカー数に依存しない）"""
+    rng = GameRandom(base_seed).split("games")
+    return [rng.getrandbits(63) for _ in range(games)]
+
+
+def run_batch(
+    games: int, workers: int, max_turns: int, base_seed: int = 0
+) -> List[Dict[str, Any]]:
+    """指定数のゲームを実行（workers=1の場合は同一プロセスで実行）"""
+    seeds = game_seeds(base_seed, games)
+    if workers <= 1:
+        return [run_game(seed, max_turns) for seed in seeds]
+
+    chunksize = max(1, games // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_game, seeds, [max_turns] * games, chunksize=chunksize))
+
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> str:
+    """結果の集計を文字列にまとめる"""
+    games = len(results)
+    player_wins = sum(1 for r in results if r["winner"] == "player")
+    enemy_wins = sum(1 for r in results if r["winner"] == "enemy")
+    draws = games - player_wins - enemy_wins
+
+    def average(key: str) -> float:
+        return sum(r[key] for r in results) / games
+
+    lines = [
+        f"Games:        {games}",
+        f"Elapsed:      {elapsed:.2f} s",
+        f"Games/sec:    {games / elapsed:.1f}",
+        f"Player wins:  {player_wins} ({player_wins / games:.1%})",
+        f"Enemy wins:   {enemy_wins} ({enemy_wins / games:.1%})",
+        f"Unfinished:   {draws} ({draws / games:.1%})",
+        f"Avg turns:    {average('turns'):.1f}",
+        f"Avg cities:   {average('cities'):.1f}",
+        f"Avg battles:  {average('battles'):.1f}",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AI-vs-AI games headlessly")
+    parser.add_argument("--games", type=int, default=1000, help="Number of games")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (1 = run in this process)",
+    )
+    parser.add_argument(
+        "--max-turns",
+        type=int,
+        default=DEFAULT_MAX_TURNS,
+        help="Stop a game as unfinished after this many turns",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Base seed; the same seed reproduces the same games (default: random)",
+    )
+    args = parser.parse_args()
+
+    base_seed = args.seed
+    if base_seed is None:
+        base_seed = random.SystemRandom().getrandbits(32)
+    print(f"Seed:         {base_seed}")
+
+    start = time.perf_counter()
+    results = run_batch(args.games, args.workers, args.max_turns, base_seed)
+    elapsed = time.perf_counter() - start
+    print(summarize(results, elapsed))
+
+
+if __name__ == "__main__":
+    main()
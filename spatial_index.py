@@ -0,0 +1,89 @@
+"""
+一様グリッドによる空間インデックス
+"""
+
+from typing import Dict, Hashable, List, Tuple
+
+
+class SpatialGrid:
+    """一様グリッドの空間インデックス
+
+    要素を境界矩形が重なるセルに登録し、矩形範囲の問い合わせでは
+    範囲と重なるセルの要素だけを返す
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Dict[Hashable, None]] = {}
+        self._item_cells: Dict[Hashable, List[Tuple[int, int]]] = {}
+        self._item_seq: Dict[Hashable, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._item_cells
+
+    def clear(self):
+        """全要素を削除"""
+        self._cells = {}
+        self._item_cells = {}
+        self._item_seq = {}
+        self._next_seq = 0
+
+    def _cell_keys(self, min_x, min_y, max_x, max_y) -> List[Tuple[int, int]]:
+        """矩形と重なるセルのキーを列挙（境界上のセルも含む）"""
+        start_col = int(min_x // self.cell_size)
+        end_col = int(max_x // self.cell_size)
+        start_row = int(min_y // self.cell_size)
+        end_row = int(max_y // self.cell_size)
+        return [
+            (col, row)
+            for row in range(start_row, end_row + 1)
+            for col in range(start_col, end_col + 1)
+        ]
+
+    def insert(self, item: Hashable, min_x, min_y, max_x, max_y):
+        """境界矩形を指定して要素を登録（登録済みの場合は位置を更新）"""
+        if item in self._item_cells:
+            self.remove(item)
+        keys = self._cell_keys(min_x, min_y, max_x, max_y)
+        for key in keys:
+            self._cells.setdefault(key, {})[item] = None
+        self._item_cells[item] = keys
+        self._item_seq[item] = self._next_seq
+        self._next_seq += 1
+
+    def insert_point(self, item: Hashable, x, y):
+        """点として要素を登録"""
+        self.insert(item, x, y, x, y)
+
+    def insert_segment(self, item: Hashable, x1, y1, x2, y2):
+        """線分の境界矩形で要素を登録"""
+        self.insert(item, min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def remove(self, item: Hashable):
+        """要素を削除"""
+        keys = self._item_cells.pop(item, None)
+        if keys is None:
+            return
+        del self._item_seq[item]
+        for key in keys:
+            cell = self._cells[key]
+            del cell[item]
+            if not cell:
+                del self._cells[key]
+
+    def query(self, min_x, min_y, max_x, max_y) -> List[Hashable]:
+        """矩形と重なるセルに登録された要素を登録順で取得"""
+        found: Dict[Hashable, None] = {}
+        for key in self._cell_keys(min_x, min_y, max_x, max_y):
+            cell = self._cells.get(key)
+            if cell:
+                found.update(cell)
+        return sorted(found, key=self._item_seq.__getitem__)
+
+    def query_radius(self, x, y, radius) -> List[Hashable]:
+        """点を中心とする正方形範囲（半径radius）の要素を取得"""
+        return self.query(x - radius, y - radius, x + radius, y + radius)
@@ -0,0 +1,92 @@
+"""
+GameStateの状態変更イベント（型付き）と購読API
+
+マップシーンの描画用キャッシュ（キャラクター配置・ホバー情報・道路・デバッグ表示）は
+毎フレーム作り直さず、ここで通知されるイベントを購読して変更された分だけ無効化する。
+イベントはGameStateのメソッド（ジャーナルの再適用を含む）を通した変更だけを通知し、
+名簿・道路リストの代入（ロード）は通知しない
+"""
+
+from typing import Any, Callable, Dict, List
+
+# イベントの種類
+# 出発・到着・名簿への追加（character, from_city_id, to_city_id）
+CHARACTER_MOVED = "character_moved"
+CHARACTER_DIED = "character_died"  # 撃破されて名簿から外れた（character, city_id）
+CITY_DISCOVERED = "city_discovered"  # 新しい都市の発見（city, enemy）
+ROAD_ADDED = "road_added"  # 道路の追加（road）
+TURN_SWITCHED = "turn_switched"  # ターンの切り替え（turn, turn_counter）
+BATTLE_RESOLVED = "battle_resolved"  # 戦闘結果のlifeの反映（city_id, characters）
+
+EVENT_TYPES = (
+    CHARACTER_MOVED,
+    CHARACTER_DIED,
+    CITY_DISCOVERED,
+    ROAD_ADDED,
+    TURN_SWITCHED,
+    BATTLE_RESOLVED,
+)
+
+
+class StateEvent:
+    """状態変更イベント（種類ごとのフィールドは属性として持つ）"""
+
+    def __init__(self, event_type: str, fields: Dict[str, Any]):
+        self.type = event_type
+        self.__dict__.update(fields)
+
+    def __repr__(self) -> str:
+        return f"StateEvent({self.__dict__!r})"
+
+
+class StateEventBus:
+    """イベントの種類ごとに購読者を管理して通知する
+
+    購読者がいない種類のイベントはイベントオブジェクトも作らない
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[StateEvent], None]]] = {
+            event_type: [] for event_type in EVENT_TYPES
+        }
+
+    def subscribe(self, event_type: str, handler: Callable[[StateEvent], None]):
+        """イベントの購読を登録"""
+        if event_type not in self._handlers:
+            raise ValueError(f"Unknown state event type: {event_type}")
+        self._handlers[event_type].append(handler)
+
+    def unsubscribe(self, event_type: str, handler: Callable[[StateEvent], None]):
+        """イベントの購読を解除（登録されていなければ何もしない）"""
+        handlers = self._handlers.get(event_type, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    def publish(self, event_type: str, **fields: Any):
+        """購読者にイベントを通知"""
+        handlers = self._handlers[event_type]
+        if not handlers:
+            return
+        event = StateEvent(event_type, fields)
+        for handler in list(handlers):
+            handler(event)
+
+
+class InvalidationCounter:
+    """キャッシュの無効化回数をフレームごとに数える（プロファイル用）"""
+
+    def __init__(self):
+        self.current = 0  # 現在のフレームの無効化回数
+        self.last_frame = 0  # 直前のフレームの無効化回数
+        self.peak = 0  # これまでの1フレームあたりの最大値
+        self.total = 0
+
+    def count(self, amount: int = 1):
+        self.current += amount
+        self.total += amount
+
+    def end_frame(self):
+        """フレームの区切り（シーンの update の先頭で呼ぶ）"""
+        self.last_frame = self.current
+        self.peak = max(self.peak, self.current)
+        self.current = 0
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+"tactical"タイプの敵AI: プレイアウト回数を上限とするモンテカルロ木探索（MCTS）
+
+探索木は対象の敵自身の移動の列（開ループ）で、その間のプレイヤーの移動は
+ランダムにサンプリングする。戦闘はbattle_rules.simulate_battleで解決し、
+数ターン先までの兵力差で評価する。
+ゲーム中はプレイアウト回数だけで探索を止める（同じシードなら結果が同じになるように、
+CPUの速さや負荷に依存させない）。時間の上限はプロファイル用のCLIでだけ使う
+"""
+
+import argparse
+import contextlib
+import io
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from battle_rules import simulate_battle
+from game_state import Enemy, GameState
+
+TACTICAL_MAX_ROLLOUTS = 500  # 1回の行動決定のプレイアウト回数（約30ミリ秒）
+TACTICAL_HORIZON_TURNS = 4  # 先読みする自分の手番の数
+EXPLORATION = 1.4  # UCB1の探索係数
+
+
+class SearchResult:
+    """探索の結果と統計"""
+
+    def __init__(self, city_id: Optional[int], rollouts: int, elapsed_ms: float):
+        self.city_id = city_id  # 選んだ移動先（移動できなければNone）
+        self.rollouts = rollouts
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def rollouts_per_second(self) -> float:
+        if self.elapsed_ms <= 0:
+            return 0.0
+        return self.rollouts / (self.elapsed_ms / 1000)
+
+
+class _Node:
+    """探索木のノード（対象の敵がcity_idに移動した後の手番）"""
+
+    __slots__ = ("city_id", "visits", "value", "children", "untried")
+
+    def __init__(self, city_id: int, moves: Tuple[int, ...]):
+        self.city_id = city_id
+        self.visits = 0
+        self.value = 0.0
+        self.children: List["_Node"] = []
+        self.untried = list(moves)
+
+    def select_child(self) -> "_Node":
+        """UCB1で子ノードを選択"""
+        log_visits = math.log(self.visits)
+        return max(
+            self.children,
+            key=lambda child: child.value / child.visits
+            + EXPLORATION * math.sqrt(log_visits / child.visits),
+        )
+
+
+class TacticalSearch:
+    """1体の敵の移動先をMCTSで決める
+
+    プレイアウトではキャラクターを(都市ID, life)の平たいリストで表し、
+    コピーはリストのスライスだけで済ませる（攻撃力・イニシアチブは共有）
+    """
+
+    def __init__(
+        self,
+        game_state: GameState,
+        enemy: Enemy,
+        rng: random.Random,
+        horizon: int = TACTICAL_HORIZON_TURNS,
+    ):
+        self.game_state = game_state
+        self.rng = rng
+        self.horizon = horizon
+        self._adjacency: Dict[int, Tuple[int, ...]] = {}
+
+        players = [p for p in game_state.players if p.current_city_id is not None]
+        enemies = [e for e in game_state.enemies if e.current_city_id is not None]
+        self.self_index = enemies.index(enemy)
+        self.player_cities = [p.current_city_id for p in players]
+        self.player_lives = [p.life for p in players]
+        self.player_stats = [(p.attack, p.initiative) for p in players]
+        self.enemy_cities = [e.current_city_id for e in enemies]
+        self.enemy_lives = [e.life for e in enemies]
+        self.enemy_stats = [(e.attack, e.initiative) for e in enemies]
+        self.total_life = max(1, sum(self.player_lives) + sum(self.enemy_lives))
+
+    def neighbors(self, city_id: int) -> Tuple[int, ...]:
+        moves = self._adjacency.get(city_id)
+        if moves is None:
+            moves = tuple(self.game_state.get_connected_city_ids(city_id))
+            self._adjacency[city_id] = moves
+        return moves
+
+    def search(
+        self,
+        budget_ms: Optional[float] = None,
+        max_rollouts: Optional[int] = TACTICAL_MAX_ROLLOUTS,
+    ) -> SearchResult:
+        """プレイアウト回数（または時間）の上限まで探索して移動先を選ぶ
+
+        両方を指定した場合は先に達した方で止める。時間の上限を使うと結果が
+        実行環境に依存するため、ゲーム中は回数の上限だけを使うこと
+        """
+        if budget_ms is None and max_rollouts is None:
+            raise ValueError("budget_ms or max_rollouts is required")
+        start = time.perf_counter()
+        start_city = self.enemy_cities[self.self_index]
+        root = _Node(start_city, self.neighbors(start_city))
+        if not root.untried:
+            return SearchResult(None, 0, 0.0)
+
+        deadline = None if budget_ms is None else start + budget_ms / 1000
+        rollouts = 0
+        while max_rollouts is None or rollouts < max_rollouts:
+            self._iterate(root)
+            rollouts += 1
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        best = max(root.children, key=lambda child: child.visits)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return SearchResult(best.city_id, rollouts, elapsed_ms)
+
+    def _iterate(self, root: _Node):
+        """選択・展開・プレイアウト・逆伝播を1回行う"""
+        rng = self.rng
+        player_cities = self.player_cities[:]
+        player_lives = self.player_lives[:]
+        enemy_cities = self.enemy_cities[:]
+        enemy_lives = self.enemy_lives[:]
+        state = (player_cities, player_lives, enemy_cities, enemy_lives)
+
+        path = [root]
+        node = root
+        in_tree = True
+        for _ in range(self.horizon):
+            # 自分の手番: 木の中では選択・展開、木の外ではランダムに移動
+            if enemy_lives[self.self_index] > 0:
+                city_id = enemy_cities[self.self_index]
+                if in_tree and (node.untried or node.children):
+                    if node.untried:
+                        target = node.untried.pop(rng.randrange(len(node.untried)))
+                        child = _Node(target, self.neighbors(target))
+                        node.children.append(child)
+                        node = child
+                        in_tree = False
+                    else:
+                        node = node.select_child()
+                    path.append(node)
+                    target = node.city_id
+                else:
+                    in_tree = False
+                    moves = self.neighbors(city_id)
+                    target = rng.choice(moves) if moves else city_id
+                enemy_cities[self.self_index] = target
+                self._battle(state, target)
+
+            # プレイヤーの手番: ランダムに1体をランダムな隣接都市へ移動
+            alive = [i for i, life in enumerate(player_lives) if life > 0]
+            if not alive:
+                break
+            mover = rng.choice(alive)
+            moves = self.neighbors(player_cities[mover])
+            if moves:
+                player_cities[mover] = rng.choice(moves)
+                self._battle(state, player_cities[mover])
+
+        reward = self._evaluate(player_lives, enemy_lives)
+        for visited in path:
+            visited.visits += 1
+            visited.value += reward
+
+    def _battle(self, state, city_id: int):
+        """city_idに両陣営がいれば戦闘を解決"""
+        player_cities, player_lives, enemy_cities, enemy_lives = state
+        players = [
+            i
+            for i, city in enumerate(player_cities)
+            if city == city_id and player_lives[i] > 0
+        ]
+        if not players:
+            return
+        enemies = [
+            i
+            for i, city in enumerate(enemy_cities)
+            if city == city_id and enemy_lives[i] > 0
+        ]
+        if not enemies:
+            return
+        new_player_lives, new_enemy_lives = simulate_battle(
+            [(player_lives[i],) + self.player_stats[i] for i in players],
+            [(enemy_lives[i],) + self.enemy_stats[i] for i in enemies],
+        )
+        for i, life in zip(players, new_player_lives):
+            player_lives[i] = life
+        for i, life in zip(enemies, new_enemy_lives):
+            enemy_lives[i] = life
+
+    def _evaluate(self, player_lives: List[int], enemy_lives: List[int]) -> float:
+        """敵側から見た評価値（0〜1、与えた損害と受けた損害の差）"""
+        dealt = sum(self.player_lives) - sum(player_lives)
+        taken = sum(self.enemy_lives) - sum(enemy_lives)
+        reward = 0.5 + (dealt - taken) / (2 * self.total_life)
+        if enemy_lives[self.self_index] <= 0:
+            reward *= 0.5  # 自分が倒される展開は避ける
+        return reward
+
+
+def decide_tactical_move(
+    game_state: GameState,
+    enemy: Enemy,
+    budget_ms: Optional[float] = None,
+    max_rollouts: Optional[int] = TACTICAL_MAX_ROLLOUTS,
+) -> SearchResult:
+    """MCTSで"tactical"タイプの敵の移動先を決める（既定はプレイアウト回数の上限のみ）"""
+    # 探索用の乱数はAIの乱数から1回だけ引いて作る（消費量を探索量に依存させない）
+    rng = random.Random(game_state.ai_rng.getrandbits(64))
+    return TacticalSearch(game_state, enemy, rng).search(budget_ms, max_rollouts)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure rollouts per second of the tactical AI"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        nargs="+",
+        default=[5, 30, 100],
+        help="Search budgets in milliseconds",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Game seed")
+    parser.add_argument(
+        "--discoveries", type=int, default=20, help="Cities to discover first"
+    )
+    args = parser.parse_args()
+
+    game_state = GameState(args.seed)
+    game_state.autosave_enabled = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_state.initialize_default_state()
+        for _ in range(args.discoveries):
+            discovery_plan = game_state.plan_new_city()
+            if discovery_plan:
+                game_state.apply_city_discovery(discovery_plan)
+    enemy = game_state.enemies[0]
+    print(
+        f"{len(game_state.cities)} cities, {len(game_state.players)} players, "
+        f"{len(game_state.enemies)} enemies"
+    )
+
+    print(f"{'budget ms':>10} {'rollouts':>9} {'rollouts/s':>11} {'move':>5}")
+    for budget_ms in args.budget:
+        result = decide_tactical_move(game_state, enemy, budget_ms, max_rollouts=None)
+        print(
+            f"{budget_ms:>10.1f} {result.rollouts:>9} "
+            f"{result.rollouts_per_second:>11.0f} {result.city_id!s:>5}"
+        )
+
+
+if __name__ == "__main__":
+    main()
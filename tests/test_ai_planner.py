@@ -0,0 +1,146 @@
+import contextlib
+import io
+import os
+import sys
+import threading
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import enemy_ai  # noqa: E402
+from ai_planner import AIPlanner  # noqa: E402
+from game_state import GameState  # noqa: E402
+
+
+def create_enemy_turn_state(seed: int) -> GameState:
+    """敵ターン開始時点のゲーム状態を作成"""
+    game_state = GameState(seed)
+    game_state.autosave_enabled = False
+    with contextlib.redirect_stdout(io.StringIO()):
+        game_state.initialize_default_state()
+    game_state.current_turn = "enemy"
+    return game_state
+
+
+class TestAIPlanner(unittest.TestCase):
+    """敵AIプランナーのテスト"""
+
+    def setUp(self):
+        self.game_state = create_enemy_turn_state(11)
+        self.planner = AIPlanner(self.game_state)
+        self.addCleanup(self.planner.close)
+
+    def expected_plan(self):
+        """同じ状態から同期的に決定した場合の結果"""
+        reference = create_enemy_turn_state(11)
+        plan = enemy_ai.decide_enemy_turn(reference)
+        return [
+            (reference.enemies.index(enemy), city.id if city else None)
+            for enemy, city in plan
+        ]
+
+    def indexed(self, plan):
+        return [
+            (self.game_state.enemies.index(enemy), city.id if city else None)
+            for enemy, city in plan
+        ]
+
+    def test_background_result_matches_synchronous(self):
+        """ワーカーの結果が同期実行と同じになるテスト"""
+        self.planner.start()
+        plan = self.planner.result(budget_ms=5000)
+
+        self.assertEqual(self.indexed(plan), self.expected_plan())
+        self.assertEqual(self.planner.background_plans, 1)
+        self.assertFalse(self.planner.is_pending)
+
+    def test_worker_plans_on_snapshot(self):
+        """ワーカーはスナップショットで計算し、結果を受け取るまで乱数を進めないテスト"""
+        called = threading.Event()
+        release = threading.Event()
+        planned_states = []
+        original = enemy_ai.decide_enemy_turn
+
+        def blocking_decide(game_state):
+            planned_states.append(game_state)
+            plan = original(game_state)
+            called.set()
+            release.wait(5)
+            return plan
+
+        enemy_ai.decide_enemy_turn = blocking_decide
+        self.addCleanup(setattr, enemy_ai, "decide_enemy_turn", original)
+        rng_state = self.game_state.ai_rng.getstate()
+
+        self.planner.start()
+        self.assertTrue(called.wait(5))
+        self.assertIsNot(planned_states[0], self.game_state)
+        self.assertEqual(self.game_state.ai_rng.getstate(), rng_state)
+
+        release.set()
+        plan = self.planner.result(budget_ms=5000)
+        self.assertEqual(self.indexed(plan), self.expected_plan())
+        self.assertEqual(
+            self.game_state.ai_rng.getstate(),
+            planned_states[0].ai_rng.getstate(),
+        )
+
+    def test_worker_does_not_change_patrol_progress(self):
+        """ワーカーの行動決定が巡回地点を変更しないテスト（移動の指示時に進める）"""
+        enemy = self.game_state.enemies[0]
+        city_id = enemy.current_city_id
+        enemy.ai_type = "patrol"
+        enemy.patrol_city_ids = [city_id] + self.game_state.get_connected_city_ids(
+            city_id
+        )[:2]
+        patrol_indexes = [enemy.patrol_index for enemy in self.game_state.enemies]
+
+        self.planner.start()
+        self.planner.cancel()
+        self.planner.start()
+        self.assertTrue(self.planner.result(budget_ms=5000))
+
+        self.assertEqual(
+            [enemy.patrol_index for enemy in self.game_state.enemies], patrol_indexes
+        )
+
+    def test_pending_result_returns_none_within_budget(self):
+        """計算が予算内に終わらない場合はNoneを返すテスト"""
+        release = threading.Event()
+        original = enemy_ai.decide_enemy_turn
+
+        def slow_decide(game_state):
+            release.wait(5)
+            return original(game_state)
+
+        enemy_ai.decide_enemy_turn = slow_decide
+        self.addCleanup(setattr, enemy_ai, "decide_enemy_turn", original)
+
+        self.planner.start()
+        self.assertIsNone(self.planner.result(budget_ms=1))
+        self.assertTrue(self.planner.is_pending)
+        release.set()
+        plan = self.planner.result(budget_ms=5000)
+        self.assertEqual(self.indexed(plan), self.expected_plan())
+
+    def test_state_change_discards_result(self):
+        """計算中に状態が変わった場合は乱数を戻して計算し直すテスト"""
+        self.planner.start()
+        self.game_state.record_battle(1, [], [])  # 状態変更のイベント
+
+        plan = self.planner.result(budget_ms=5000)
+
+        self.assertEqual(self.planner.background_plans, 0)
+        self.assertEqual(self.planner.replanned, 1)
+        self.assertEqual(self.indexed(plan), self.expected_plan())
+
+    def test_result_without_start_runs_synchronously(self):
+        """開始していない場合はその場で計算するテスト"""
+        plan = self.planner.result()
+        self.assertEqual(self.indexed(plan), self.expected_plan())
+        self.assertEqual(self.planner.replanned, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
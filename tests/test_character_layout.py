@@ -0,0 +1,144 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from character_layout import CharacterLayoutCache  # noqa: E402
+from game_state import GameState  # noqa: E402
+from map_culling import MapCullingIndex  # noqa: E402
+from state_events import InvalidationCounter  # noqa: E402
+
+
+def expected_layout_x(game_state, character):
+    """キャッシュ導入前と同じく全キャラクターを都市ごとに集めて計算した並び位置"""
+    if character.is_moving or not character.current_city_id:
+        return character.x
+    city_characters = [
+        c
+        for c in game_state.players + game_state.enemies
+        if c.current_city_id == character.current_city_id
+    ]
+    if len(city_characters) == 1:
+        return character.x
+    char_index = city_characters.index(character)
+    total_width = len(city_characters) * character.width
+    start_x = -(total_width - character.width) // 2
+    return character.x + start_x + char_index * character.width
+
+
+def expected_rect(game_state, character):
+    layout_x = expected_layout_x(game_state, character)
+    half_width = character.width // 2
+    half_height = character.height // 2
+    return (
+        layout_x - half_width,
+        character.y - half_height,
+        layout_x + half_width,
+        character.y + half_height,
+    )
+
+
+def expected_character_at(game_state, world_x, world_y, team):
+    """キャッシュ導入前と同じく名簿順に矩形を調べて選んだキャラクター"""
+    roster = game_state.players if team == "player" else game_state.enemies
+    for character in roster:
+        min_x, min_y, max_x, max_y = expected_rect(game_state, character)
+        if min_x <= world_x <= max_x and min_y <= world_y <= max_y:
+            return character
+    return None
+
+
+class TestCharacterLayoutCache(unittest.TestCase):
+    """都市内のキャラクターの配置キャッシュのテスト"""
+
+    def setUp(self):
+        """テスト前の準備: 初期状態のGameStateの配置を購読"""
+        self.game_state = GameState(seed=1)
+        self.game_state.autosave_enabled = False
+        self.game_state.initialize_default_state()
+        self.culling = MapCullingIndex(320)
+        for city in self.game_state.cities.values():
+            self.culling.add_city(city)
+        self.invalidation_counter = InvalidationCounter()
+        self.layout = CharacterLayoutCache(self.culling)
+        self.layout.subscribe(self.game_state, self.invalidation_counter)
+        self.player1, self.player2 = self.game_state.players
+        self.enemy = self.game_state.enemies[0]
+
+    def move(self, character, city_id):
+        self.game_state.order_move(character, self.game_state.cities[city_id])
+
+    def assert_matches_full_layout(self):
+        for character in self.game_state.players + self.game_state.enemies:
+            self.assertEqual(
+                self.layout.layout_x(character),
+                expected_layout_x(self.game_state, character),
+            )
+            self.assertEqual(
+                self.layout.rect(character), expected_rect(self.game_state, character)
+            )
+
+    def assert_picks_same_characters(self):
+        # 各キャラクターの中心と四隅（隣と重なる境界を含む）で選択を比べる
+        for character in self.game_state.players + self.game_state.enemies:
+            min_x, min_y, max_x, max_y = expected_rect(self.game_state, character)
+            points = [((min_x + max_x) / 2, (min_y + max_y) / 2)]
+            points += [(x, y) for x in (min_x, max_x) for y in (min_y, max_y)]
+            for point in points:
+                for team in ("player", "enemy"):
+                    self.assertIs(
+                        self.layout.character_at(*point, team),
+                        expected_character_at(self.game_state, *point, team),
+                    )
+
+    def test_initial_layout(self):
+        """初期配置がキャッシュ導入前の計算と一致するテスト"""
+        self.assert_matches_full_layout()
+        self.assert_picks_same_characters()
+
+    def test_arrive_depart_and_defeat(self):
+        """到着・出発・撃破の後も配置と選択が一致するテスト"""
+        # 到着: Centralに2人並ぶ
+        self.move(self.player2, 1)
+        self.game_state.complete_move(self.player2)
+        self.assertNotEqual(
+            self.layout.layout_x(self.player1), self.layout.layout_x(self.player2)
+        )
+        self.assert_matches_full_layout()
+        self.assert_picks_same_characters()
+
+        # 出発: 移動中もCentralの並びに数えたまま
+        self.move(self.player1, 3)
+        self.assert_matches_full_layout()
+        self.assert_picks_same_characters()
+
+        # 到着: Eastに敵と並ぶ
+        self.game_state.complete_move(self.player1)
+        self.assert_matches_full_layout()
+        self.assert_picks_same_characters()
+
+        # 撃破: Eastにはプレイヤーだけが残る
+        self.enemy.life = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.game_state.remove_defeated_characters()
+        self.assertNotIn(self.enemy.id, self.layout.get_layouts())
+        self.assert_matches_full_layout()
+        self.assert_picks_same_characters()
+
+    def test_only_notified_cities_are_rebuilt(self):
+        """通知された都市だけが無効化されるテスト"""
+        self.layout.get_layouts()
+        self.invalidation_counter.total = 0
+
+        self.move(self.player2, 1)
+        self.assertEqual(self.invalidation_counter.total, 0)  # 出発では変わらない
+        self.game_state.complete_move(self.player2)
+        self.assertEqual(self.invalidation_counter.total, 2)  # 出発元と到着先
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import gc
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from character_store import CharacterStore  # noqa: E402
+from game_state import City, Enemy, GameState, Player  # noqa: E402
+
+
+class TestCharacterStore(unittest.TestCase):
+    """CharacterStoreとキャラクタービューのテスト"""
+
+    def setUp(self):
+        self.store = CharacterStore()
+
+    def test_fields_are_stored_in_arrays(self):
+        """キャラクターの値がストアの配列に格納されるテスト"""
+        player = Player(50, 60, current_city_id=3)
+        enemy = Enemy(70, 80, ai_type="patrol", store=self.store)
+        enemy.life = 40
+        enemy.target_x = 12.5
+
+        self.assertEqual(player.x, 50.0)
+        self.assertEqual(player.current_city_id, 3)
+        self.assertEqual(self.store.arrays["life"][enemy._slot], 40)
+        self.assertEqual(self.store.arrays["target_x"][enemy._slot], 12.5)
+        self.assertIsNone(enemy.target_y)
+        self.assertIsNone(enemy.current_city_id)
+        self.assertIs(enemy.is_moving, False)
+        self.assertIs(enemy.facing_right, True)
+
+    def test_to_dict_output_unchanged(self):
+        """整数値の座標はto_dictで従来通り整数として出力されるテスト"""
+        player = Player(50, 60, current_city_id=3, store=self.store)
+        data = player.to_dict()
+        self.assertEqual(repr(data["x"]), "50")
+        self.assertEqual(repr(data["speed"]), "2")
+        self.assertIsNone(data["target_x"])
+        self.assertIsNone(data["target_city_id"])
+
+        player.x = 50.25
+        self.assertEqual(player.to_dict()["x"], 50.25)
+
+        restored = Player.from_dict(data)
+        self.assertEqual(restored.to_dict(), data)
+
+    def test_released_slots_are_reused(self):
+        """破棄されたキャラクターのスロットが再利用されるテスト"""
+        enemy = Enemy(0, 0, store=self.store)
+        slot = enemy._slot
+        del enemy
+        gc.collect()
+        self.assertEqual(len(self.store), 0)
+
+        enemy = Enemy(0, 0, store=self.store)
+        self.assertEqual(enemy._slot, slot)
+        self.assertEqual(len(self.store), 1)
+
+    def test_advance_moves_all_characters(self):
+        """advance_movementが移動中の全キャラクターをまとめて進めるテスト"""
+        game_state = GameState()
+        game_state.cities = {
+            1: City(1, "A", 0, 0),
+            2: City(2, "B", 100, 0),
+            3: City(3, "C", 0, 2),
+        }
+        far = Player(0, 0, current_city_id=1, store=self.store)
+        near = Player(0, 0, current_city_id=1, store=self.store)
+        idle = Player(0, 0, current_city_id=1, store=self.store)
+        game_state.players = [far, near, idle]
+        game_state.order_move(far, game_state.cities[2])
+        game_state.order_move(near, game_state.cities[3])
+
+        arrived = game_state.advance_movement(game_state.players)
+
+        self.assertEqual(arrived, [near])
+        self.assertEqual(near.current_city_id, 3)
+        self.assertFalse(near.is_moving)
+        self.assertEqual((far.x, far.y), (2.0, 0.0))
+        self.assertTrue(far.is_moving)
+        self.assertTrue(far.facing_right)
+        self.assertEqual((idle.x, idle.y), (0.0, 0.0))
+
+        for _ in range(49):
+            arrived = game_state.advance_movement(game_state.players)
+        self.assertEqual(arrived, [far])
+        self.assertEqual(far.current_city_id, 2)
+        self.assertEqual(game_state.get_characters_in_city(2)[0], [far])
+
+
+if __name__ == "__main__":
+    unittest.main()
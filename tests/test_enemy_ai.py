@@ -0,0 +1,113 @@
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import enemy_ai  # noqa: E402
+from game_state import City, Enemy, GameState, Player, Road  # noqa: E402
+
+
+def create_line_state(city_count: int) -> GameState:
+    """都市1からcity_countまでが一直線に道路で繋がったゲーム状態を作成"""
+    game_state = GameState(seed=1)
+    game_state.cities = {
+        city_id: City(city_id, f"City{city_id}", city_id * 50, 100)
+        for city_id in range(1, city_count + 1)
+    }
+    game_state.roads = [Road(city_id, city_id + 1) for city_id in range(1, city_count)]
+    return game_state
+
+
+class TestPlayerDistanceField(unittest.TestCase):
+    """プレイヤー距離場のテスト"""
+
+    def test_distances_from_all_players(self):
+        """全プレイヤーを始点にホップ数と次の移動先が求まるテスト"""
+        game_state = create_line_state(7)
+        game_state.players = [Player(0, 0, 1), Player(0, 0, 6)]
+
+        field = enemy_ai.get_player_distance_field(game_state)
+
+        self.assertEqual(
+            [field.distance[city_id] for city_id in range(1, 8)],
+            [0, 1, 2, 2, 1, 0, 1],
+        )
+        self.assertEqual(field.next_hop[3], 2)
+        self.assertEqual(field.next_hop[4], 5)
+        self.assertIsNone(field.next_hop[6])
+
+    def test_field_is_rebuilt_only_when_inputs_change(self):
+        """道路やプレイヤーの位置が変わった場合のみ再構築されるテスト"""
+        game_state = create_line_state(4)
+        player = Player(0, 0, 1)
+        game_state.players = [player]
+
+        field = enemy_ai.get_player_distance_field(game_state)
+        self.assertIs(enemy_ai.get_player_distance_field(game_state), field)
+
+        player.current_city_id = 4
+        moved = enemy_ai.get_player_distance_field(game_state)
+        self.assertIsNot(moved, field)
+        self.assertEqual(moved.distance[1], 3)
+
+        game_state.cities[5] = City(5, "City5", 100, 150)
+        game_state.add_road(Road(1, 5))
+        self.assertEqual(enemy_ai.get_player_distance_field(game_state).distance[5], 4)
+
+    def test_aggressive_and_defensive_decisions(self):
+        """積極的な敵は近づき、防御的な敵は遠ざかるテスト"""
+        game_state = create_line_state(5)
+        game_state.players = [Player(0, 0, 1)]
+        aggressive = Enemy(0, 0, 3, "aggressive")
+        defensive = Enemy(0, 0, 3, "defensive")
+        game_state.enemies = [aggressive, defensive]
+
+        self.assertEqual(enemy_ai.decide_enemy_action(game_state, aggressive).id, 2)
+        self.assertEqual(enemy_ai.decide_enemy_action(game_state, defensive).id, 4)
+
+    def test_patrol_index_advances_on_move_order(self):
+        """巡回地点は行動決定では進まず、移動の指示で進むテスト"""
+        game_state = create_line_state(3)
+        game_state.autosave_enabled = False
+        patrol = Enemy(0, 0, 1, "patrol")
+        patrol.patrol_city_ids = [1, 2, 3]
+        game_state.enemies = [patrol]
+
+        target_city = enemy_ai.decide_enemy_action(game_state, patrol)
+        self.assertEqual(target_city.id, 2)
+        self.assertEqual(patrol.patrol_index, 0)
+
+        game_state.order_move(patrol, target_city)
+        self.assertEqual(game_state.enemies[0].patrol_index, 1)
+
+
+class TestPlanEnemyTurn(unittest.TestCase):
+    """敵ターンの一括計画のテスト"""
+
+    def test_all_idle_enemies_get_connected_moves(self):
+        """移動していない全ての敵に接続された移動先が決まるテスト"""
+        game_state = create_line_state(6)
+        game_state.players = [Player(0, 0, 1)]
+        moving = Enemy(0, 0, 6, "random")
+        moving.is_moving = True
+        game_state.enemies = [
+            Enemy(0, 0, 3, "aggressive"),
+            Enemy(0, 0, 4, "defensive"),
+            Enemy(0, 0, 5, "random"),
+            moving,
+        ]
+
+        moves = enemy_ai.plan_enemy_turn(game_state)
+
+        self.assertEqual([enemy for enemy, _ in moves], game_state.enemies[:3])
+        self.assertEqual([city.id for _, city in moves[:2]], [2, 5])
+        for enemy, city in moves:
+            self.assertTrue(
+                game_state.are_cities_connected(enemy.current_city_id, city.id)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
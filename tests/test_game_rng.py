@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_rng import GameRandom  # noqa: E402
+
+
+class TestGameRandom(unittest.TestCase):
+    """GameRandomのテスト"""
+
+    def test_same_seed_same_sequence(self):
+        """同じシードから同じ乱数列が得られるテスト"""
+        a = GameRandom(42)
+        b = GameRandom(42)
+        self.assertEqual(
+            [a.random() for _ in range(10)], [b.random() for _ in range(10)]
+        )
+        self.assertEqual(a.choice(range(100)), b.choice(range(100)))
+        self.assertNotEqual(GameRandom(1).random(), GameRandom(2).random())
+
+    def test_split_is_deterministic_and_independent(self):
+        """子ストリームが決定的で、親の消費に影響されないテスト"""
+        parent = GameRandom(7)
+        child = parent.split("ai")
+        parent.random()  # 親を進めても子の生成には影響しない
+        same_child = parent.split("ai")
+        other_child = parent.split("naming")
+
+        self.assertEqual(child.getrandbits(64), same_child.getrandbits(64))
+        self.assertNotEqual(child.getrandbits(64), other_child.getrandbits(64))
+
+    def test_state_round_trip(self):
+        """状態の保存と復元のテスト"""
+        rng = GameRandom(3)
+        rng.random()
+        state = rng.getstate()
+        expected = [rng.randint(0, 1000) for _ in range(5)]
+
+        restored = GameRandom(0)
+        restored.setstate(state)
+        self.assertEqual([restored.randint(0, 1000) for _ in range(5)], expected)
+
+    def test_random_range(self):
+        """random()が[0, 1)の範囲を返すテスト"""
+        rng = GameRandom(11)
+        values = [rng.random() for _ in range(1000)]
+        self.assertTrue(all(0.0 <= v < 1.0 for v in values))
+
+
+if __name__ == "__main__":
+    unittest.main()
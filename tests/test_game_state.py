@@ -1,3 +1,4 @@
+import json
 import os
 import sys
 import tempfile
@@ -8,12 +9,22 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from game_state import (  # noqa: E402
     CITY_DISCOVERY_INTERVAL,
+    SNAPSHOT_INTERVAL_TURNS,
     City,
     Enemy,
     GameState,
     Player,
     Road,
 )
+from state_events import (  # noqa: E402
+    BATTLE_RESOLVED,
+    CHARACTER_DIED,
+    CHARACTER_MOVED,
+    CITY_DISCOVERED,
+    EVENT_TYPES,
+    ROAD_ADDED,
+    TURN_SWITCHED,
+)
 
 
 class TestCity(unittest.TestCase):
@@ -286,6 +297,82 @@ class TestGameState(unittest.TestCase):
         expected_connections = [2, 3]  # West, East
         self.assertEqual(set(connected_to_central), set(expected_connections))
 
+    def test_adjacency_index_matches_road_scan(self):
+        """隣接インデックスが道路リストの走査結果と一致するテスト"""
+        self.game_state.initialize_default_state()
+        for _ in range(5):
+            self.game_state.discover_new_city()
+
+        def scan_connected(game_state, city_id):
+            connected = []
+            for road in game_state.roads:
+                if road.city1_id == city_id:
+                    connected.append(road.city2_id)
+                elif road.city2_id == city_id:
+                    connected.append(road.city1_id)
+            return connected
+
+        restored = GameState()
+        restored.from_dict(self.game_state.to_dict())
+
+        for game_state in (self.game_state, restored):
+            city_ids = list(game_state.cities.keys())
+            for city_id in city_ids:
+                self.assertEqual(
+                    game_state.get_connected_city_ids(city_id),
+                    scan_connected(game_state, city_id),
+                )
+                for other_id in city_ids:
+                    self.assertEqual(
+                        game_state.are_cities_connected(city_id, other_id),
+                        other_id in scan_connected(game_state, city_id),
+                    )
+
+    def test_placement_index_matches_full_scan(self):
+        """空間インデックスによる配置検証が全走査と一致するテスト"""
+        from geometry_utils import point_too_close_to_line, roads_intersect
+
+        def full_scan_is_valid(game_state, x, y, city1_id, city2_id):
+            new_roads = [
+                ((x, y), (game_state.cities[cid].x, game_state.cities[cid].y))
+                for cid in (city1_id, city2_id)
+            ]
+            for road in game_state.roads:
+                if {road.city1_id, road.city2_id} == {city1_id, city2_id}:
+                    continue
+                c1 = game_state.cities[road.city1_id]
+                c2 = game_state.cities[road.city2_id]
+                for start, end in new_roads:
+                    if roads_intersect(start, end, (c1.x, c1.y), (c2.x, c2.y)):
+                        return False
+                if point_too_close_to_line(x, y, (c1.x, c1.y), (c2.x, c2.y), 20):
+                    return False
+            for city in game_state.cities.values():
+                if city.id not in (city1_id, city2_id):
+                    if (x - city.x) ** 2 + (y - city.y) ** 2 < 25**2:
+                        return False
+            return True
+
+        self.game_state.initialize_default_state()
+        for _ in range(8):
+            self.game_state.discover_new_city()
+
+        for road in list(self.game_state.roads):
+            c1 = self.game_state.cities[road.city1_id]
+            c2 = self.game_state.cities[road.city2_id]
+            for dx in range(-64, 65, 16):
+                for dy in range(-64, 65, 16):
+                    x = (c1.x + c2.x) / 2 + dx
+                    y = (c1.y + c2.y) / 2 + dy
+                    self.assertEqual(
+                        self.game_state.is_valid_city_placement_for_midpoint(
+                            x, y, road.city1_id, road.city2_id
+                        ),
+                        full_scan_is_valid(
+                            self.game_state, x, y, road.city1_id, road.city2_id
+                        ),
+                    )
+
     def test_turn_switching(self):
         """ターン切り替えのテスト"""
         # 初期状態はプレイヤーターン
@@ -541,6 +628,38 @@ class TestGameState(unittest.TestCase):
         battles = self.game_state.check_battles()
         self.assertEqual(len(battles), 1)
 
+    def test_occupancy_index_tracks_moves_and_defeats(self):
+        """都市占有インデックスが到着・追加・撃破に追従するテスト"""
+        self.game_state.initialize_default_state()
+        player1, player2 = self.game_state.players
+        enemy1 = self.game_state.enemies[0]
+
+        # 到着による更新
+        player2.current_city_id = 3
+        self.assertEqual(self.game_state.get_city_occupants(3), ([player2], [enemy1]))
+        self.assertEqual(self.game_state.get_city_occupants(2), ([], []))
+        self.assertEqual(self.game_state.get_occupied_city_ids(), [1, 3])
+
+        # 名簿順が保持されることを確認
+        player1.current_city_id = 3
+        self.assertEqual(self.game_state.get_city_occupants(3)[0], [player1, player2])
+
+        # 名簿への追加
+        enemy2 = Enemy(0, 0, 3, "defensive", 2)
+        self.game_state.enemies.append(enemy2)
+        self.assertEqual(self.game_state.get_city_occupants(3)[1], [enemy1, enemy2])
+
+        battles = self.game_state.check_battles()
+        self.assertEqual(len(battles), 1)
+        self.assertEqual(battles[0]["players"], [player1, player2])
+
+        # 撃破による削除
+        enemy1.life = 0
+        self.game_state.remove_defeated_characters()
+        self.assertEqual(self.game_state.get_city_occupants(3)[1], [enemy2])
+        enemy1.current_city_id = 1  # 名簿外のキャラクターは影響しない
+        self.assertEqual(self.game_state.get_city_occupants(1), ([], []))
+
     def test_character_defeat(self):
         """キャラクター撃破のテスト"""
         self.game_state.initialize_default_state()
@@ -612,6 +731,81 @@ class TestGameState(unittest.TestCase):
         success = self.game_state.load_from_file()
         self.assertFalse(success)
 
+    def test_auto_save_journal_replay(self):
+        """自動セーブのジャーナル追記と再生のテスト"""
+        self.game_state.initialize_default_state()
+        self.game_state.auto_save()  # 初回はスナップショット
+
+        # 移動・到着・ターン切り替えをジャーナルに記録
+        player = self.game_state.players[0]
+        city_id = self.game_state.get_connected_city_ids(player.current_city_id)[0]
+        self.game_state.order_move(player, self.game_state.cities[city_id])
+        self.game_state.auto_save()
+        self.game_state.complete_move(player)
+        self.game_state.switch_turn()
+        self.game_state.auto_save()
+        self.game_state.discover_new_city()
+
+        with open(self.game_state.save_file_path, encoding="utf-8") as f:
+            self.assertGreater(len(f.read().splitlines()), 1)
+
+        new_game_state = GameState()
+        new_game_state.save_file_path = self.game_state.save_file_path
+        self.assertTrue(new_game_state.load_from_file())
+        self.assertEqual(new_game_state.to_dict(), self.game_state.to_dict())
+        self.assertEqual(new_game_state.players[0].current_city_id, city_id)
+
+    def test_auto_save_compaction(self):
+        """一定ターンごとにジャーナルがスナップショットに圧縮されるテスト"""
+        self.game_state.initialize_default_state()
+        self.game_state.auto_save()
+        for _ in range(SNAPSHOT_INTERVAL_TURNS):
+            self.game_state.switch_turn()
+            self.game_state.switch_turn()
+            self.game_state.auto_save()
+
+        # 圧縮直後はスナップショット1行のみ
+        with open(self.game_state.save_file_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+
+        new_game_state = GameState()
+        new_game_state.save_file_path = self.game_state.save_file_path
+        self.assertTrue(new_game_state.load_from_file())
+        self.assertEqual(new_game_state.to_dict(), self.game_state.to_dict())
+
+    def test_seeded_games_are_reproducible(self):
+        """同じシードで同じ都市発見が行われ、ロード後も乱数列が続くテスト"""
+        game_a = GameState(seed=123)
+        game_b = GameState(seed=123)
+        for game in (game_a, game_b):
+            game.save_file_path = self.game_state.save_file_path
+            game.initialize_default_state()
+            game.auto_save()
+            game.discover_new_city()
+        self.assertEqual(game_a.to_dict(), game_b.to_dict())
+
+        # ジャーナルから復元した状態でも同じ発見が続く
+        restored = GameState()
+        restored.save_file_path = game_b.save_file_path
+        self.assertTrue(restored.load_from_file())
+        restored.autosave_enabled = False
+        game_a.autosave_enabled = False
+        game_a.discover_new_city()
+        restored.discover_new_city()
+        self.assertEqual(restored.to_dict(), game_a.to_dict())
+
+    def test_load_legacy_save_file(self):
+        """旧形式（インデント付きJSON）のセーブファイル読み込みテスト"""
+        self.game_state.initialize_default_state()
+        self.game_state.turn_counter = 7
+        with open(self.game_state.save_file_path, "w", encoding="utf-8") as f:
+            json.dump(self.game_state.to_dict(), f, indent=2, ensure_ascii=False)
+
+        new_game_state = GameState()
+        new_game_state.save_file_path = self.game_state.save_file_path
+        self.assertTrue(new_game_state.load_from_file())
+        self.assertEqual(new_game_state.turn_counter, 7)
+
 
 class TestCoordinateTransformation(unittest.TestCase):
     """座標変換システムのテスト"""
@@ -815,10 +1009,23 @@ class TestEnemyGeneration(unittest.TestCase):
         self.assertGreaterEqual(len(ai_types_found), 2)
 
         # 有効なAIタイプのみが生成されることを確認
-        valid_ai_types = {"random", "aggressive", "patrol", "defensive"}
+        valid_ai_types = {"random", "aggressive", "patrol", "defensive", "tactical"}
         for ai_type in ai_types_found:
             self.assertIn(ai_type, valid_ai_types)
 
+    def test_tactical_enemy_spawns(self):
+        """都市発見で"tactical"タイプの敵も生成されることをテスト"""
+        ai_types_found = set()
+        for seed in range(100):
+            game_state = GameState(seed=seed)
+            game_state.autosave_enabled = False
+            game_state.initialize_default_state()
+            discovery_info = game_state.discover_new_city()
+            if discovery_info and discovery_info["new_enemy"]:
+                ai_types_found.add(discovery_info["new_enemy"].ai_type)
+
+        self.assertIn("tactical", ai_types_found)
+
     def test_enemy_image_index_rotation(self):
         """敵の画像インデックスがローテーションされることをテスト"""
         # 複数の都市を発見して画像インデックスの変化を確認
@@ -860,6 +1067,255 @@ class TestEnemyGeneration(unittest.TestCase):
                 break
 
 
+class TestCharacterRegistry(unittest.TestCase):
+    """キャラクターIDと登録簿のテスト"""
+
+    def setUp(self):
+        self.game_state = GameState(seed=3)
+        self.game_state.autosave_enabled = False
+        self.game_state.initialize_default_state()
+
+    def test_ids_are_assigned_and_looked_up(self):
+        """登録時に一意なIDが採番され、IDで陣営とキャラクターを引けるテスト"""
+        characters = self.game_state.players + self.game_state.enemies
+
+        self.assertEqual([c.id for c in characters], [1, 2, 3])
+        for character in characters:
+            self.assertIs(self.game_state.get_character(character.id), character)
+        self.assertEqual(self.game_state.get_team(1), "player")
+        self.assertEqual(self.game_state.get_team(3), "enemy")
+        self.assertIsNone(self.game_state.get_team(99))
+
+    def test_ids_are_not_reused_after_defeat(self):
+        """倒されたキャラクターは登録簿から外れ、IDは再利用されないテスト"""
+        enemy = self.game_state.enemies[0]
+        enemy.life = 0
+        self.game_state.remove_defeated_characters()
+
+        self.assertIsNone(self.game_state.get_character(enemy.id))
+        self.game_state.enemies.append(Enemy(0, 0, 3))
+        self.assertEqual(self.game_state.enemies[0].id, 4)
+
+    def test_ids_survive_save_and_load(self):
+        """IDと次に採番するIDがセーブデータから復元されるテスト"""
+        self.game_state.enemies[0].life = 0
+        self.game_state.remove_defeated_characters()
+        data = json.loads(json.dumps(self.game_state.to_dict()))
+
+        restored = GameState()
+        restored.from_dict(data)
+
+        self.assertEqual([p.id for p in restored.players], [1, 2])
+        self.assertEqual(restored.next_character_id, 4)
+
+    def test_old_save_without_ids(self):
+        """IDを含まない古いセーブデータでは名簿順に採番されるテスト"""
+        data = self.game_state.to_dict()
+        del data["next_character_id"]
+        for character_data in data["players"] + data["enemies"]:
+            del character_data["id"]
+
+        restored = GameState()
+        restored.from_dict(data)
+
+        self.assertEqual([c.id for c in restored.players + restored.enemies], [1, 2, 3])
+
+    def test_journal_refers_to_characters_by_id(self):
+        """ジャーナルがIDでキャラクターを参照し、旧形式の参照も解決できるテスト"""
+        events = []
+        self.game_state.event_listeners.append(events.append)
+        enemy = self.game_state.enemies[0]
+
+        self.game_state.order_move(enemy, self.game_state.cities[1])
+
+        self.assertEqual(events[-1]["c"], enemy.id)
+        self.assertIs(self.game_state._resolve_character_ref(["e", 0]), enemy)
+
+
+class TestGameStateSnapshot(unittest.TestCase):
+    """コピーオンライトのスナップショットのテスト"""
+
+    def setUp(self):
+        self.game_state = GameState(seed=3)
+        self.game_state.autosave_enabled = False
+        self.game_state.initialize_default_state()
+
+    def test_unchanged_state_is_shared(self):
+        """変更していない都市・道路・キャラクターは元の状態と共有されるテスト"""
+        snapshot = self.game_state.snapshot()
+
+        self.assertIs(snapshot.cities, self.game_state.cities)
+        self.assertIs(snapshot.roads, self.game_state.roads)
+        self.assertIs(snapshot.players[0], self.game_state.players[0])
+        self.assertIsNot(snapshot.players, self.game_state.players)
+        self.assertEqual(snapshot.to_dict(), self.game_state.to_dict())
+
+    def test_snapshot_move_copies_only_moved_character(self):
+        """スナップショットでの移動は移動したキャラクターだけを複製するテスト"""
+        original = self.game_state.players[0]
+        snapshot = self.game_state.snapshot()
+
+        snapshot.order_move(snapshot.players[0], snapshot.cities[3])
+        snapshot.complete_move(snapshot.players[0])
+
+        self.assertEqual(original.current_city_id, 1)
+        self.assertEqual(snapshot.players[0].current_city_id, 3)
+        self.assertIsNot(snapshot.players[0], original)
+        self.assertIs(snapshot.players[1], self.game_state.players[1])
+        self.assertEqual(len(self.game_state.get_characters_in_city(3)[0]), 0)
+        self.assertEqual(len(snapshot.get_characters_in_city(3)[0]), 1)
+        self.assertIs(snapshot.get_characters_in_city(3)[0][0], snapshot.players[0])
+        self.assertFalse(self.game_state.player_moved_this_turn)
+
+    def test_original_changes_do_not_leak_into_snapshot(self):
+        """スナップショット作成後の元の状態の変更がスナップショットに影響しないテスト"""
+        snapshot = self.game_state.snapshot()
+        nested = snapshot.snapshot()
+        player = self.game_state.players[0]
+
+        self.game_state.order_move(player, self.game_state.cities[2])
+        self.game_state.complete_move(player)
+
+        for state in (snapshot, nested):
+            self.assertEqual(state.players[0].current_city_id, 1)
+            self.assertEqual(
+                [p.current_city_id for p in state.get_characters_in_city(1)[0]], [1]
+            )
+        self.assertEqual(player.current_city_id, 2)
+        self.assertIs(self.game_state.players[0], player)
+
+    def test_snapshot_battle_and_discovery_are_isolated(self):
+        """スナップショットでの戦闘と都市発見が元の状態を変更しないテスト"""
+        expected = self.game_state.to_dict()
+        snapshot = self.game_state.snapshot()
+
+        enemy = snapshot.enemies[0]
+        snapshot.order_move(enemy, snapshot.cities[1])
+        snapshot.complete_move(enemy)
+        for battle in snapshot.check_battles():
+            for character in battle["players"]:
+                character.life = 0
+        snapshot.remove_defeated_characters()
+        snapshot.apply_city_discovery(snapshot.plan_new_city())
+
+        self.assertEqual(len(snapshot.players), 1)
+        self.assertEqual(len(snapshot.cities), 4)
+        self.assertEqual(self.game_state.to_dict(), expected)
+        self.assertEqual(len(self.game_state.get_connected_city_ids(1)), 2)
+
+    def test_snapshot_random_streams_are_independent(self):
+        """スナップショットの乱数が元の状態と同じ列を独立に生成するテスト"""
+        snapshot = self.game_state.snapshot()
+
+        values = [snapshot.ai_rng.random() for _ in range(3)]
+
+        self.assertEqual(values, [self.game_state.ai_rng.random() for _ in range(3)])
+
+    def test_duplicate_id_does_not_rewrite_shared_character(self):
+        """登録済みのIDのキャラクターを追加してもIDを書き換えずにエラーにするテスト"""
+        snapshot = self.game_state.snapshot()
+        player = self.game_state.players[0]
+        player_id = player.id
+
+        with self.assertRaises(ValueError):
+            snapshot.players.append(player)
+
+        self.assertEqual(player.id, player_id)
+        self.assertIs(self.game_state.get_character(player_id), player)
+
+
+class TestStateEvents(unittest.TestCase):
+    """状態変更イベントの通知のテスト"""
+
+    def setUp(self):
+        self.game_state = GameState(seed=3)
+        self.game_state.autosave_enabled = False
+        self.game_state.initialize_default_state()
+        self.received = []
+        for event_type in EVENT_TYPES:
+            self.game_state.events.subscribe(event_type, self.received.append)
+
+    def received_types(self):
+        return [event.type for event in self.received]
+
+    def test_move_publishes_departure_and_arrival(self):
+        """出発と到着でcharacter_movedが通知されるテスト"""
+        player = self.game_state.players[0]
+
+        self.game_state.order_move(player, self.game_state.cities[3])
+        self.game_state.complete_move(player)
+
+        self.assertEqual(self.received_types(), [CHARACTER_MOVED, CHARACTER_MOVED])
+        departure, arrival = self.received
+        self.assertIs(departure.character, player)
+        self.assertEqual((departure.from_city_id, departure.to_city_id), (1, 3))
+        self.assertEqual((arrival.from_city_id, arrival.to_city_id), (1, 3))
+        self.assertFalse(arrival.character.is_moving)
+
+    def test_turn_battle_and_defeat_events(self):
+        """ターン切り替え・戦闘結果・撃破が通知されるテスト"""
+        enemy = self.game_state.enemies[0]
+
+        self.game_state.switch_turn()
+        self.game_state.record_battle(1, [], [enemy])
+        enemy.life = 0
+        self.game_state.remove_defeated_characters()
+
+        self.assertEqual(
+            self.received_types(), [TURN_SWITCHED, BATTLE_RESOLVED, CHARACTER_DIED]
+        )
+        turn, battle, died = self.received
+        self.assertEqual((turn.turn, turn.turn_counter), ("enemy", 1))
+        self.assertEqual(battle.characters, [enemy])
+        self.assertIs(died.character, enemy)
+        self.assertEqual(died.city_id, enemy.current_city_id)
+
+    def test_discovery_publishes_roads_enemy_and_city(self):
+        """都市発見で道路・新しい敵・都市の追加が通知されるテスト"""
+        plan = self.game_state.plan_new_city()
+        self.game_state.apply_city_discovery(plan)
+
+        types = self.received_types()
+        self.assertEqual(types.count(ROAD_ADDED), 2)
+        self.assertEqual(types[-1], CITY_DISCOVERED)
+        city = self.received[-1].city
+        self.assertIn(city.id, self.game_state.cities)
+        self.assertEqual(
+            {event.road.city2_id for event in self.received[:2]}, {city.id}
+        )
+        if self.received[-1].enemy is not None:
+            self.assertEqual(types[2], CHARACTER_MOVED)
+            self.assertEqual(self.received[2].to_city_id, city.id)
+
+    def test_replayed_events_are_published(self):
+        """ジャーナルの再適用でも同じイベントが通知されるテスト"""
+        replica = GameState(seed=3)
+        replica.from_dict(self.game_state.to_dict())
+        received = []
+        for event_type in EVENT_TYPES:
+            replica.events.subscribe(event_type, received.append)
+        player = self.game_state.players[0]
+        self.game_state.order_move(player, self.game_state.cities[2])
+        self.game_state.complete_move(player)
+        self.game_state.switch_turn()
+
+        for event in self.game_state._journal_pending:
+            replica.apply_event(event)
+
+        self.assertEqual([event.type for event in received], self.received_types())
+
+    def test_unsubscribe_and_snapshot_isolation(self):
+        """購読の解除とスナップショットが購読者を引き継がないテスト"""
+        snapshot = self.game_state.snapshot()
+        snapshot.switch_turn()
+        self.game_state.events.unsubscribe(TURN_SWITCHED, self.received.append)
+        self.game_state.switch_turn()
+
+        self.assertEqual(self.received, [])
+        with self.assertRaises(ValueError):
+            self.game_state.events.subscribe("unknown", self.received.append)
+
+
 if __name__ == "__main__":
     # テストの実行
     unittest.main(verbosity=2)
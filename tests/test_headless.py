@@ -0,0 +1,150 @@
+import contextlib
+import io
+import itertools
+import os
+import sys
+import types
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from battle_rules import (  # noqa: E402
+    initiative_order,
+    resolve_attack,
+    resolve_battle,
+    simulate_battle,
+)
+import tactical_ai  # noqa: E402
+from game_state import Enemy, Player  # noqa: E402
+from headless import HeadlessGame  # noqa: E402
+from simulate import run_batch  # noqa: E402
+
+
+class TestBattleRules(unittest.TestCase):
+    """戦闘ルールのテスト"""
+
+    def test_initiative_order(self):
+        """イニシアチブの高い順に行動するテスト"""
+        player = Player(0, 0, 1, initiative=15)
+        enemy = Enemy(0, 0, 1, "aggressive")  # イニシアチブ12
+        slow_player = Player(0, 0, 1, initiative=5)
+        self.assertEqual(
+            initiative_order([player, slow_player], [enemy]),
+            [player, enemy, slow_player],
+        )
+
+    def test_resolve_battle_targets_lowest_life(self):
+        """残りlifeの最も少ない相手が狙われるテスト"""
+        player = Player(0, 0, 1)
+        weak_enemy = Enemy(0, 0, 1)
+        weak_enemy.life = 10
+        strong_enemy = Enemy(0, 0, 1)
+
+        resolve_battle([player], [weak_enemy, strong_enemy])
+
+        self.assertEqual(weak_enemy.life, 0)
+        self.assertEqual(strong_enemy.life, 80)
+        # 倒された敵は攻撃しない
+        self.assertEqual(player.life, 120 - strong_enemy.attack)
+
+    def test_resolve_attack_uses_given_team(self):
+        """攻撃対象の陣営が渡された陣営で決まるテスト"""
+        player = Player(0, 0, 1)
+        enemy = Enemy(0, 0, 1)
+
+        damage = resolve_attack(player, "player", [player], [enemy])
+
+        self.assertEqual(damage, player.attack)
+        self.assertEqual(enemy.life, 80 - player.attack)
+        self.assertEqual(player.life, 120)
+
+    def test_simulate_battle_matches_resolve_battle(self):
+        """キャラクターを変更しない戦闘解決が同じ結果になるテスト"""
+        players = [Player(0, 0, 1, initiative=15), Player(0, 0, 1, initiative=5)]
+        players[1].life = 30
+        enemies = [Enemy(0, 0, 1, "aggressive"), Enemy(0, 0, 1, "defensive")]
+        player_stats = [(c.life, c.attack, c.initiative) for c in players]
+        enemy_stats = [(c.life, c.attack, c.initiative) for c in enemies]
+
+        player_lives, enemy_lives = simulate_battle(player_stats, enemy_stats)
+        self.assertEqual(players[1].life, 30)  # 元のキャラクターは変更されない
+
+        resolve_battle(players, enemies)
+        self.assertEqual(player_lives, [c.life for c in players])
+        self.assertEqual(enemy_lives, [c.life for c in enemies])
+
+
+class TestHeadlessGame(unittest.TestCase):
+    """ヘッドレスエンジンのテスト"""
+
+    def test_game_runs_to_completion(self):
+        """ゲームが決着または打ち切りまで進むテスト"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = HeadlessGame(max_turns=50)
+            result = game.play()
+
+        self.assertTrue(game.is_finished())
+        self.assertIn(result["winner"], ("player", "enemy", None))
+        self.assertGreaterEqual(result["cities"], 3)
+        self.assertFalse(os.path.exists(game.game_state.save_file_path + ".tmp"))
+
+    def test_all_enemies_move_in_all_mode(self):
+        """敵ターンの"all"モードでは全ての敵が移動するテスト"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = HeadlessGame(seed=7)
+            game_state = game.game_state
+            game_state.enemy_turn_mode = "all"
+            game.step()  # プレイヤーターン
+            for city in list(game_state.cities.values())[:3]:
+                game_state.enemies.append(Enemy(city.x, city.y, city.id, "random"))
+            positions = [enemy.current_city_id for enemy in game_state.enemies]
+            game.play_enemy_turn()
+
+        self.assertTrue(game_state.enemy_moved_this_turn)
+        for enemy, position in zip(game_state.enemies, positions):
+            self.assertNotEqual(enemy.current_city_id, position)
+
+    def test_step_alternates_turns(self):
+        """1ステップごとに手番が交代するテスト"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = HeadlessGame()
+            self.assertEqual(game.game_state.current_turn, "player")
+            game.step()
+            self.assertEqual(game.game_state.current_turn, "enemy")
+            self.assertEqual(game.game_state.turn_counter, 1)
+            game.step()
+            self.assertEqual(game.game_state.turn_counter, 2)
+
+    def play_tactical_game(self, seed: int):
+        """最初の敵を"tactical"にした同じシードのゲームを最後まで進める"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            game = HeadlessGame(max_turns=40, seed=seed)
+            game.game_state.enemy_turn_mode = "all"
+            game.game_state.enemies[0].ai_type = "tactical"
+            result = game.play()
+        return result, game.game_state.to_dict()
+
+    def test_tactical_game_is_reproducible(self):
+        """ "tactical"の敵がいても同じシードなら時計の進み方に関係なく同じ結果になるテスト"""
+        expected = self.play_tactical_game(3)
+
+        # 負荷の高いワーカーを模して、時計が1回の参照ごとに1秒進むようにする
+        clock = itertools.count()
+        slow_time = types.SimpleNamespace(perf_counter=lambda: float(next(clock)))
+        original_time = tactical_ai.time
+        tactical_ai.time = slow_time
+        self.addCleanup(setattr, tactical_ai, "time", original_time)
+
+        self.assertEqual(self.play_tactical_game(3), expected)
+
+    def test_run_batch_in_process(self):
+        """バッチ実行のテスト（同一プロセス）"""
+        results = run_batch(games=3, workers=1, max_turns=20, base_seed=5)
+        self.assertEqual(len(results), 3)
+        # 同じシードなら同じ結果になる
+        self.assertEqual(run_batch(3, 1, 20, base_seed=5), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import contextlib
+import io
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_state import Enemy, GameState  # noqa: E402
+from json_snapshot import IncrementalJSONEncoder, dumps  # noqa: E402
+
+
+class TestIncrementalJSONEncoder(unittest.TestCase):
+    """JSONスナップショットの差分エンコーダのテスト"""
+
+    def setUp(self):
+        self.game_state = GameState(seed=8)
+        self.game_state.autosave_enabled = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.game_state.initialize_default_state()
+            for _ in range(5):
+                self.game_state.discover_new_city()
+        self.encoder = IncrementalJSONEncoder()
+
+    def assert_matches_full_encoding(self):
+        line = self.encoder.encode(self.game_state, {"journal_seq": 7})
+        expected = self.game_state.to_dict()
+        expected["journal_seq"] = 7
+        self.assertEqual(line, dumps(expected))
+
+    def test_only_changed_entities_are_encoded(self):
+        """変更されたキャラクターだけがエンコードし直されるテスト"""
+        game_state = self.game_state
+        self.assert_matches_full_encoding()
+        self.assertEqual(
+            self.encoder.encoded_entities,
+            len(game_state.cities)
+            + len(game_state.roads)
+            + len(game_state.players)
+            + len(game_state.enemies),
+        )
+
+        enemy = self.game_state.enemies[0]
+        city_id = self.game_state.get_connected_city_ids(enemy.current_city_id)[0]
+        self.game_state.order_move(enemy, self.game_state.cities[city_id])
+        self.game_state.complete_move(enemy)
+        self.assert_matches_full_encoding()
+        self.assertEqual(self.encoder.encoded_entities, 1)
+
+        self.assert_matches_full_encoding()
+        self.assertEqual(self.encoder.encoded_entities, 0)
+
+    def test_slot_attribute_changes_are_encoded(self):
+        """配列に入らない属性（巡回地点・AIタイプ・名前）の変更も差分に含まれるテスト"""
+        self.assert_matches_full_encoding()
+
+        enemy = self.game_state.enemies[0]
+        enemy.patrol_index = 2
+        self.assert_matches_full_encoding()
+        self.assertEqual(self.encoder.encoded_entities, 1)
+
+        enemy.ai_type = "patrol"
+        enemy.patrol_city_ids = [enemy.current_city_id]
+        self.game_state.players[0].name = "Renamed"
+        self.assert_matches_full_encoding()
+        self.assertEqual(self.encoder.encoded_entities, 2)
+
+    def test_direct_writes_and_roster_changes(self):
+        """属性の直接変更・撃破・都市発見・ロードが反映されるテスト"""
+        self.assert_matches_full_encoding()
+
+        self.game_state.players[1].life = 1
+        self.assert_matches_full_encoding()
+
+        self.game_state.enemies[0].life = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.game_state.remove_defeated_characters()
+            self.game_state.discover_new_city()
+        self.game_state.enemies.append(Enemy(0, 0, 1))
+        self.assert_matches_full_encoding()
+
+        self.game_state.from_dict(self.game_state.to_dict())
+        self.assert_matches_full_encoding()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from label_slots import SLOT_HEIGHT, LabelSlotTable  # noqa: E402
+
+CHAR_WIDTH = 4
+
+
+class TestLabelSlotTable(unittest.TestCase):
+    """ラベルアトラスのスロット管理のテスト"""
+
+    def setUp(self):
+        # 幅32のスロット2つ（1行）と幅64のスロット1つ（1行）
+        self.table = LabelSlotTable(64, {32: 1, 64: 1}, CHAR_WIDTH, origin_y=16)
+
+    def test_slot_layout(self):
+        """スロットが領域の先頭から幅の小さい順に並ぶテスト"""
+        self.assertEqual(self.table.slot_count, 3)
+        self.assertEqual(self.table.height, 2 * SLOT_HEIGHT)
+        self.assertEqual(self.table.add("A", 7), (0, 16, CHAR_WIDTH, 32))
+        self.assertEqual(self.table.add("B", 7), (32, 16, CHAR_WIDTH, 32))
+        self.assertEqual(self.table.add("x" * 9, 7), (0, 24, 9 * CHAR_WIDTH, 64))
+
+    def test_lru_eviction_within_slot_width(self):
+        """同じ幅のスロットで最も長く使われていないラベルが追い出されるテスト"""
+        a = self.table.add("A", 7)
+        self.table.add("B", 7)
+        self.table.add("x" * 9, 7)  # 別の幅のスロットは追い出しの対象外
+        self.table.get("A", 7)  # Aを最近使ったものにする
+
+        c = self.table.add("C", 7)
+
+        self.assertEqual(self.table.evictions, 1)
+        self.assertIsNone(self.table.get("B", 7))
+        self.assertEqual(self.table.get("A", 7), a)
+        self.assertEqual(c[:2], (32, 16))  # Bのスロットを再利用
+        self.assertIsNotNone(self.table.get("x" * 9, 7))
+
+    def test_same_text_in_different_colors(self):
+        """色が違えば別のラベルになるテスト"""
+        self.table.add("A", 7)
+        self.assertIsNone(self.table.get("A", 8))
+        self.assertNotEqual(self.table.add("A", 8), self.table.get("A", 7))
+
+    def test_unplaceable_labels_bypass(self):
+        """空・透明色・長すぎる文字列はスロットを使わないテスト"""
+        self.assertIsNone(self.table.add("", 7))
+        self.assertIsNone(self.table.add("A", 0))
+        self.assertIsNone(self.table.add("x" * 17, 7))
+        self.assertEqual(self.table.bypasses, 3)
+        self.assertEqual(self.table.misses, 0)
+        self.assertEqual(self.table.occupancy, 0.0)
+
+    def test_hit_rate_and_occupancy(self):
+        """ヒット率と使用率のテスト"""
+        self.assertEqual(self.table.hit_rate, 0.0)
+        self.assertEqual(self.table.occupancy, 0.0)
+
+        self.table.add("A", 7)
+        self.table.add("B", 7)
+        for _ in range(6):
+            self.table.get("A", 7)
+
+        self.assertEqual(self.table.hits, 6)
+        self.assertEqual(self.table.misses, 2)
+        self.assertAlmostEqual(self.table.hit_rate, 0.75)
+        self.assertAlmostEqual(self.table.occupancy, 2 / 3)
+        self.assertEqual(
+            self.table.get_stats_text(), "Labels: hit 75.0% atlas 2/3 slots"
+        )
+
+        # 追い出しでは使用率は変わらない
+        self.table.add("C", 7)
+        self.assertAlmostEqual(self.table.occupancy, 2 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_state import City, Enemy, Player  # noqa: E402
+from map_culling import MapCullingIndex  # noqa: E402
+
+VIEW_WIDTH = 320
+VIEW_HEIGHT = 240
+
+
+def view_rect(camera_x, camera_y):
+    return (camera_x, camera_y, camera_x + VIEW_WIDTH, camera_y + VIEW_HEIGHT)
+
+
+class TestMapCullingIndex(unittest.TestCase):
+    """描画カリング用の空間インデックスのテスト"""
+
+    def setUp(self):
+        self.index = MapCullingIndex(VIEW_WIDTH)
+        self.near = City(1, "Near", 100, 100)
+        self.edge = City(2, "Edge", 330, 100)  # 画面外だが余白の範囲内
+        self.far = City(3, "Far", 2000, 2000)
+        for city in (self.near, self.edge, self.far):
+            self.index.add_city(city)
+
+    def test_query_returns_cities_overlapping_view(self):
+        """表示範囲と重なるセルの都市だけが返るテスト"""
+        cities = self.index.query_cities(*view_rect(0, 0))
+
+        self.assertIn(self.near, cities)
+        self.assertIn(self.edge, cities)
+        self.assertNotIn(self.far, cities)
+        self.assertEqual(self.index.query_cities(*view_rect(1900, 1900)), [self.far])
+
+    def test_stationary_and_moving_characters(self):
+        """停止中のキャラクターは位置で絞り込み、移動中は常に返るテスト"""
+        player = Player(100, 100, 1)
+        player.id = 1
+        enemy = Enemy(2000, 2000, 3)
+        enemy.id = 2
+        self.index.place_character(player, player.x)
+        self.index.place_character(enemy, enemy.x)
+
+        self.assertEqual(self.index.query_characters(*view_rect(0, 0)), [player])
+
+        self.index.set_moving(enemy)
+        self.assertEqual(self.index.query_characters(*view_rect(0, 0)), [player, enemy])
+
+        self.index.place_character(enemy, enemy.x)  # 到着
+        self.index.remove_character(player.id)
+        self.assertEqual(self.index.query_characters(*view_rect(0, 0)), [])
+        self.assertEqual(self.index.query_characters(*view_rect(1900, 1900)), [enemy])
+        self.assertEqual(self.index.character_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
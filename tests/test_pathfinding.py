@@ -0,0 +1,173 @@
+import contextlib
+import gc
+import io
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import enemy_ai  # noqa: E402
+import pathfinding  # noqa: E402
+from game_state import City, GameState, Road  # noqa: E402
+from pathfinding import (  # noqa: E402
+    RoutingTable,
+    city_distance,
+    find_path,
+    get_routing_table,
+)
+
+
+def create_state(cities, roads) -> GameState:
+    game_state = GameState(seed=1)
+    game_state.cities = {
+        city_id: City(city_id, f"City{city_id}", x, y)
+        for city_id, (x, y) in cities.items()
+    }
+    game_state.roads = [Road(city1_id, city2_id) for city1_id, city2_id in roads]
+    return game_state
+
+
+class TestFindPath(unittest.TestCase):
+    """A*経路探索のテスト"""
+
+    def setUp(self):
+        # 1 - 2 - 3 の上側の道と、1 - 4 - 3 の大回りの道
+        self.game_state = create_state(
+            {1: (0, 0), 2: (50, 0), 3: (100, 0), 4: (50, 200)},
+            [(1, 2), (2, 3), (1, 4), (4, 3)],
+        )
+
+    def test_shortest_path(self):
+        """最短経路が始点を含まないIDリストで得られるテスト"""
+        self.assertEqual(find_path(self.game_state, 1, 3), [2, 3])
+        self.assertEqual(find_path(self.game_state, 3, 1), [2, 1])
+        self.assertEqual(find_path(self.game_state, 1, 1), [])
+
+    def test_unreachable_target(self):
+        """到達できない都市や存在しない都市には空リストを返すテスト"""
+        self.game_state.cities[5] = City(5, "City5", 300, 300)
+        self.assertEqual(find_path(self.game_state, 1, 5), [])
+        self.assertEqual(find_path(self.game_state, 1, 99), [])
+
+    def test_shortest_length_over_fewest_hops(self):
+        """ホップ数が最少の経路より道路の長さが最短の経路を選ぶテスト"""
+        # 1 - 5 - 3 は2ホップだが大回り、1 - 2 - 6 - 3 は3ホップだが直線
+        game_state = create_state(
+            {1: (0, 0), 2: (30, 0), 6: (70, 0), 3: (100, 0), 5: (50, 200)},
+            [(1, 5), (5, 3), (1, 2), (2, 6), (6, 3)],
+        )
+        self.assertEqual(find_path(game_state, 1, 3), [2, 6, 3])
+        self.assertEqual(get_routing_table(game_state).route(1, 3), [2, 6, 3])
+
+    def test_weighted_roads(self):
+        """道路のコスト関数を指定すると経路が変わるテスト"""
+
+        def avoid_city2(city1, city2):
+            penalty = 1000 if 2 in (city1.id, city2.id) else 0
+            return city_distance(city1, city2) + penalty
+
+        self.assertEqual(find_path(self.game_state, 1, 3, avoid_city2), [4, 3])
+
+    def test_long_route(self):
+        """長い一本道でも経路が得られるテスト"""
+        count = 2000
+        game_state = create_state(
+            {city_id: (city_id * 10, 0) for city_id in range(count)},
+            [(city_id, city_id + 1) for city_id in range(count - 1)],
+        )
+        path = find_path(game_state, 0, count - 1)
+        self.assertEqual(path, list(range(1, count)))
+
+    def test_enemy_ai_returns_cities(self):
+        """敵AIの経路探索がCityのリストを返すテスト"""
+        path = enemy_ai.find_path_to_target(
+            self.game_state,
+            self.game_state.cities[1],
+            self.game_state.cities[3],
+        )
+        self.assertEqual([city.id for city in path], [2, 3])
+
+
+class TestRoutingTable(unittest.TestCase):
+    """経路表のテスト"""
+
+    def test_lookup_matches_find_path(self):
+        """経路表の経路と距離がA*の結果と一致するテスト"""
+        game_state = create_state(
+            {1: (0, 0), 2: (50, 0), 3: (100, 0), 4: (50, 200)},
+            [(1, 2), (2, 3), (1, 4), (4, 3)],
+        )
+        table = get_routing_table(game_state)
+        self.assertIs(get_routing_table(game_state), table)
+        for source_id in game_state.cities:
+            for target_id in game_state.cities:
+                self.assertEqual(
+                    table.route(source_id, target_id),
+                    find_path(game_state, source_id, target_id),
+                )
+        self.assertEqual(table.next_hop(1, 3), 2)
+        self.assertAlmostEqual(table.distance(1, 3), 100.0)
+        self.assertEqual(table.distance(1, 99), float("inf"))
+
+    def test_incremental_update_matches_rebuild(self):
+        """都市発見による差分更新の結果が作り直した表と一致するテスト"""
+        game_state = GameState(seed=3)
+        game_state.autosave_enabled = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            game_state.initialize_default_state()
+            table = get_routing_table(game_state)
+            table.next_hop(1, 2)  # 最初の状態で構築しておく
+            for _ in range(30):
+                discovery_plan = game_state.plan_new_city()
+                if discovery_plan:
+                    game_state.apply_city_discovery(discovery_plan)
+
+        self.assertGreater(len(game_state.cities), 20)
+        rebuilt = RoutingTable(game_state)
+        for source_id in game_state.cities:
+            for target_id in game_state.cities:
+                self.assertAlmostEqual(
+                    table.distance(source_id, target_id),
+                    rebuilt.distance(source_id, target_id),
+                )
+
+    def test_roads_replaced_rebuilds_table(self):
+        """道路リストが置き換えられると表が作り直されるテスト"""
+        game_state = create_state({1: (0, 0), 2: (50, 0), 3: (100, 0)}, [(1, 2)])
+        table = get_routing_table(game_state)
+        self.assertIsNone(table.next_hop(1, 3))
+        game_state.roads = [Road(1, 3), Road(3, 2)]
+        self.assertEqual(table.route(1, 2), [3, 2])
+
+    def test_snapshot_uses_source_table_until_roads_change(self):
+        """スナップショットは道路を変更するまで共有元の経路表を使うテスト"""
+        game_state = create_state({1: (0, 0), 2: (50, 0), 3: (100, 0)}, [(1, 2)])
+        table = get_routing_table(game_state)
+        snapshot = game_state.snapshot()
+        self.assertIs(get_routing_table(snapshot), table)
+
+        snapshot.add_road(Road(2, 3))
+        self.assertIsNot(get_routing_table(snapshot), table)
+        self.assertEqual(get_routing_table(snapshot).route(1, 3), [2, 3])
+        self.assertEqual(table.route(1, 3), [])
+
+    def test_released_game_state_leaves_cache(self):
+        """GameStateを解放するとキャッシュから経路表が消えるテスト"""
+        gc.collect()  # 他のテストで使ったGameStateを先に解放しておく
+        cached_count = len(pathfinding._routing_tables)
+        game_state = create_state({1: (0, 0), 2: (50, 0)}, [(1, 2)])
+        table = get_routing_table(game_state)
+        self.assertEqual(table.next_hop(1, 2), 2)
+        self.assertEqual(len(pathfinding._routing_tables), cached_count + 1)
+
+        del game_state
+        gc.collect()
+        self.assertEqual(len(pathfinding._routing_tables), cached_count)
+        with self.assertRaises(ReferenceError):
+            table.next_hop(1, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from headless import HeadlessGame  # noqa: E402
+from replay import Replay, ReplayRecorder  # noqa: E402
+
+
+class TestReplay(unittest.TestCase):
+    """リプレイ記録と再生のテスト"""
+
+    def setUp(self):
+        """テスト前の準備: 記録しながらヘッドレスで1ゲーム実行"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "replay.jsonl")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.game = HeadlessGame(seed=2024, max_turns=30)
+            self.game.game_state.enemies[0].life = 10**6  # 長く続くように
+            self.recorder = ReplayRecorder(
+                self.game.game_state, self.path, keyframe_interval=5
+            )
+
+            # 各ターン開始時の実際の状態を保存しておく
+            self.expected = {}
+
+            def capture(event):
+                if event["e"] == "turn" and event["turn"] == "player":
+                    self.expected[event["n"]] = self.game.game_state.to_dict()
+
+            self.game.game_state.event_listeners.append(capture)
+            self.game.play()
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_state_at_every_turn_matches_live_game(self):
+        """全ターンの再構築結果が実際のゲームと一致するテスト"""
+        replay = Replay.load(self.path)
+        self.assertGreater(len(replay.keyframes), 0)
+        self.assertEqual(replay.last_turn, max(self.expected))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for turn, expected in self.expected.items():
+                rebuilt = replay.state_at_turn(turn)
+                self.assertEqual(rebuilt.to_dict(), expected, turn)
+
+    def test_turn_costs_cover_all_turns(self):
+        """ターンごとのコスト計測が全ターンを含むテスト"""
+        replay = Replay.load(self.path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            costs = replay.turn_costs()
+        self.assertEqual([turn for turn, _, _ in costs][1:], sorted(self.expected)[:-1])
+        self.assertEqual(
+            sum(event_count for _, event_count, _ in costs),
+            replay.turn_starts[replay.last_turn] + 1,
+        )
+
+    def test_state_transitions_recorded(self):
+        """状態遷移の記録テスト"""
+        recorder = ReplayRecorder(self.game.game_state)
+        recorder.record_state("player_turn")
+        recorder.record_state("transition")
+        self.assertEqual(
+            Replay(recorder.records).state_transitions(),
+            ["player_turn", "transition"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
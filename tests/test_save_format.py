@@ -0,0 +1,80 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_state import GameState  # noqa: E402
+from save_convert import convert_save_file  # noqa: E402
+from save_format import BinarySave, encode_game_state, is_binary_save  # noqa: E402
+
+
+class TestBinarySaveFormat(unittest.TestCase):
+    """バイナリセーブ形式のテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.game_state = GameState()
+        self.game_state.save_file_path = os.path.join(self.temp_dir, "game_state.bin")
+        self.game_state.initialize_default_state()
+        for _ in range(3):
+            self.game_state.discover_new_city()
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_encode_and_decode(self):
+        """エンコードしたデータから同じ状態が復元されるテスト"""
+        self.game_state.players[0].target_x = 12.5
+        self.game_state.players[0].is_moving = True
+        data = encode_game_state(self.game_state)
+        self.assertTrue(is_binary_save(data))
+
+        save = BinarySave(data)
+        self.assertEqual(save.section_count(b"CITY"), len(self.game_state.cities))
+        self.assertEqual(save.section_count(b"ROAD"), len(self.game_state.roads))
+
+        restored = GameState()
+        save.apply_to(restored)
+        self.assertEqual(restored.to_dict(), self.game_state.to_dict())
+
+    def test_load_detects_binary_format(self):
+        """load_from_fileがバイナリ形式を自動判定するテスト（ジャーナル付き）"""
+        self.game_state.save_format = "binary"
+        self.game_state.save_to_file()
+        self.game_state.switch_turn()
+        self.game_state.auto_save()
+
+        restored = GameState()
+        restored.save_file_path = self.game_state.save_file_path
+        self.assertTrue(restored.load_from_file())
+        self.assertEqual(restored.save_format, "binary")
+        self.assertEqual(restored.to_dict(), self.game_state.to_dict())
+
+    def test_convert_between_formats(self):
+        """JSONとバイナリの相互変換テスト"""
+        json_path = os.path.join(self.temp_dir, "game_state.json")
+        binary_path = os.path.join(self.temp_dir, "converted.bin")
+        back_path = os.path.join(self.temp_dir, "converted.json")
+        self.game_state.save_file_path = json_path
+        self.game_state.save_to_file()
+
+        self.assertTrue(convert_save_file(json_path, binary_path, "binary"))
+        self.assertTrue(convert_save_file(binary_path, back_path, "json"))
+        with open(binary_path, "rb") as f:
+            self.assertTrue(is_binary_save(f.read()))
+
+        restored = GameState()
+        restored.save_file_path = back_path
+        self.assertTrue(restored.load_from_file())
+        self.assertEqual(restored.save_format, "json")
+        self.assertEqual(restored.to_dict(), self.game_state.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
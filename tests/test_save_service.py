@@ -0,0 +1,77 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from game_state import GameState  # noqa: E402
+from save_service import SaveService  # noqa: E402
+
+
+class TestSaveService(unittest.TestCase):
+    """SaveServiceのテスト"""
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "game_state.json")
+        self.service = SaveService()
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.service.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_requests_during_write_are_coalesced(self):
+        """書き込み中に届いた要求が1回の書き込みにまとめられるテスト"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_encode():
+            started.set()
+            release.wait()
+            return b"first\n"
+
+        self.service.submit_snapshot(self.path, slow_encode)
+        started.wait()
+        # 書き込み中に届いた要求
+        self.service.submit_snapshot(self.path, lambda: b"second\n")
+        self.service.submit_append(self.path, b"event1\n")
+        self.service.submit_snapshot(self.path, lambda: b"third\n")
+        self.service.submit_append(self.path, b"event2\n")
+        release.set()
+
+        self.assertTrue(self.service.flush(timeout=5))
+        self.assertEqual(self.service.completed_writes, 2)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), b"third\nevent2\n")
+        self.assertEqual(os.listdir(self.temp_dir), ["game_state.json"])
+
+    def test_game_state_saves_in_background(self):
+        """GameStateのセーブがサービス経由で書き出されるテスト"""
+        game_state = GameState()
+        game_state.save_file_path = self.path
+        game_state.save_service = self.service
+        game_state.initialize_default_state()
+        game_state.auto_save()
+        game_state.switch_turn()
+        game_state.auto_save()
+
+        # 保存後に状態を変更してもスナップショットには影響しない
+        expected = game_state.to_dict()
+        game_state.enemies[0].patrol_city_ids.append(99)
+        game_state.players[0].life = 1
+
+        self.service.close()
+        restored = GameState()
+        restored.save_file_path = self.path
+        self.assertTrue(restored.load_from_file())
+        self.assertEqual(restored.to_dict(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from spatial_index import SpatialGrid  # noqa: E402
+
+
+class TestSpatialGrid(unittest.TestCase):
+    """SpatialGridのテスト"""
+
+    def test_point_query(self):
+        """点要素の範囲問い合わせテスト"""
+        grid = SpatialGrid(64)
+        grid.insert_point("a", 10, 10)
+        grid.insert_point("b", 200, 200)
+
+        self.assertEqual(grid.query(0, 0, 63, 63), ["a"])
+        self.assertEqual(grid.query_radius(200, 200, 5), ["b"])
+        self.assertEqual(grid.query(0, 0, 300, 300), ["a", "b"])
+        self.assertEqual(grid.query(100, 100, 120, 120), [])
+
+    def test_segment_spans_cells(self):
+        """複数セルにまたがる線分が一度だけ返されるテスト"""
+        grid = SpatialGrid(64)
+        grid.insert_segment("road", 0, 0, 300, 10)
+
+        self.assertEqual(grid.query(250, 0, 260, 5), ["road"])
+        self.assertEqual(grid.query(0, 0, 300, 300), ["road"])
+        self.assertEqual(grid.query(0, 100, 300, 120), [])
+
+    def test_cell_boundary_is_inclusive(self):
+        """セル境界上の要素が両側の問い合わせで見つかるテスト"""
+        grid = SpatialGrid(64)
+        grid.insert_point("edge", 64, 64)
+
+        self.assertEqual(grid.query(0, 0, 64, 64), ["edge"])
+        self.assertEqual(grid.query(64, 64, 100, 100), ["edge"])
+
+    def test_remove_and_reinsert(self):
+        """削除と再登録のテスト"""
+        grid = SpatialGrid(32)
+        grid.insert_point("a", 10, 10)
+        grid.insert_point("b", 12, 12)
+        grid.remove("a")
+
+        self.assertNotIn("a", grid)
+        self.assertEqual(grid.query_radius(10, 10, 5), ["b"])
+
+        # 再登録で位置が更新される
+        grid.insert_point("b", 500, 500)
+        self.assertEqual(grid.query_radius(10, 10, 5), [])
+        self.assertEqual(grid.query_radius(500, 500, 1), ["b"])
+        self.assertEqual(len(grid), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
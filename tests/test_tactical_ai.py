@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+# テストファイルからプロジェクトルートのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import enemy_ai  # noqa: E402
+from game_state import City, Enemy, GameState, Player, Road  # noqa: E402
+from tactical_ai import TACTICAL_MAX_ROLLOUTS, decide_tactical_move  # noqa: E402
+
+
+def create_line_state() -> GameState:
+    """都市1 - 2 - 3 が一直線に繋がったゲーム状態を作成（敵は都市2）"""
+    game_state = GameState(seed=5)
+    game_state.cities = {
+        city_id: City(city_id, f"City{city_id}", city_id * 50, 100)
+        for city_id in (1, 2, 3)
+    }
+    game_state.roads = [Road(1, 2), Road(2, 3)]
+    game_state.enemies = [Enemy(0, 0, 2, "tactical")]
+    return game_state
+
+
+class TestTacticalAI(unittest.TestCase):
+    """MCTSによる"tactical"タイプの敵AIのテスト"""
+
+    def test_attacks_weak_player(self):
+        """倒せる相手のいる都市へ向かうテスト"""
+        game_state = create_line_state()
+        weak_player = Player(0, 0, 1)
+        weak_player.life = 10
+        game_state.players = [weak_player]
+
+        result = decide_tactical_move(
+            game_state, game_state.enemies[0], max_rollouts=300
+        )
+
+        self.assertEqual(result.city_id, 1)
+        self.assertEqual(result.rollouts, 300)
+
+    def test_avoids_strong_players(self):
+        """倒される都市を避けるテスト"""
+        game_state = create_line_state()
+        game_state.players = [Player(0, 0, 1) for _ in range(3)]
+
+        result = decide_tactical_move(
+            game_state, game_state.enemies[0], max_rollouts=300
+        )
+
+        self.assertEqual(result.city_id, 3)
+
+    def test_budget_limits_search(self):
+        """時間の上限で探索が止まり、プレイアウト速度が報告されるテスト"""
+        game_state = create_line_state()
+        game_state.players = [Player(0, 0, 1)]
+
+        result = decide_tactical_move(
+            game_state, game_state.enemies[0], budget_ms=5, max_rollouts=None
+        )
+
+        self.assertGreater(result.rollouts, 0)
+        self.assertLess(result.elapsed_ms, 1000)
+        self.assertGreater(result.rollouts_per_second, 0)
+
+    def test_default_search_stops_on_rollout_count(self):
+        """既定ではプレイアウト回数だけで止まり、時計に依存しないテスト"""
+        game_state = create_line_state()
+        game_state.players = [Player(0, 0, 1)]
+
+        result = decide_tactical_move(game_state, game_state.enemies[0])
+
+        self.assertEqual(result.rollouts, TACTICAL_MAX_ROLLOUTS)
+
+    def test_enemy_ai_dispatches_tactical_type(self):
+        """敵AIが"tactical"タイプに接続された移動先を返すテスト"""
+        game_state = create_line_state()
+        game_state.players = [Player(0, 0, 1)]
+        enemy = game_state.enemies[0]
+
+        target_city = enemy_ai.decide_enemy_action(game_state, enemy)
+
+        self.assertTrue(game_state.are_cities_connected(2, target_city.id))
+        self.assertIn("Plans turns ahead", enemy.get_hover_info())
+
+
+if __name__ == "__main__":
+    unittest.main()